@@ -0,0 +1,48 @@
+from dataset_utilities import TextCleaner
+from ocr_engine import image_to_string, recognize
+
+# Render at the first DPI; step up only when the page looks noisy
+DPI_STEPS = (200, 300, 400)
+MIN_CONFIDENCE = 75.0
+MIN_SCRIPT_RATIO = 0.85
+
+
+def ocr_adaptive(render, lang, script=None, dpi_steps=DPI_STEPS, min_confidence=MIN_CONFIDENCE,
+                 min_script_ratio=MIN_SCRIPT_RATIO, psm=3, oem=1, recognize_fn=None):
+    """OCR a page at the lowest DPI that gives a confident, single-script result.
+
+    `render(dpi)` returns the page image at that resolution. After each
+    pass the mean word confidence and the share of letters in `script`
+    (the dominant script when None) are checked; if either is below its
+    threshold the page is re-rendered at the next DPI step. The best pass
+    by confidence is returned, with every attempt so the
+    throughput/quality trade-off can be inspected afterwards.
+
+    `recognize_fn(image, dpi) -> (text, confidence, info)` replaces the
+    whole-page Tesseract pass (e.g. layout-aware block OCR); `info` is
+    merged into the result.
+
+    With a single DPI step and no `recognize_fn` there is nothing to
+    decide: the page is read once with the plain text pass, exactly as
+    fixed-DPI OCR always was (same text, same cache entries), and the
+    confidence is None.
+    """
+    if recognize_fn is None and len(dpi_steps) == 1:
+        dpi = dpi_steps[0]
+        text = image_to_string(render(dpi), lang, psm, oem, dpi)
+        ratio = round(TextCleaner.script_ratio(text, script), 3)
+        return {'text': text, 'dpi': dpi, 'confidence': None, 'script_ratio': ratio,
+                'attempts': [{'dpi': dpi, 'confidence': None, 'script_ratio': ratio}]}
+    read = recognize_fn or (lambda image, dpi: recognize(image, lang, psm, oem, dpi) + ({},))
+    best = None
+    attempts = []
+    for dpi in dpi_steps:
+        text, confidence, info = read(render(dpi), dpi)
+        ratio = TextCleaner.script_ratio(text, script)
+        attempts.append({'dpi': dpi, 'confidence': round(confidence, 1), 'script_ratio': round(ratio, 3)})
+        if best is None or confidence > best['confidence']:
+            best = dict(info, text=text, dpi=dpi, confidence=round(confidence, 1), script_ratio=round(ratio, 3))
+        if confidence >= min_confidence and ratio >= min_script_ratio:
+            break
+    best['attempts'] = attempts
+    return best
@@ -4,6 +4,7 @@ import re
 from pathlib import Path
 from unstructured.partition.text import partition_text
 from unstructured.chunking.title import chunk_by_title
+from script_profile import script_profile
 
 class RobustStructuralEnricher:
     def __init__(self):
@@ -12,11 +13,6 @@ class RobustStructuralEnricher:
         self.translation_marker = re.compile(r'^\s*Translation', re.I)
         self.purport_marker = re.compile(r'^\s*Purport', re.I)
         self.ref_marker = re.compile(r'\(.*?\d+[\.:]\d+.*?\)|\[\d+\]')
-        
-        # Script ranges
-        self.sanskrit_range = re.compile(r'[\u0900-\u097F]')
-        self.bengali_range = re.compile(r'[\u0980-\u09FF]')
-        self.diacritic_range = re.compile(r'[\u0100-\u017F]')
 
     def get_author(self, filename, folder_context=""):
         filename_lower = filename.lower()
@@ -44,9 +40,11 @@ class RobustStructuralEnricher:
             return "explanation"
             
         # 2. Check for script-heavy blocks (Slokas)
-        sanskrit_chars = len(self.sanskrit_range.findall(text))
-        bengali_chars = len(self.bengali_range.findall(text))
-        diacritic_chars = len(self.diacritic_range.findall(text))
+        counts = script_profile(text)["counts"]
+        sanskrit_chars = counts["Devanagari"]
+        bengali_chars = counts["Bengali"]
+        # The sloka threshold below was tuned on Latin Extended-A (ā, ī, ś...) alone
+        diacritic_chars = counts["Latin Extended-A"]
         
         # If it has significant Sanskrit/Bengali script, it's definitely a sloka
         if sanskrit_chars > 10 or bengali_chars > 10:
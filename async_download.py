@@ -0,0 +1,118 @@
+import asyncio
+import time
+from urllib.parse import urlparse
+from streaming_download import async_stream_download, CHUNK_SIZE
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+
+class TokenBucket:
+    """Per-host rate limiter: `rate` requests/s with bursts of up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncDownloader:
+    """Bounded worker pool over a shared keep-alive connection pool.
+
+    Each host gets its own token bucket so scsmath.org and scsmath.com are
+    throttled independently while the workers keep both busy.
+    """
+
+    def __init__(self, workers=8, per_host_rate=2.0, burst=4, per_host_connections=4,
+                 timeout=60, headers=None, retries=3, chunk_size=CHUNK_SIZE):
+        self.workers = workers
+        self.per_host_rate = per_host_rate
+        self.burst = burst
+        self.per_host_connections = per_host_connections
+        self.timeout = timeout
+        self.headers = headers or {'User-Agent': 'Mozilla/5.0'}
+        self.retries = retries
+        self.chunk_size = chunk_size
+        self.buckets = {}
+
+    def bucket_for(self, url):
+        host = urlparse(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.per_host_rate, self.burst)
+        return self.buckets[host]
+
+    async def fetch(self, session, url, dest_path, headers=None):
+        await self.bucket_for(url).acquire()
+        return await async_stream_download(session, url, dest_path, retries=self.retries,
+                                           chunk_size=self.chunk_size, headers=headers)
+
+    async def _worker(self, queue, session, stats):
+        while True:
+            job = await queue.get()
+            try:
+                label, url, dest_path, headers = job
+                print(f"{label} 📥 Downloading {url}...")
+                try:
+                    result = await self.fetch(session, url, dest_path, headers)
+                    if result['status'] == 'not_modified':
+                        stats['not_modified'] += 1
+                    else:
+                        stats['bytes'] += result['size']
+                        stats['files'] += 1
+                except Exception as e:
+                    result = {'status': 'failed', 'headers': {}, 'size': None}
+                    stats['errors'] += 1
+                    print(f"  ❌ Error downloading {url}: {e}")
+                stats['results'].append((url, dest_path, result))
+            finally:
+                queue.task_done()
+
+    async def run(self, jobs):
+        stats = {'files': 0, 'bytes': 0, 'not_modified': 0, 'errors': 0, 'results': []}
+        # Buckets hold an asyncio.Lock, which belongs to the loop it was first used
+        # on; download() starts a new loop per call, so start from fresh buckets
+        self.buckets = {}
+        queue = asyncio.Queue()
+        for i, job in enumerate(jobs, 1):
+            url, dest_path = job[0], job[1]
+            headers = job[2] if len(job) > 2 else None
+            queue.put_nowait((f"[{i}/{len(jobs)}]", url, dest_path, headers))
+
+        connector = aiohttp.TCPConnector(limit=self.workers, limit_per_host=self.per_host_connections,
+                                         keepalive_timeout=30)
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=self.timeout)
+        start = time.perf_counter()
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=self.headers) as session:
+            tasks = [asyncio.create_task(self._worker(queue, session, stats))
+                     for _ in range(min(self.workers, len(jobs)) or 1)]
+            await queue.join()
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        stats['elapsed'] = time.perf_counter() - start
+        return stats
+
+    def download(self, jobs):
+        """Blocking entry point.
+
+        Jobs are (url, dest_path) or (url, dest_path, request_headers). Returns
+        counters plus 'results': a list of (url, dest_path, result dict).
+        """
+        return asyncio.run(self.run(list(jobs)))
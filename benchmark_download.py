@@ -0,0 +1,84 @@
+import argparse
+import json
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from bulk_download import BulkDownloader
+from async_download import AsyncDownloader
+
+def make_handler(payload, latency):
+    class StandInHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1' # keep-alive, like the real servers
+
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/pdf')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+    return StandInHandler
+
+def start_server(payload, latency):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(payload, latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def write_index(path, hosts, files):
+    # Alternate between two stand-in hosts, like scsmath.org / scsmath.com
+    sources = []
+    for i in range(files):
+        host = hosts[i % len(hosts)]
+        sources.append({
+            'category': 'english_pdfs' if i % 2 == 0 else 'misc_articles',
+            'type': 'pdf',
+            'title': f"Bench {i}",
+            'url': f"http://{host}/publications/pdfs/Bench{i:04d}.pdf",
+        })
+    path.write_text(json.dumps({'metadata': {'total_sources': files}, 'sources': sources}))
+
+def report(label, files, nbytes, elapsed):
+    mb = nbytes / (1024 * 1024)
+    print(f"{label:>8}: {files} files, {mb:.1f} MB in {elapsed:.2f}s -> "
+          f"{files / elapsed:.2f} files/s, {mb / elapsed:.2f} MB/s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark BulkDownloader against a local stand-in server")
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--size-kb", type=int, default=2048)
+    parser.add_argument("--latency-ms", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=20.0, help="Per-host requests/s")
+    parser.add_argument("--skip-serial", action="store_true")
+    args = parser.parse_args()
+
+    payload = b'%PDF-1.4\n' + bytes(range(256)) * (args.size_kb * 4)
+    servers = [start_server(payload, args.latency_ms / 1000) for _ in range(2)]
+    hosts = [f"127.0.0.1:{s.server_address[1]}" for s in servers]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        index_path = tmp / 'source_index.json'
+        write_index(index_path, hosts, args.files)
+
+        if not args.skip_serial:
+            bd = BulkDownloader(index_path, tmp / 'serial', state_path=tmp / 'serial_state.json')
+            start = time.perf_counter()
+            bd.download_serial(bd.pending_jobs())
+            report('serial', args.files, args.files * len(payload), time.perf_counter() - start)
+
+        bd = BulkDownloader(index_path, tmp / 'async', state_path=tmp / 'async_state.json')
+        engine = AsyncDownloader(workers=args.workers, per_host_rate=args.rate, burst=args.workers)
+        stats = engine.download(bd.pending_jobs())
+        report('async', stats['files'], stats['bytes'], stats['elapsed'])
+
+    for s in servers:
+        s.shutdown()
+
+if __name__ == "__main__":
+    main()
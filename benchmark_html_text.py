@@ -0,0 +1,90 @@
+import argparse
+import difflib
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from html_text import epub_to_text, spine_documents, LXML_AVAILABLE
+
+def make_sample(tmp, chapters):
+    # Synthetic EPUB for machines without the library downloaded
+    from ebooklib import epub
+    book = epub.EpubBook()
+    book.set_identifier('benchmark')
+    book.set_title('Benchmark')
+    book.set_language('en')
+    para = ("<p>{n}.{i} Śrīla Śrīdhar Mahārāj explains that <i>śaraṇāgati</i>, surrender, "
+            "is the <b>foundation</b> of devotional life &amp; practice.</p>")
+    items = []
+    for n in range(chapters):
+        item = epub.EpubHtml(title=f'Chapter {n}', file_name=f'chap_{n}.xhtml', lang='en')
+        item.content = f"<h1>Chapter {n}</h1>" + "".join(para.format(n=n, i=i) for i in range(400))
+        book.add_item(item)
+        items.append(item)
+    book.spine = items
+    book.add_item(epub.EpubNcx())
+    path = tmp / 'synthetic.epub'
+    epub.write_epub(str(path), book)
+    return [path]
+
+def bs4_text(path):
+    # The path GroupSanitizer/HomogeneityAnalyzer used: ebooklib + BeautifulSoup html.parser
+    import ebooklib
+    from ebooklib import epub
+    from bs4 import BeautifulSoup
+    book = epub.read_epub(str(path))
+    return "\n".join(BeautifulSoup(item.get_content(), 'html.parser').get_text()
+                     for item in book.get_items() if item.get_type() == ebooklib.ITEM_DOCUMENT)
+
+def document_bytes(path):
+    with zipfile.ZipFile(path) as zf:
+        names = set(zf.namelist())
+        return sum(zf.getinfo(name).file_size for name in spine_documents(zf) if name in names)
+
+def parity(reference, text):
+    # Word-level similarity; block separators do not count
+    return difflib.SequenceMatcher(None, reference.split(), text.split()).ratio()
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare EPUB text extraction: html_text vs BeautifulSoup")
+    parser.add_argument("paths", nargs="*", help="EPUBs to measure (default: scsmath_library/english_epubs)")
+    parser.add_argument("--library", default="scsmath_library/english_epubs")
+    parser.add_argument("--chapters", type=int, default=20, help="Chapters in the synthetic sample")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engines = {'bs4': bs4_text, 'html_text': epub_to_text}
+    print(f"html_text parser: {'lxml (libxml2)' if LXML_AVAILABLE else 'html.parser (stdlib)'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [Path(p) for p in args.paths] or sorted(Path(args.library).glob('*.epub'))
+        if not paths:
+            paths = make_sample(Path(tmp), args.chapters)
+
+        totals = {name: 0.0 for name in engines}
+        total_mb = 0.0
+        for path in paths:
+            mb = document_bytes(path) / (1024 * 1024)
+            total_mb += mb
+            results = {}
+            for name, extract in engines.items():
+                best = float('inf')
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    text = extract(path)
+                    best = min(best, time.perf_counter() - start)
+                results[name] = (text, best)
+                totals[name] += best
+
+            reference = results['bs4'][0]
+            print(f"\n{path.name} ({mb:.2f} MB of XHTML)")
+            for name, (text, elapsed) in results.items():
+                print(f"  {name:>9}: {elapsed:7.3f}s {mb / elapsed:8.2f} MB/s | "
+                      f"{len(text):>9,} chars | parity vs bs4 {parity(reference, text):.3f}")
+
+        print("\nOverall")
+        for name, elapsed in totals.items():
+            print(f"  {name:>9}: {total_mb / elapsed:8.2f} MB/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import difflib
+import tempfile
+import time
+from pathlib import Path
+from pdf_text import available_backends, get_backend, PIKEPDF_AVAILABLE
+
+def mini_dataset_samples(report_path, per_cluster=3):
+    # Same sampling as GroupSanitizer.process_mini_dataset: first 3 PDFs of the top 5 clusters
+    from report_index import EntropyReport
+    report = EntropyReport.load(report_path)
+    paths = []
+    for _, cluster_files in report.top_clusters(5):
+        for f_info in cluster_files[:per_cluster]:
+            path = Path(f_info['path'])
+            if 'pdf' in f_info['mime'] and path.exists():
+                paths.append(path)
+    return paths
+
+def make_sample(tmp, pages):
+    # Synthetic text PDF for machines without the library downloaded
+    import pikepdf
+    pdf = pikepdf.new()
+    font = pdf.make_indirect(pikepdf.Dictionary(Type=pikepdf.Name.Font, Subtype=pikepdf.Name.Type1,
+                                                BaseFont=pikepdf.Name.Helvetica))
+    line = "Sri Chaitanya Saraswat Math publishes the teachings of Srila Sridhar Maharaj."
+    for n in range(pages):
+        ops = "BT /F1 11 Tf 14 TL 72 760 Td " + " ".join(f"({line} {n}.{i}) ' " for i in range(45)) + "ET"
+        page = pdf.add_blank_page(page_size=(612, 792))
+        page.obj.Resources = pikepdf.Dictionary(Font=pikepdf.Dictionary(F1=font))
+        page.obj.Contents = pdf.make_stream(ops.encode())
+    path = tmp / 'synthetic.pdf'
+    pdf.save(path)
+    return [path]
+
+def extract(backend, path):
+    return [text or "" for _, text, _ in backend.iter_pages(path)]
+
+def parity(reference, texts):
+    # Word-level similarity against the reference backend, page by page
+    ratios = [difflib.SequenceMatcher(None, a.split(), b.split(), autojunk=False).ratio()
+              for a, b in zip(reference, texts)]
+    return sum(ratios) / len(ratios) if ratios else 1.0
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare PDF text backends: pages/s and text parity")
+    parser.add_argument("paths", nargs="*", help="PDFs to measure (default: mini_dataset samples from the report)")
+    parser.add_argument("--report", default="bulk_entropy_report.json")
+    parser.add_argument("--reference", default="pypdf2", help="Backend the others are compared against")
+    parser.add_argument("--pages", type=int, default=200, help="Pages in the synthetic sample")
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    backends = [get_backend(name) for name in available_backends()]
+    print(f"Backends available: {', '.join(b.name for b in backends)} (default: {backends[0].name})")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [Path(p) for p in args.paths]
+        if not paths and Path(args.report).exists():
+            paths = mini_dataset_samples(args.report)
+        if not paths:
+            if not PIKEPDF_AVAILABLE:
+                parser.error("no sample PDFs found and pikepdf is not installed to make one")
+            paths = make_sample(Path(tmp), args.pages)
+
+        totals = {b.name: [0, 0.0] for b in backends}
+        for path in paths:
+            results = {}
+            for backend in backends:
+                best = float('inf')
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    texts = extract(backend, path)
+                    best = min(best, time.perf_counter() - start)
+                results[backend.name] = (texts, best)
+                totals[backend.name][0] += len(texts)
+                totals[backend.name][1] += best
+
+            reference = results.get(args.reference, next(iter(results.values())))[0]
+            print(f"\n{path.name} ({len(reference)} pages)")
+            for name, (texts, elapsed) in results.items():
+                print(f"  {name:>8}: {elapsed:7.3f}s {len(texts) / elapsed:8.1f} pages/s | "
+                      f"{sum(map(len, texts)):>9,} chars | parity vs {args.reference} {parity(reference, texts):.3f}")
+
+        print("\nOverall")
+        for name, (pages, elapsed) in totals.items():
+            print(f"  {name:>8}: {pages / elapsed:8.1f} pages/s")
+
+if __name__ == "__main__":
+    main()
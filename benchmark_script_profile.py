@@ -0,0 +1,55 @@
+import argparse
+import time
+import unicodedata
+from collections import Counter
+from pathlib import Path
+import script_profile
+from script_profile import script_counts
+
+def legacy_script_counts(text):
+    # The original TextCleaner.script_counts: a Unicode name lookup per character
+    counts = Counter()
+    for char in text:
+        name = unicodedata.name(char, "")
+        if "BENGALI" in name:
+            counts["Bengali"] += 1
+        elif "DEVANAGARI" in name:
+            counts["Devanagari"] += 1
+        elif "LATIN" in name and char.isalpha():
+            counts["Latin"] += 1
+    return counts
+
+def timed(fn, texts, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [fn(text) for text in texts]
+        best = min(best, time.perf_counter() - start)
+    return results, best
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-character and lookup-table script counting")
+    parser.add_argument("paths", nargs="*", help="Text files to profile (default: mini_dataset/*.txt)")
+    parser.add_argument("--corpus", default="mini_dataset")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = [Path(p) for p in args.paths] or sorted(Path(args.corpus).glob('*.txt'))
+    if not paths:
+        parser.error(f"no text files found in {args.corpus}")
+    texts = [path.read_text(encoding='utf-8') for path in paths]
+    mb = sum(len(text.encode('utf-8')) for text in texts) / (1024 * 1024)
+    print(f"🔤 {len(texts)} files, {mb:.2f} MB")
+
+    script_counts("")  # build the lookup table outside the timings
+    reference, t_old = timed(legacy_script_counts, texts, args.repeat)
+    print(f"{'unicodedata.name':>18} | {mb / t_old:8.2f} MB/s")
+    engines = [('numpy', True), ('regex classes', False)] if script_profile.NUMPY_AVAILABLE else [('regex classes', False)]
+    for label, use_numpy in engines:
+        script_profile.NUMPY_AVAILABLE = use_numpy
+        results, t_new = timed(script_counts, texts, args.repeat)
+        identical = sum(a == b for a, b in zip(reference, results))
+        print(f"{label:>18} | {mb / t_new:8.2f} MB/s | x{t_old / t_new:6.1f} | identical {identical}/{len(texts)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import argparse
+import re
+import time
+import unicodedata
+from pathlib import Path
+from dataset_utilities import TextCleaner
+
+def legacy_clean_text(text, remove_headers=True, normalize_devanagari=False, fix_ocr=True, is_bengali=True):
+    # The original TextCleaner.clean_text: a per-character control filter, then
+    # whole-text passes with uncompiled patterns, one re.sub per rule
+    text = ''.join(ch for ch in text if unicodedata.category(ch)[0] != 'C' or ch in '\n\t')
+
+    patterns = [r'\d{10,}', r'\d{3}-\d{3}-\d{4}', r'www\..*\.org', r'http[s]?://',
+                r'Email:', r'Mobile:', r'Phone:', r'Fax:']
+    cleaned = []
+    for line in text.split('\n'):
+        if any(re.search(p, line, re.I) for p in patterns):
+            for p in patterns:
+                line = re.sub(p, '', line, flags=re.I)
+            if line.strip():
+                cleaned.append(line)
+            continue
+        cleaned.append(line)
+    text = '\n'.join(cleaned)
+
+    if is_bengali:
+        for pattern, replacement in {r'হ\*তে': 'হতে', r'র’': 'র', r'ত’': 'ত', r'ন’': 'ন', r'’': "'"}.items():
+            text = re.sub(pattern, replacement, text)
+    if fix_ocr:
+        for pattern, replacement in {r'\bl\b': 'I', r'\bO\b': '0', 'tbe': 'the', 'sbould': 'should',
+                                     'witb': 'with'}.items():
+            text = re.sub(pattern, replacement, text)
+    if remove_headers:
+        text = '\n'.join(line for line in text.split('\n')
+                         if not re.match(r'^\s*\d+\s*$', line)
+                         and not re.search(r'(Sri Chaitanya Saraswat Math|www\.scsmath|Page \d+)', line, re.I))
+    if normalize_devanagari:
+        for old, new in {'Krishna': 'Kṛṣṇa', 'Srila': 'Śrīla', 'Sri': 'Śrī', 'Srimad': 'Śrīmad',
+                         'Chaitanya': 'Caitanya'}.items():
+            text = re.sub(rf'\b{old}\b', new, text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip()
+
+def timed(fn, texts, repeat, **flags):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [fn(text, **flags) for text in texts]
+        best = min(best, time.perf_counter() - start)
+    return results, best
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare legacy and compiled TextCleaner.clean_text throughput")
+    parser.add_argument("paths", nargs="*", help="Text files to clean (default: mini_dataset/*.txt)")
+    parser.add_argument("--corpus", default="mini_dataset")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = [Path(p) for p in args.paths] or sorted(Path(args.corpus).glob('*.txt'))
+    if not paths:
+        parser.error(f"no text files found in {args.corpus}")
+    texts = [path.read_text(encoding='utf-8') for path in paths]
+    mb = sum(len(text.encode('utf-8')) for text in texts) / (1024 * 1024)
+    print(f"🧹 {len(texts)} files, {mb:.2f} MB")
+
+    for flags in ({}, {'normalize_devanagari': True}, {'is_bengali': False, 'fix_ocr': False}):
+        old, t_old = timed(legacy_clean_text, texts, args.repeat, **flags)
+        new, t_new = timed(TextCleaner.clean_text, texts, args.repeat, **flags)
+        identical = sum(a.encode('utf-8') == b.encode('utf-8') for a, b in zip(old, new))
+        label = ', '.join(f"{k}={v}" for k, v in flags.items()) or 'defaults'
+        print(f"{label:>36} | legacy {mb / t_old:7.2f} MB/s | compiled {mb / t_new:7.2f} MB/s | "
+              f"x{t_old / t_new:5.1f} | byte-identical {identical}/{len(texts)}")
+
+if __name__ == "__main__":
+    main()
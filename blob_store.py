@@ -0,0 +1,134 @@
+import json
+import os
+from pathlib import Path
+from crawl_state import file_sha256
+
+
+class BlobStore:
+    """sha256-addressed storage with per-category views.
+
+    Every distinct file body lives once under `<base>/.blobs/ab/<sha256>`.
+    The familiar `<base>/<category>/<filename>` paths are hardlinks to it (or
+    symlinks where hardlinks are not possible), so existing tools keep
+    working while identical downloads share one inode. `blob_manifest.json`
+    maps URLs and views to blobs.
+    """
+
+    def __init__(self, base_dir='scsmath_library'):
+        self.base_dir = Path(base_dir)
+        self.blob_dir = self.base_dir / '.blobs'
+        self.manifest_path = self.base_dir / 'blob_manifest.json'
+        self.manifest = {'blobs': {}, 'urls': {}}
+        if self.manifest_path.exists():
+            with open(self.manifest_path, 'r') as f:
+                self.manifest = json.load(f)
+        # view -> sha256, so view lookups do not scan every blob
+        self.views = {view: sha256 for sha256, b in self.manifest['blobs'].items() for view in b['views']}
+
+    def blob_path(self, sha256):
+        return self.blob_dir / sha256[:2] / sha256
+
+    def _view_key(self, view_path):
+        return str(Path(view_path).relative_to(self.base_dir))
+
+    def has_view(self, view_path):
+        return self._view_key(view_path) in self.views
+
+    def _link(self, blob, view_path):
+        tmp = view_path.with_name(view_path.name + '.link')
+        tmp.unlink(missing_ok=True)
+        try:
+            os.link(blob, tmp)
+        except OSError:
+            os.symlink(os.path.relpath(blob, view_path.parent), tmp)
+        os.replace(tmp, view_path)
+
+    def ingest(self, file_path, view_path=None, url=None, sha256=None):
+        """Move `file_path` into the store and expose it at `view_path`.
+
+        If a blob with the same bytes already exists, the new copy is dropped
+        and the view points at the existing blob. Returns the sha256.
+        """
+        file_path = Path(file_path)
+        view_path = Path(view_path or file_path)
+        sha256 = sha256 or file_sha256(file_path)
+        blob = self.blob_path(sha256)
+
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(file_path, blob)
+        elif file_path.resolve() != blob.resolve():
+            file_path.unlink()
+        view_path.parent.mkdir(parents=True, exist_ok=True)
+        self._link(blob, view_path)
+
+        key = self._view_key(view_path)
+        previous = self.views.get(key)
+        if previous is not None:
+            self.manifest['blobs'][previous]['views'].remove(key)
+        entry = self.manifest['blobs'].setdefault(sha256, {'size': blob.stat().st_size, 'views': []})
+        entry['views'].append(key)
+        self.views[key] = sha256
+        if url:
+            self.manifest['urls'][url] = sha256
+        return sha256
+
+    def prune(self):
+        """Delete blobs no longer referenced by any view."""
+        removed = 0
+        for sha256, entry in list(self.manifest['blobs'].items()):
+            if not entry['views']:
+                self.blob_path(sha256).unlink(missing_ok=True)
+                del self.manifest['blobs'][sha256]
+                removed += 1
+        return removed
+
+    def ingest_tree(self):
+        """Migrate a plain `<category>/<file>` library into the store."""
+        for file_path in sorted(self.base_dir.rglob('*')):
+            if file_path.is_file() and not is_store_internal(file_path) and not self.has_view(file_path):
+                self.ingest(file_path)
+
+    def save(self):
+        tmp = self.manifest_path.with_name(self.manifest_path.name + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, self.manifest_path)
+
+    def stats(self):
+        views = sum(len(b['views']) for b in self.manifest['blobs'].values())
+        return {
+            'blobs': len(self.manifest['blobs']),
+            'views': views,
+            'stored_mb': sum(b['size'] for b in self.manifest['blobs'].values()) / (1024 * 1024),
+            'saved_mb': sum(b['size'] * (len(b['views']) - 1)
+                            for b in self.manifest['blobs'].values() if b['views']) / (1024 * 1024),
+        }
+
+
+def unique_by_content(paths):
+    """Group paths that share a blob (same inode); returns [(canonical, [aliases])].
+
+    Lets downstream stages fingerprint, extract and OCR each body once.
+    """
+    groups = {}
+    for path in paths:
+        st = Path(path).stat()
+        groups.setdefault((st.st_dev, st.st_ino), []).append(Path(path))
+    return [(group[0], group[1:]) for group in groups.values()]
+
+
+def is_store_internal(path):
+    """True for blob bodies, the manifest and in-flight temp files, which scanners must skip."""
+    path = Path(path)
+    return ('.blobs' in path.parts or path.name.startswith('blob_manifest.json')
+            or path.name.endswith(('.part', '.part.meta', '.link')))
+
+
+if __name__ == "__main__":
+    store = BlobStore()
+    store.ingest_tree()
+    store.prune()
+    store.save()
+    s = store.stats()
+    print(f"🧱 {s['views']} files -> {s['blobs']} blobs ({s['stored_mb']:.1f} MB stored, {s['saved_mb']:.1f} MB deduplicated)")
@@ -1,56 +1,122 @@
 import json
 import requests
 import time
+from email.utils import formatdate
 from pathlib import Path
 from urllib.parse import urlparse
+from async_download import AsyncDownloader, AIOHTTP_AVAILABLE
+from streaming_download import stream_download
+from crawl_state import CrawlState, file_sha256
+from blob_store import BlobStore
 
 class BulkDownloader:
-    def __init__(self, index_path='source_index.json', base_dir='scsmath_library'):
+    def __init__(self, index_path='source_index.json', base_dir='scsmath_library', workers=8, per_host_rate=2.0,
+                 state_path='crawl_state.json'):
         with open(index_path, 'r') as f:
             self.index = json.load(f)
         self.base_dir = Path(base_dir)
         self.session = requests.Session()
         self.session.headers.update({'User-Agent': 'Mozilla/5.0'})
-        
+        self.workers = workers
+        self.per_host_rate = per_host_rate
+        self.state = CrawlState(state_path)
+        self.blobs = BlobStore(self.base_dir)
+        self.sources_by_url = {src['url']: src for src in self.index['sources']}
+
         # Setup directories
         for cat in ['english_pdfs', 'english_epubs', 'indian_lang_pdfs', 'misc_articles']:
             (self.base_dir / cat).mkdir(parents=True, exist_ok=True)
 
+    def dest_path_for(self, src):
+        cat = src['category']
+        url = src['url']
+
+        # Create a clean filename
+        parsed_url = urlparse(url)
+        filename = Path(parsed_url.path).name
+        if not filename or src['type'] == 'html_article':
+            # Handle articles or extension-less URLs
+            safe_title = "".join([c if c.isalnum() else "_" for c in src['title']])[:50]
+            ext = '.html' if src['type'] == 'html_article' else Path(parsed_url.path).suffix or '.bin'
+            filename = f"{safe_title}{ext}"
+
+        return self.base_dir / cat / filename
+
+    def existing_copy_headers(self, url, dest_path):
+        """Conditional headers to re-check a file we already hold.
+
+        Recorded ETag/Last-Modified when the crawl state has them; otherwise
+        (files downloaded before crawl state existed, or servers that send no
+        validators) If-Modified-Since on the local copy's mtime. Either way the
+        check is a conditional GET through the downloader and its per-host
+        rate limit; the local file is only replaced when a newer body arrives
+        in full.
+        """
+        return (self.state.conditional_headers(url)
+                or {'If-Modified-Since': formatdate(dest_path.stat().st_mtime, usegmt=True)})
+
+    def pending_jobs(self):
+        jobs = []
+        for src in self.index['sources']:
+            url = src['url']
+            dest_path = self.dest_path_for(src)
+            headers = self.existing_copy_headers(url, dest_path) if dest_path.exists() else {}
+            jobs.append((url, dest_path, headers))
+        return jobs
+
+    def record_results(self, results):
+        for url, dest_path, result in results:
+            if result['status'] == 'not_modified':
+                if 'sha256' in self.state.entries.get(url, {}):
+                    self.state.mark_unchanged(url)
+                else:
+                    # Untracked local copy confirmed by the conditional GET: adopt it now
+                    self.state.adopt(url, result['headers'], dest_path.stat().st_size, file_sha256(dest_path))
+            elif result['status'] == 'downloaded':
+                sha256 = file_sha256(dest_path)
+                source = dict(self.sources_by_url.get(url, {'url': url}), path=str(dest_path))
+                self.state.record(url, result['headers'], result['size'], sha256, source=source)
+                # Identical bodies (reprints, cross-listed files) share one blob
+                self.blobs.ingest(dest_path, url=url, sha256=sha256)
+        self.state.save()
+        self.blobs.prune()
+        self.blobs.save()
+        changes_path = self.state.write_changes()
+        print(f"🔁 {len(self.state.changed)} changed sources written to {changes_path}")
+
     def download_all(self):
-        sources = self.index['sources']
-        total = len(sources)
+        total = len(self.index['sources'])
         print(f"🚀 Starting bulk download of {total} sources...")
-        
-        for i, src in enumerate(sources, 1):
-            cat = src['category']
-            url = src['url']
-            
-            # Create a clean filename
-            parsed_url = urlparse(url)
-            filename = Path(parsed_url.path).name
-            if not filename or src['type'] == 'html_article':
-                # Handle articles or extension-less URLs
-                safe_title = "".join([c if c.isalnum() else "_" for c in src['title']])[:50]
-                ext = '.html' if src['type'] == 'html_article' else Path(parsed_url.path).suffix or '.bin'
-                filename = f"{safe_title}{ext}"
-            
-            dest_path = self.base_dir / cat / filename
-            
-            if dest_path.exists():
-                print(f"[{i}/{total}] ⏭️ Skipping {filename} (Already exists)")
-                continue
-                
-            print(f"[{i}/{total}] 📥 Downloading {url}...")
-            try:
-                resp = self.session.get(url, timeout=60)
-                resp.raise_for_status()
-                dest_path.write_bytes(resp.content)
-                time.sleep(0.5) # Polite delay
-            except Exception as e:
-                print(f"  ❌ Error downloading {url}: {e}")
-                
+        jobs = self.pending_jobs()
+
+        if AIOHTTP_AVAILABLE and self.workers > 1:
+            engine = AsyncDownloader(workers=self.workers, per_host_rate=self.per_host_rate,
+                                     headers=dict(self.session.headers))
+            stats = engine.download(jobs)
+            mb = stats['bytes'] / (1024 * 1024)
+            print(f"\n📊 {stats['files']} files, {mb:.1f} MB in {stats['elapsed']:.1f}s "
+                  f"({stats['files'] / max(stats['elapsed'], 1e-9):.2f} files/s, "
+                  f"{mb / max(stats['elapsed'], 1e-9):.2f} MB/s), "
+                  f"{stats['not_modified']} unchanged, {stats['errors']} errors")
+            results = stats['results']
+        else:
+            results = self.download_serial(jobs)
+
+        self.record_results(results)
         print("\n✨ Bulk download complete.")
 
+    def download_serial(self, jobs):
+        results = []
+        for i, (url, dest_path, headers) in enumerate(jobs, 1):
+            print(f"[{i}/{len(jobs)}] 📥 Downloading {url}...")
+            result = stream_download(self.session, url, dest_path, headers=headers)
+            if result['status'] == 'failed':
+                print(f"  ❌ Error downloading {url}")
+            elif result['status'] == 'downloaded':
+                time.sleep(0.5) # Polite delay
+            results.append((url, dest_path, result))
+        return results
+
 if __name__ == "__main__":
     downloader = BulkDownloader()
     downloader.download_all()
@@ -1,87 +1,33 @@
-import re
+import argparse
+import hashlib
+import json
 import os
-import unicodedata
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
+from normalizer_core import NormalizerCore, OCR_FIXES, DIACRITICS, BOILERPLATE_PATTERNS, CONTACT_PATTERNS
 
 class CanonicalNormalizer:
     def __init__(self):
-        # 1. OCR Artifact Fixes (from EnglishSanitizer)
-        self.ocr_fixes = [
-            (r'çr\^', 'Srila'),
-            (r'Ír\(', 'Sri'),
-            (r'Maéh', 'Math'),
-            (r'Maöh', 'Math'),
-            (r'Gauråíga', 'Gauranga'),
-            (r'Gaurå&ga', 'Gauranga'),
-            (r'Ír\(la', 'Srila'),
-            (r'Srilala', 'Srila'),
-            (r'Vi!@upåd', 'Vishnupad'),
-            (r'Rak!ak', 'Rakshak'),
-            (r'Ír\(dhar', 'Sridhar'),
-            (r'Ír\(man', 'Sriman'),
-        ]
-
-        # 2. Diacritic Standardization (from TextCleaner)
-        self.diacritic_replacements = {
-            r'\bKrishna\b': 'Kṛṣṇa',
-            r'\bSrila\b': 'Śrīla',
-            r'\bSri\b': 'Śrī',
-            r'\bSrimad\b': 'Śrīmad',
-            r'\bChaitanya\b': 'Caitanya',
-            r'\bSaranagati\b': 'Śaraṇāgati',
-            r'\bBhakti\b': 'Bhakti',
-            r'\bVaishnava\b': 'Vaiṣṇava',
-            r'\bMaharaj\b': 'Mahārāj',
-        }
-
-        # 3. Institutional Boilerplate Removal
-        self.boilerplate_regex = [
-            r'All glories to Sri Guru and Sri Gauranga',
-            r'All Glory to Sri Sri Guru-Gauranga',
-            r'Sri Chaitanya Saraswat Math',
-            r'Kolerganj, (?:P\.O\.|Post Office:) Nabadwip,.*?(?:Pin \d+|West Bengal|India)',
-            r'Website: http://www\.scsmath\.com',
-            r'© All rights reserved by.*',
-            r'Edited by:.*',
-            r'Published by:.*',
-            r'Assistant editor:.*',
-            r'Founder-Acharya:.*',
-            r'Sevaite-President-Acharya:.*',
-            r'Printed in India.*',
-            r'— \d+ —', # Page numbers
-            r'—·  · — \d+', # Fancy page numbers
-            r'www\..*\.org',
-            r'http[s]?://\S+',
-            r'Email: \S+',
-            r'Mobile: \S+',
-            r'Phone: \S+',
-            r'Fax: \S+'
-        ]
+        # Shared with EnglishSanitizer (normalizer_core): OCR artifact fixes,
+        # diacritic standardization, boilerplate plus contact info
+        self.core = NormalizerCore(
+            fixes=OCR_FIXES,
+            boilerplate=BOILERPLATE_PATTERNS + CONTACT_PATTERNS,
+            diacritics=DIACRITICS
+        )
 
     def normalize_chars(self, text):
         """Fix OCR artifacts and control characters."""
-        # Remove control characters except newline and tab
-        text = ''.join(ch for ch in text if unicodedata.category(ch)[0] != 'C' or ch in '\n\t')
-        
-        for pattern, replacement in self.ocr_fixes:
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-        return text
+        return self.core.fix_artifacts(text, control_chars=True)
 
     def standardize_diacritics(self, text):
         """Standardize transliteration to include diacritics."""
-        for pattern, replacement in self.diacritic_replacements.items():
-            text = re.sub(pattern, replacement, text)
-        return text
+        return self.core.standardize_diacritics(text)
 
     def strip_boilerplate(self, text):
         """Remove institutional boilerplate and contact info."""
-        for pattern in self.boilerplate_regex:
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE | re.MULTILINE)
-        
-        # Remove excessive whitespace
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        lines = [line.strip() for line in text.split('\n')]
-        return '\n'.join([line for line in lines if line])
+        return self.core.strip_boilerplate(text)
 
     def clean(self, text):
         """Full normalization pipeline."""
@@ -90,25 +36,150 @@ class CanonicalNormalizer:
         text = self.standardize_diacritics(text)
         return text.strip()
 
-def process_directory(input_dir, output_dir):
-    normalizer = CanonicalNormalizer()
+    def rule_set_hash(self):
+        """Hash of the rules `clean` applies; changes whenever any rule does."""
+        return self.core.rule_set_hash()
+
+
+# Worker-side normalizer, compiled once per process
+_normalizer = None
+
+
+def _worker_normalizer():
+    global _normalizer
+    if _normalizer is None:
+        _normalizer = CanonicalNormalizer()
+    return _normalizer
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _output_matches(out_path, sha256):
+    try:
+        return _sha256(Path(out_path).read_bytes()) == sha256
+    except OSError:
+        return False
+
+
+def clean_file(in_path, out_path, previous=None):
+    """Clean one file and atomically write its output; returns (action, manifest entry).
+
+    `action` is 'skipped' when `previous` (the file's last manifest entry)
+    has the same input checksum and rule-set hash and its output is still
+    on disk. Otherwise the file is cleaned: 'unchanged' when the result
+    equals the output already on disk (which is left untouched),
+    'cleaned' when it was written, 'failed' on error.
+    """
+    start = time.perf_counter()
+    try:
+        data = Path(in_path).read_bytes()
+        normalizer = _worker_normalizer()
+        input_sha256, rules = _sha256(data), normalizer.rule_set_hash()
+        if (previous and previous.get('status') == 'done' and previous.get('input_sha256') == input_sha256
+                and previous.get('rules') == rules and _output_matches(out_path, previous.get('output_sha256'))):
+            return 'skipped', previous
+
+        # Universal newlines, as read_text would
+        text = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        cleaned = normalizer.clean(text).encode('utf-8')
+        output_sha256 = _sha256(cleaned)
+        action = 'unchanged' if _output_matches(out_path, output_sha256) else 'cleaned'
+        if action == 'cleaned':
+            tmp = Path(out_path).with_name(Path(out_path).name + '.tmp')
+            tmp.write_bytes(cleaned)
+            os.replace(tmp, out_path)
+        return action, {
+            'status': 'done', 'input_sha256': input_sha256, 'rules': rules,
+            'output_sha256': output_sha256, 'bytes': len(cleaned),
+            'seconds': round(time.perf_counter() - start, 3)
+        }
+    except Exception as e:
+        return 'failed', {'status': 'failed', 'error': str(e), 'seconds': round(time.perf_counter() - start, 3)}
+
+
+def _save_manifest(manifest_path, manifest):
+    tmp = manifest_path.with_name(manifest_path.name + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, manifest_path)
+
+
+def process_directory(input_dir, output_dir, workers=None, force=False, save_every=50):
+    """Clean every .txt file of `input_dir` into `output_dir` on a process pool.
+
+    `<output_dir>/normalize_manifest.json` records each file's input
+    checksum and the rule-set hash it was cleaned with. Files whose input
+    and rules are unchanged since the last run are skipped. After a rule
+    edit every file is cleaned again, but only outputs whose text changed
+    are rewritten. `force` ignores the manifest.
+    """
     input_path = Path(input_dir)
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count()
+
+    manifest_path = output_path / 'normalize_manifest.json'
+    manifest = {'files': {}}
+    if manifest_path.exists() and not force:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+
+    files = sorted(input_path.glob("*.txt"))
+    print(f"🧹 Found {len(files)} files to clean on {workers} workers.")
+    counts = {'cleaned': 0, 'unchanged': 0, 'skipped': 0, 'failed': 0}
+    start = time.perf_counter()
+
+    def job(file_path):
+        return file_path, output_path / file_path.name, manifest['files'].get(file_path.name)
+
+    def record(file_path, action, entry):
+        manifest['files'][file_path.name] = entry
+        counts[action] += 1
+        if action == 'failed':
+            print(f"  ❌ Error processing {file_path.name}: {entry['error']}")
+        if sum(counts.values()) % save_every == 0:
+            _save_manifest(manifest_path, manifest)
+
+    try:
+        if workers <= 1:
+            for file_path in files:
+                record(file_path, *clean_file(*job(file_path)))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                jobs = iter(files)
+                pending = {}
+                # Keep the pool busy without queueing every file up front
+                for file_path in jobs:
+                    pending[pool.submit(clean_file, *job(file_path))] = file_path
+                    if len(pending) >= 2 * workers:
+                        break
+                while pending:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        record(pending.pop(future), *future.result())
+                        file_path = next(jobs, None)
+                        if file_path:
+                            pending[pool.submit(clean_file, *job(file_path))] = file_path
+    finally:
+        _save_manifest(manifest_path, manifest)
+
+    elapsed = time.perf_counter() - start
+    print(f"✨ Cleaned {counts['cleaned']}, {counts['unchanged']} with identical output, "
+          f"skipped {counts['skipped']} unchanged, {counts['failed']} failed in {elapsed:.1f}s")
+    return counts
+
 
-    files = list(input_path.glob("*.txt"))
-    print(f"🧹 Found {len(files)} files to clean.")
+def main():
+    parser = argparse.ArgumentParser(description="Incremental, parallel canonical normalization of text files")
+    parser.add_argument("input_dir", nargs="?", default="data/raw")
+    parser.add_argument("output_dir", nargs="?", default="data/cleaned")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="Re-clean every file, ignoring the manifest")
+    args = parser.parse_args()
+    process_directory(args.input_dir, args.output_dir, workers=args.workers, force=args.force)
 
-    for file_path in files:
-        print(f"  🧼 Processing {file_path.name}...")
-        try:
-            content = file_path.read_text(encoding='utf-8')
-            cleaned_content = normalizer.clean(content)
-            
-            output_file = output_path / file_path.name
-            output_file.write_text(cleaned_content, encoding='utf-8')
-        except Exception as e:
-            print(f"  ❌ Error processing {file_path.name}: {e}")
 
 if __name__ == "__main__":
-    process_directory("data/raw", "data/cleaned")
+    main()
@@ -1,6 +1,7 @@
 import pikepdf
 from pathlib import Path
 import json
+from pdf_classifier import classify_page, PAGE_CODES
 
 def check_indian_pdfs():
     samples_dir = Path('entropy_samples')
@@ -13,20 +14,21 @@ def check_indian_pdfs():
         print(f"🧐 Checking {file_path.name}...")
         try:
             with pikepdf.open(file_path) as pdf:
-                has_fonts = False
-                for page in pdf.pages[:5]:
-                    if hasattr(page, 'Resources') and '/Font' in page.Resources:
-                        has_fonts = True
-                        break
+                pages = [classify_page(page) for page in pdf.pages]
+                has_fonts = any(p['fonts'] for p in pages)
+                page_types = ''.join(PAGE_CODES[p['type']] for p in pages)
                 
                 results[file_path.name] = {
                     "has_fonts": has_fonts,
+                    "page_types": page_types,
+                    "scanned_pages": page_types.count('s'),
                     "page_count": len(pdf.pages),
                     "producer": str(pdf.docinfo.get("/Producer", "Unknown")),
                     "creator": str(pdf.docinfo.get("/Creator", "Unknown")),
                     "is_linearized": pdf.is_linearized
                 }
-                print(f"  Result: {'Has Fonts (May be legacy encoding)' if has_fonts else 'No Fonts (Likely image-scan)'}")
+                print(f"  Result: {'Has Fonts (May be legacy encoding)' if has_fonts else 'No Fonts (Likely image-scan)'}"
+                      f", {page_types.count('s')}/{len(pages)} scanned pages")
         except Exception as e:
             results[file_path.name] = {"error": str(e)}
             print(f"  ❌ Error: {e}")
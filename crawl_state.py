@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+
+def _validators(headers):
+    # Header names differ in case between servers and HTTP clients
+    headers = {k.lower(): v for k, v in headers.items()}
+    return {'etag': headers.get('etag'), 'last_modified': headers.get('last-modified')}
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class CrawlState:
+    """Persistent per-URL validators (ETag, Last-Modified, size, sha256).
+
+    Used to turn every re-crawl into conditional requests: unchanged pages
+    and files answer 304 and are neither re-downloaded nor re-parsed. URLs
+    whose content actually changed are collected in `self.changed` for the
+    downstream stages.
+    """
+
+    def __init__(self, path='crawl_state.json'):
+        self.path = Path(path)
+        self.entries = {}
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                self.entries = json.load(f)
+        self.changed = []
+        self.touched = set() # URLs this run checked; only these are written back
+
+    def conditional_headers(self, url):
+        entry = self.entries.get(url, {})
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def adopt(self, url, headers, size, sha256):
+        """Record validators for content we already hold, without flagging a change."""
+        self.touched.add(url)
+        self.entries[url] = {
+            **_validators(headers),
+            'size': size,
+            'sha256': sha256,
+            'checked_at': datetime.now().isoformat(),
+        }
+
+    def mark_unchanged(self, url):
+        self.touched.add(url)
+        self.entries.setdefault(url, {})['checked_at'] = datetime.now().isoformat()
+
+    def record(self, url, headers, size=None, sha256=None, source=None):
+        """Store fresh validators for `url`; returns True if the content changed."""
+        self.touched.add(url)
+        entry = self.entries.get(url, {})
+        is_new = 'sha256' not in entry and 'etag' not in entry
+        changed = is_new or sha256 is None or entry.get('sha256') != sha256
+        now = datetime.now().isoformat()
+
+        entry.update({
+            **_validators(headers),
+            'size': size,
+            'sha256': sha256,
+            'checked_at': now,
+        })
+        if changed:
+            entry['changed_at'] = now
+            change = dict(source or {'url': url})
+            change.update({'status': 'new' if is_new else 'modified', 'sha256': sha256})
+            self.changed.append(change)
+        self.entries[url] = entry
+        return changed
+
+    def save(self):
+        """Write the URLs this run checked into the state file.
+
+        Entries another CrawlState saved to the same file since this one was
+        loaded (e.g. discovery's index pages while a download ran) are kept.
+        """
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                entries = json.load(f)
+            entries.update({url: self.entries[url] for url in self.touched})
+            self.entries = entries
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def write_changes(self, name='changed_sources.json'):
+        """Write this run's changed URLs to `name` next to the state file; returns its path."""
+        path = self.path.with_name(name)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'generated_at': datetime.now().isoformat(),
+                'total_changed': len(self.changed),
+                'sources': self.changed
+            }, f, indent=2, ensure_ascii=False)
+        return path
@@ -11,6 +11,108 @@ from pathlib import Path
 from typing import List, Dict, Set
 from collections import Counter
 import unicodedata
+from script_profile import script_counts, script_profile
+
+
+# Cleaning rules. Each fix table is also merged into one alternation regex;
+# that is only equivalent to applying the entries one after another because
+# no replacement creates or breaks a match of another entry in the same table.
+# Across tables it does: dropping ’ in 'র’l' puts the 'l' right after a word
+# character, so r'\bl\b' must not match. The tables therefore stay separate passes.
+SANSKRIT_REPLACEMENTS = {
+    'Krishna': 'Kṛṣṇa',
+    'Srila': 'Śrīla',
+    'Sri': 'Śrī',
+    'Srimad': 'Śrīmad',
+    'Chaitanya': 'Caitanya',
+}
+OCR_FIXES = {
+    r'\bl\b': 'I',  # lowercase L misread as I
+    r'\bO\b': '0',  # O misread as zero
+    'tbe': 'the',
+    'sbould': 'should',
+    'witb': 'with',
+}
+BENGALI_OCR_FIXES = {
+    r'হ\*তে': 'হতে',
+    r'র’': 'র',
+    r'ত’': 'ত',
+    r'ন’': 'ন',
+    r'’': "'", # Standardize quotes
+}
+# Patterns for contacts and URLs only
+CONTACT_PATTERNS = [
+    r'\d{10,}', r'\d{3}-\d{3}-\d{4}', # Phone numbers
+    r'www\..*\.org', r'http[s]?://', # URLs
+    r'Email:', r'Mobile:', r'Phone:', r'Fax:'
+]
+
+# Alternations start with a lookahead on their possible first characters so
+# the regex engine can skip ahead instead of trying every branch at each position
+_CONTACT_RES = [re.compile(p, re.I) for p in CONTACT_PATTERNS]
+_ANY_CONTACT = re.compile(r'(?=[\dwhempf])(?:' + '|'.join(CONTACT_PATTERNS) + ')', re.I)
+_PAGE_NUMBER = re.compile(r'^\s*\d+\s*$')
+_HEADER = re.compile(r'(?=[swp])(Sri Chaitanya Saraswat Math|www\.scsmath|Page \d+)', re.I)
+_SANSKRIT = re.compile(r'\b(?=[KSC])(?:' + '|'.join(SANSKRIT_REPLACEMENTS) + r')\b')
+_BLANK_RUNS = re.compile(r'\n{3,}')
+
+
+def _char_class(codepoints):
+    """Regex character class for a sorted list of code points, as ranges."""
+    ranges = []
+    for cp in codepoints:
+        if ranges and ranges[-1][1] == cp - 1:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    return '[' + ''.join(re.escape(chr(a)) if a == b else f'{re.escape(chr(a))}-{re.escape(chr(b))}'
+                         for a, b in ranges) + ']'
+
+
+# Control characters (category C*) other than newline and tab. The BMP ones are
+# precomputed into one character class; characters beyond it are rare and checked one by one
+_CONTROL_CHARS = re.compile(_char_class([cp for cp in range(0x10000)
+                                         if unicodedata.category(chr(cp))[0] == 'C' and chr(cp) not in '\n\t']))
+_ASTRAL = re.compile('[\U00010000-\U0010FFFF]')
+
+
+def _astral_control(match):
+    ch = match.group()
+    return '' if unicodedata.category(ch)[0] == 'C' else ch
+
+
+def _sanskrit_word(match):
+    return SANSKRIT_REPLACEMENTS[match.group()]
+
+
+def _fixer(*tables):
+    """One compiled alternation over fix tables, and the callback that picks each replacement.
+
+    Fix patterns must start with a literal character (after an optional \\b).
+    """
+    replacements = {}
+    alternatives = []
+    first = set()
+    for table in tables:
+        for pattern, replacement in table.items():
+            name = f'f{len(replacements)}'
+            replacements[name] = replacement
+            alternatives.append(f'(?P<{name}>{pattern})')
+            literal = pattern[2:] if pattern.startswith(r'\b') else pattern
+            first.add(literal[1] if literal[0] == '\\' else literal[0])
+    pattern = re.compile(f"(?={_char_class(sorted(map(ord, first)))})(?:{'|'.join(alternatives)})")
+    return pattern, lambda m: replacements[m.lastgroup]
+
+
+_BENGALI_FIXER = _fixer(BENGALI_OCR_FIXES)
+_OCR_FIXER = _fixer(OCR_FIXES)
+# Fix passes per (is_bengali, fix_ocr), in the order they apply
+_FIXERS = {
+    (True, True): (_BENGALI_FIXER, _OCR_FIXER),
+    (True, False): (_BENGALI_FIXER,),
+    (False, True): (_OCR_FIXER,),
+    (False, False): (),
+}
 
 
 class TextCleaner:
@@ -24,10 +126,10 @@ class TextCleaner:
         
         for line in lines:
             # Skip page numbers
-            if re.match(r'^\s*\d+\s*$', line):
+            if _PAGE_NUMBER.match(line):
                 continue
             # Skip common headers
-            if re.search(r'(Sri Chaitanya Saraswat Math|www\.scsmath|Page \d+)', line, re.I):
+            if _HEADER.search(line):
                 continue
             cleaned.append(line)
         
@@ -36,99 +138,67 @@ class TextCleaner:
     @staticmethod
     def normalize_sanskrit(text: str) -> str:
         """Normalize Sanskrit transliteration."""
-        # Common variations to standardize
-        replacements = {
-            'Krishna': 'Kṛṣṇa',
-            'Srila': 'Śrīla',
-            'Sri': 'Śrī',
-            'Srimad': 'Śrīmad',
-            'Chaitanya': 'Caitanya',
-        }
-        
-        # You can expand this based on your tradition's preferences
-        result = text
-        for old, new in replacements.items():
-            result = re.sub(rf'\b{old}\b', new, result)
-        
-        return result
+        # Common variations to standardize; expand SANSKRIT_REPLACEMENTS per tradition
+        return _SANSKRIT.sub(_sanskrit_word, text)
     
     @staticmethod
     def fix_common_ocr_errors(text: str) -> str:
         """Fix common OCR mistakes in older PDFs."""
-        fixes = {
-            r'\bl\b': 'I',  # lowercase L misread as I
-            r'\bO\b': '0',  # O misread as zero
-            'tbe': 'the',
-            'sbould': 'should',
-            'witb': 'with',
-        }
-        
-        result = text
-        for pattern, replacement in fixes.items():
-            result = re.sub(pattern, replacement, result)
-        
-        return result
+        pattern, replace = _OCR_FIXER
+        return pattern.sub(replace, text)
+    
+    @staticmethod
+    def script_counts(text: str) -> Counter:
+        """Count Bengali, Devanagari and Latin letters in text."""
+        return script_counts(text)
     
     @staticmethod
     def detect_script(text: str) -> str:
         """Detect if text is primarily Bengali, Devanagari, or Latin script."""
-        counts = Counter()
-        for char in text:
-            name = unicodedata.name(char, "")
-            if "BENGALI" in name:
-                counts["Bengali"] += 1
-            elif "DEVANAGARI" in name:
-                counts["Devanagari"] += 1
-            elif "LATIN" in name and char.isalpha():
-                counts["Latin"] += 1
-        
-        if not counts:
-            return "Unknown"
-        return counts.most_common(1)[0][0]
+        return script_profile(text)["dominant"]
+    
+    @staticmethod
+    def script_ratio(text: str, script: str = None) -> float:
+        """Share of script letters that belong to `script` (default: the dominant one).
+        
+        Clean OCR of a Bengali page is almost all Bengali; a low ratio means
+        the recognizer produced mixed-script garbage.
+        """
+        profile = script_profile(text)
+        if profile["dominant"] == "Unknown":
+            return 0.0
+        return profile["ratios"].get(script or profile["dominant"], 0.0)
 
     @staticmethod
     def remove_contacts_only(text: str) -> str:
         """Remove only phone numbers and URLs, keeping all religious text."""
-        lines = text.split('\n')
-        cleaned = []
-        
-        # Patterns for contacts and URLs only
-        patterns = [
-            r'\d{10,}', r'\d{3}-\d{3}-\d{4}', # Phone numbers
-            r'www\..*\.org', r'http[s]?://', # URLs
-            r'Email:', r'Mobile:', r'Phone:', r'Fax:'
-        ]
-        
-        for line in lines:
-            if any(re.search(p, line, re.I) for p in patterns):
-                # If a line is ONLY a phone number or URL, skip it
-                # If it's mixed, we might want to just strip the pattern (to be safe)
-                new_line = line
-                for p in patterns:
-                    new_line = re.sub(p, '', new_line, flags=re.I)
-                if new_line.strip():
-                    cleaned.append(new_line)
-                continue
-            cleaned.append(line)
-        
-        return '\n'.join(cleaned)
+        return '\n'.join(line for line in map(TextCleaner._strip_contacts, text.split('\n'))
+                         if line is not None)
+
+    @staticmethod
+    def _strip_contacts(line: str):
+        """The line with contact patterns removed, or None if nothing else was on it."""
+        if not _ANY_CONTACT.search(line):
+            return line
+        # If a line is ONLY a phone number or URL, skip it
+        # If it's mixed, we might want to just strip the pattern (to be safe)
+        for pattern in _CONTACT_RES:
+            line = pattern.sub('', line)
+        return line if line.strip() else None
 
     @staticmethod
     def fix_bengali_ocr_errors(text: str) -> str:
         """Fix common Bengali OCR mistakes."""
-        fixes = {
-            r'হ\*তে': 'হতে',
-            r'র’': 'র',
-            r'ত’': 'ত',
-            r'ন’': 'ন',
-            r'’': "'", # Standardize quotes
-        }
-        
-        result = text
-        for pattern, replacement in fixes.items():
-            result = re.sub(pattern, replacement, result)
-        
-        return result
+        pattern, replace = _BENGALI_FIXER
+        return pattern.sub(replace, text)
+
+    @staticmethod
+    def remove_control_chars(text: str) -> str:
+        """Drop control/format characters (Unicode category C), keeping newlines and tabs."""
+        text = _CONTROL_CHARS.sub('', text)
+        if _ASTRAL.search(text):
+            text = _ASTRAL.sub(_astral_control, text)
+        return text
 
     @staticmethod
     def clean_text(text: str, 
@@ -136,31 +206,41 @@ class TextCleaner:
                    normalize_devanagari: bool = False,
                    fix_ocr: bool = True,
                    is_bengali: bool = True) -> str:
-        """Comprehensive text cleaning pipeline."""
-        
-        # Remove control characters
-        text = ''.join(ch for ch in text if unicodedata.category(ch)[0] != 'C' or ch in '\n\t')
+        """Comprehensive text cleaning pipeline.
         
-        # Remove only contact info, preserve religious boilerplate/jai dhvani
-        text = TextCleaner.remove_contacts_only(text)
+        Same result as running remove_contacts_only, the Bengali and
+        general OCR fixes, remove_headers_footers and normalize_sanskrit in
+        turn, but every line goes through all steps in a single pass with
+        precompiled patterns.
+        """
         
-        if is_bengali:
-            text = TextCleaner.fix_bengali_ocr_errors(text)
-        
-        # Fix OCR errors (English/general)
-        if fix_ocr:
-            text = TextCleaner.fix_common_ocr_errors(text)
-        
-        # Remove headers/footers
-        if remove_headers:
-            text = TextCleaner.remove_headers_footers(text)
+        # Remove control characters
+        text = TextCleaner.remove_control_chars(text)
         
-        # Normalize Sanskrit if requested
-        if normalize_devanagari:
-            text = TextCleaner.normalize_sanskrit(text)
+        fixers = _FIXERS[bool(is_bengali), bool(fix_ocr)]
+        cleaned = []
+        for line in text.split('\n'):
+            # Remove only contact info, preserve religious boilerplate/jai dhvani
+            if _ANY_CONTACT.search(line):
+                line = TextCleaner._strip_contacts(line)
+                if line is None:
+                    continue
+            
+            # Fix OCR errors (Bengali, then English/general)
+            for pattern, replace in fixers:
+                line = pattern.sub(replace, line)
+            
+            # Remove headers/footers
+            if remove_headers and (_PAGE_NUMBER.match(line) or _HEADER.search(line)):
+                continue
+            
+            # Normalize Sanskrit if requested
+            if normalize_devanagari:
+                line = _SANSKRIT.sub(_sanskrit_word, line)
+            cleaned.append(line)
         
         # Remove excessive whitespace
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = _BLANK_RUNS.sub('\n\n', '\n'.join(cleaned))
         
         return text.strip()
 
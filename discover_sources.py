@@ -5,6 +5,8 @@ from urllib.parse import urljoin, urlparse
 from pathlib import Path
 from datetime import datetime
 import time
+import hashlib
+from crawl_state import CrawlState
 
 class SourceDiscoverer:
     PAGES = {
@@ -14,7 +16,14 @@ class SourceDiscoverer:
         'misc_articles': 'https://scsmath.com/docs/text_archive.html'
     }
 
-    def __init__(self):
+    def __init__(self, index_path='source_index.json', state_path='crawl_state.json'):
+        self.index_path = Path(index_path)
+        self.state = CrawlState(state_path)
+        self.previous = {}
+        if self.index_path.exists():
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for src in json.load(f).get('sources', []):
+                    self.previous.setdefault(src['category'], []).append(src)
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
@@ -28,11 +37,40 @@ class SourceDiscoverer:
         }
 
     def discover(self):
+        self._discover_pages()
+        self.index['metadata']['total_sources'] = len(self.index['sources'])
+        
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=2, ensure_ascii=False)
+        # Index page validators only after the index holds their sources: a
+        # 304 next time reuses the sources from this index
+        self.state.save()
+        changes_path = self.state.write_changes('changed_index_pages.json')
+        print(f"🔁 {len(self.state.changed)} changed index pages written to {changes_path}")
+        print(f"\n✨ Discovery complete. {len(self.index['sources'])} sources saved to {self.index_path}")
+
+    def _discover_pages(self):
         for category, url in self.PAGES.items():
             print(f"🔍 Exploring {category} at {url}...")
             try:
-                response = self.session.get(url, timeout=30)
+                # Only ask for a 304 if we still have the sources parsed last time
+                known = self.previous.get(category, [])
+                headers = self.state.conditional_headers(url) if known else {}
+                response = self.session.get(url, timeout=30, headers=headers)
+                if response.status_code == 304:
+                    self.state.mark_unchanged(url)
+                    self.index['sources'].extend(known)
+                    print(f"⏭️ {category} unchanged, reusing {len(known)} sources")
+                    continue
                 response.raise_for_status()
+
+                page_hash = hashlib.sha256(response.content).hexdigest()
+                if not self.state.record(url, response.headers, len(response.content), page_hash) and known:
+                    self.index['sources'].extend(known)
+                    print(f"⏭️ {category} content identical, reusing {len(known)} sources")
+                    continue
+
+                known_urls = {src['url']: src for src in known}
                 soup = BeautifulSoup(response.content, 'html.parser')
                 
                 base_domain = f"{urlparse(url).scheme}://{urlparse(url).netloc}"
@@ -65,12 +103,13 @@ class SourceDiscoverer:
                             if parent:
                                 title = parent.get_text(strip=True)[:200]
                         
+                        previous = known_urls.get(full_url, {})
                         self.index['sources'].append({
                             'category': category,
                             'type': source_type,
                             'title': title,
                             'url': full_url,
-                            'discovered_at': datetime.now().isoformat()
+                            'discovered_at': previous.get('discovered_at', datetime.now().isoformat())
                         })
                         count += 1
                 
@@ -79,12 +118,6 @@ class SourceDiscoverer:
             except Exception as e:
                 print(f"❌ Error exploring {url}: {e}")
 
-        self.index['metadata']['total_sources'] = len(self.index['sources'])
-        
-        with open('source_index.json', 'w', encoding='utf-8') as f:
-            json.dump(self.index, f, indent=2, ensure_ascii=False)
-        print(f"\n✨ Discovery complete. {len(self.index['sources'])} sources saved to source_index.json")
-
 if __name__ == "__main__":
     discoverer = SourceDiscoverer()
     discoverer.discover()
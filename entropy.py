@@ -0,0 +1,93 @@
+import math
+from collections import Counter
+from pathlib import Path
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+BLOCK_SIZE = 1024 * 1024 # 1 MiB
+HIGH_ENTROPY = 7.5 # bits/byte; compressed image streams sit just under 8
+
+
+def shannon_entropy(counts):
+    """Entropy in bits/byte of a 256-bin byte histogram."""
+    if NUMPY_AVAILABLE:
+        counts = np.asarray(counts, dtype=np.float64)
+        total = counts.sum()
+        if not total:
+            return 0
+        p = counts[counts > 0] / total
+        return float(-(p * np.log2(p)).sum())
+    total = sum(counts)
+    if not total:
+        return 0
+    return -sum(c / total * math.log2(c / total) for c in counts if c)
+
+
+def byte_histogram(data):
+    """Single-pass 256-bin histogram of a bytes-like object."""
+    if NUMPY_AVAILABLE:
+        return np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+    counter = Counter(data)
+    return [counter.get(b, 0) for b in range(256)]
+
+
+def bytes_entropy(data):
+    return shannon_entropy(byte_histogram(data)) if data else 0
+
+
+def _iter_blocks(path, block_size):
+    size = Path(path).stat().st_size
+    if not size:
+        return
+    if NUMPY_AVAILABLE:
+        mm = np.memmap(path, dtype=np.uint8, mode='r')
+        try:
+            for offset in range(0, size, block_size):
+                yield np.bincount(mm[offset:offset + block_size], minlength=256)
+        finally:
+            del mm
+    else:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                yield byte_histogram(block)
+
+
+def file_entropy_profile(path, block_size=BLOCK_SIZE):
+    """Whole-file entropy plus per-block entropies, from one pass over memory-mapped blocks.
+
+    Image-only scans are dominated by DCT/JBIG2 streams, so nearly every
+    block is close to 8 bits/byte; text PDFs show a spread of lower blocks
+    (fonts, content streams, xref tables).
+    """
+    total = np.zeros(256, dtype=np.int64) if NUMPY_AVAILABLE else [0] * 256
+    blocks = []
+    for hist in _iter_blocks(path, block_size):
+        if NUMPY_AVAILABLE:
+            total += hist
+        else:
+            total = [a + b for a, b in zip(total, hist)]
+        blocks.append(shannon_entropy(hist))
+    return {'entropy': shannon_entropy(total), 'blocks': blocks}
+
+
+def file_entropy(path, block_size=BLOCK_SIZE):
+    return file_entropy_profile(path, block_size)['entropy']
+
+
+def profile_summary(blocks):
+    """Compact per-block statistics for JSON reports."""
+    if not blocks:
+        return {'block_count': 0}
+    mean = sum(blocks) / len(blocks)
+    return {
+        'block_count': len(blocks),
+        'block_entropy_min': min(blocks),
+        'block_entropy_mean': mean,
+        'block_entropy_max': max(blocks),
+        'block_entropy_std': math.sqrt(sum((b - mean) ** 2 for b in blocks) / len(blocks)),
+        'high_entropy_ratio': sum(1 for b in blocks if b >= HIGH_ENTROPY) / len(blocks),
+    }
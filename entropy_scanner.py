@@ -1,15 +1,63 @@
 import os
 import json
-import math
 import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-import pikepdf
 from epub_meta import get_epub_metadata
 import magic
+from entropy import file_entropy, file_entropy_profile, profile_summary
+from blob_store import is_store_internal, unique_by_content
+from scan_cache import ScanCache
+from report_index import cluster_id_for
+from pdf_classifier import classify_pdf
+from pdf_text import pdf_metadata
+
+def scan_file(file_path):
+    """Fingerprint one file; module-level so it can run in a worker process."""
+    file_path = Path(file_path)
+
+    # Basic Info
+    mime = magic.from_file(str(file_path), mime=True)
+    profile = file_entropy_profile(file_path)
+    size = file_path.stat().st_size
+
+    file_info = {
+        'path': str(file_path),
+        'filename': file_path.name,
+        'category': file_path.parent.name,
+        'mime': mime,
+        'entropy': profile['entropy'],
+        'entropy_profile': profile_summary(profile['blocks']),
+        'size_kb': size / 1024
+    }
+
+    # Deep Metadata
+    if 'pdf' in mime:
+        try:
+            file_info.update(pdf_metadata(file_path))
+        except:
+            file_info['pdf_error'] = True
+        try:
+            # Text / scanned / mixed / blank per page, so extraction can route before OCR
+            file_info.update(classify_pdf(file_path))
+        except Exception as e:
+            # Readable PDFs the classifier cannot handle are routed without page types
+            file_info['classify_error'] = str(e)
+    elif 'epub' in mime or 'zip' in mime:
+        try:
+            meta = get_epub_metadata(str(file_path))
+            file_info['title'] = meta.title
+            file_info['authors'] = meta.authors
+        except:
+            file_info['epub_error'] = True
+
+    return file_info
 
 class EntropyScanner:
-    def __init__(self, library_dir='scsmath_library'):
+    def __init__(self, library_dir='scsmath_library', cache_path='scan_cache.json', workers=None):
         self.library_dir = Path(library_dir)
+        self.cache = ScanCache(cache_path)
+        self.workers = workers or os.cpu_count()
         self.report = {
             'metadata_stats': {},
             'clusters': {},
@@ -17,62 +65,37 @@ class EntropyScanner:
         }
 
     def calculate_entropy(self, file_path):
-        with open(file_path, 'rb') as f:
-            data = f.read()
-        if not data: return 0
-        entropy = 0
-        for x in range(256):
-            p_x = float(data.count(x))/len(data)
-            if p_x > 0:
-                entropy += - p_x * math.log(p_x, 2)
-        return entropy
+        return file_entropy(file_path)
 
     def scan(self):
         print(f"🧐 Scanning library for entropy and metadata...")
-        
-        for file_path in self.library_dir.rglob('*'):
-            if file_path.is_dir(): continue
-            
-            # Basic Info
-            mime = magic.from_file(str(file_path), mime=True)
-            ent = self.calculate_entropy(file_path)
-            size = file_path.stat().st_size
-            
-            file_info = {
-                'path': str(file_path),
-                'filename': file_path.name,
-                'category': file_path.parent.name,
-                'mime': mime,
-                'entropy': ent,
-                'size_kb': size / 1024
-            }
-            
-            # Deep Metadata
-            if 'pdf' in mime:
-                try:
-                    with pikepdf.open(file_path) as pdf:
-                        file_info['pdf_version'] = pdf.pdf_version
-                        file_info['producer'] = str(pdf.docinfo.get('/Producer', 'unknown'))
-                        file_info['creator'] = str(pdf.docinfo.get('/Creator', 'unknown'))
-                        file_info['is_linearized'] = pdf.is_linearized
-                        file_info['page_count'] = len(pdf.pages)
-                except:
-                    file_info['pdf_error'] = True
-            elif 'epub' in mime or 'zip' in mime:
-                try:
-                    meta = get_epub_metadata(str(file_path))
-                    file_info['title'] = meta.title
-                    file_info['authors'] = meta.authors
-                except:
-                    file_info['epub_error'] = True
-            
+
+        files = sorted(p for p in self.library_dir.rglob('*') if p.is_file() and not is_store_internal(p))
+        # Views sharing a blob are the same bytes: fingerprint them once
+        groups = unique_by_content(files)
+        todo = [file_path for file_path, _ in groups if self.cache.get(file_path) is None]
+        print(f"   {len(groups) - len(todo)} cached, {len(todo)} to scan with {self.workers} workers")
+
+        if self.workers > 1 and len(todo) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(scan_file, todo, chunksize=4))
+        else:
+            results = [scan_file(file_path) for file_path in todo]
+        for file_path, file_info in zip(todo, results):
+            self.cache.put(file_path, file_info)
+        self.cache.retain(file_path for file_path, _ in groups)
+        self.cache.save()
+
+        # The report and cluster map are rebuilt from the cache on every run
+        for file_path, aliases in groups:
+            file_info = dict(self.cache.get(file_path))
+            if aliases:
+                file_info['aliases'] = [str(a) for a in aliases]
             self.report['files'].append(file_info)
-            
+
             # Clustering logic: Group by Category + PDF Producer (if applicable)
-            cluster_id = file_info['category']
-            if 'pdf_version' in file_info:
-                cluster_id += f"_{file_info['pdf_version']}_{file_info['producer'][:20]}"
-            
+            cluster_id = cluster_id_for(file_info)
+
             if cluster_id not in self.report['clusters']:
                 self.report['clusters'][cluster_id] = []
             self.report['clusters'][cluster_id].append(file_info['filename'])
@@ -80,7 +103,7 @@ class EntropyScanner:
         # Final stats
         with open('bulk_entropy_report.json', 'w') as f:
             json.dump(self.report, f, indent=2)
-        
+
         print(f"✨ Scan complete. Found {len(self.report['files'])} files across {len(self.report['clusters'])} clusters.")
         print(f"📊 Report saved to bulk_entropy_report.json")
 
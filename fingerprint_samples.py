@@ -1,13 +1,13 @@
 import json
 import os
-import hashlib
-import math
 import requests
 import magic
 import pikepdf
 from epub_meta import get_epub_metadata
 from pathlib import Path
 import time
+from entropy import bytes_entropy, file_entropy_profile, profile_summary
+from crawl_state import file_sha256
 
 class EntropyAnalyzer:
     def __init__(self, index_path='source_index.json'):
@@ -19,28 +19,17 @@ class EntropyAnalyzer:
         self.session.headers.update({'User-Agent': 'Mozilla/5.0'})
 
     def calculate_entropy(self, data):
-        if not data:
-            return 0
-        entropy = 0
-        for x in range(256):
-            p_x = float(data.count(x))/len(data)
-            if p_x > 0:
-                entropy += - p_x * math.log(p_x, 2)
-        return entropy
+        return bytes_entropy(data)
 
     def get_fingerprint(self, file_path):
-        with open(file_path, 'rb') as f:
-            data = f.read()
-        
-        sha256 = hashlib.sha256(data).hexdigest()
-        mime = magic.from_buffer(data, mime=True)
-        ent = self.calculate_entropy(data)
+        profile = file_entropy_profile(file_path)
         
         return {
-            'sha256': sha256,
-            'mime': mime,
-            'entropy': ent,
-            'size': len(data)
+            'sha256': file_sha256(file_path),
+            'mime': magic.from_file(str(file_path), mime=True),
+            'entropy': profile['entropy'],
+            'entropy_profile': profile_summary(profile['blocks']),
+            'size': Path(file_path).stat().st_size
         }
 
     def get_pdf_metadata(self, file_path):
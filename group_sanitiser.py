@@ -1,98 +1,164 @@
+import heapq
 import json
 from pathlib import Path
 import re
-import PyPDF2
-from ebooklib import epub
-from bs4 import BeautifulSoup
-from pdf2image import convert_from_path
-import pytesseract
+import pypdfium2 as pdfium
 from sanitise_english import EnglishSanitizer
+from html_text import epub_to_text, html_file_to_text
+from report_index import EntropyReport
+from pdf_classifier import pages_of_type
+from pdf_text import extract_text, iter_page_text, page_count
+from ocr_engine import DEFAULT_OEM
+from adaptive_ocr import ocr_adaptive, DPI_STEPS
+from page_render import iter_rendered_pages, render_page
+
+SAMPLE_PAGES = (5, 6, 7)
 
 class GroupSanitizer:
-    def __init__(self, report_path='bulk_entropy_report.json'):
-        with open(report_path, 'r') as f:
-            self.report = json.load(f)
+    def __init__(self, report_path='bulk_entropy_report.json', adaptive_ocr=False, full_book=False):
+        self.report = EntropyReport.load(report_path)
+        # Full-book mode OCRs every scanned page, streamed to disk, instead of SAMPLE_PAGES
+        self.full_book = full_book
+        # Adaptive OCR starts at the lowest DPI step and re-renders noisy pages
+        self.adaptive_ocr = adaptive_ocr
+        self.ocr_log = []
         self.english_sanitizer = EnglishSanitizer()
         self.output_dir = Path('mini_dataset')
         self.output_dir.mkdir(exist_ok=True)
 
     def extract_epub(self, file_path):
         try:
-            book = epub.read_epub(str(file_path))
-            text = ""
-            for item in book.get_items():
-                if item.get_type() == 9: # DOCUMENT
-                    soup = BeautifulSoup(item.get_content(), 'html.parser')
-                    text += soup.get_text() + "\n"
-            return text
+            return epub_to_text(file_path)
         except:
             return ""
 
-    def extract_ocr(self, file_path, lang='ben+eng'):
+    def iter_ocr_pages(self, file_path, lang='ben+eng', pages=None, prefetch=2):
+        """Yield (page_num, text) for 1-based pages (default: all), one rendered page in memory at a time.
+
+        With `prefetch` > 0 pages render on a background thread; pass 0 when
+        the caller makes other PDFium calls between pages.
+        """
+        pdf = pdfium.PdfDocument(str(file_path))
+        try:
+            steps = DPI_STEPS if self.adaptive_ocr else (200,)
+            # Adaptive re-renders call PDFium from this thread, so it renders inline instead of prefetching
+            for page_num, img, error in iter_rendered_pages(pdf, pages, dpi=steps[0],
+                                                            prefetch=0 if self.adaptive_ocr else prefetch):
+                if error:
+                    print(f"    ⚠️  Page {page_num}: render failed ({error})")
+                    continue
+                render = lambda dpi: img if dpi == steps[0] else render_page(pdf, page_num - 1, dpi)
+                result = ocr_adaptive(render, lang, dpi_steps=steps, psm=3, oem=DEFAULT_OEM)
+                text = result.pop('text')
+                self.ocr_log.append(dict(result, page=page_num))
+                yield page_num, text
+        finally:
+            pdf.close()
+
+    def extract_ocr(self, file_path, lang='ben+eng', pages=SAMPLE_PAGES):
         try:
-            # Shift range to pages 5-7 to get actual content
-            images = convert_from_path(file_path, first_page=5, last_page=7, dpi=200)
+            # Default to pages 5-7 to get actual content
             text = ""
-            for img in images:
-                text += pytesseract.image_to_string(img, lang=lang) + "\n"
+            for _, page_text in self.iter_ocr_pages(file_path, lang, pages):
+                text += page_text + "\n"
             return text
         except Exception as e:
             return f"OCR_ERROR: {e}"
 
+    def iter_book_pages(self, file_path, lang, ocr_pages, text_pages=()):
+        """(page_num, text) for a whole book in page order: text pages extracted, the rest OCR'd."""
+        if not text_pages:
+            return self.iter_ocr_pages(file_path, lang, ocr_pages)
+        extracted = ((n, text or "") for n, text, error in iter_page_text(file_path, text_pages) if not error)
+        # Text extraction runs PDFium on this thread between OCR pages, so nothing may render
+        # in the background (PDFium is not thread-safe, even across documents)
+        return heapq.merge(extracted, self.iter_ocr_pages(file_path, lang, ocr_pages, prefetch=0))
+
+    def write_full_book(self, file_path, dest_path, lang, ocr_pages=None, text_pages=(), blank_pages=()):
+        """Stream a whole book through extraction/OCR and the sanitiser straight to dest_path.
+
+        By default every page that is neither a text page nor blank is OCR'd.
+        """
+        total = page_count(file_path)
+        if ocr_pages is None:
+            skip = set(text_pages) | set(blank_pages)
+            ocr_pages = [p for p in range(1, total + 1) if p not in skip]
+        print(f"    📚 Full book: {len(text_pages)} text pages, {len(ocr_pages)} pages to OCR")
+        pages = self.iter_book_pages(file_path, lang, ocr_pages, text_pages)
+        return self.english_sanitizer.sanitise_to_file(pages, total, dest_path)
+
+    def extract_pdf_text(self, file_path, pages):
+        try:
+            return extract_text(file_path, pages)
+        except:
+            return ""
+
     def extract_html(self, file_path):
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            soup = BeautifulSoup(content, 'html.parser')
-            # Strip scripts/styles
-            for s in soup(["script", "style"]):
-                s.extract()
-            return soup.get_text()
+            return html_file_to_text(file_path)
         except:
             return ""
 
     def process_mini_dataset(self):
         dataset_summary = []
-        top_clusters = sorted(self.report['clusters'].items(), key=lambda x: len(x[1]), reverse=True)[:5]
-        
-        for cluster_id, filenames in top_clusters:
+        for cluster_id, cluster_files in self.report.top_clusters(5):
             print(f"📂 Cluster: {cluster_id}")
             # Use deterministic sampling for the test
-            samples = filenames[:3] 
+            samples = cluster_files[:3] 
             
-            for fname in samples:
-                f_info = next(f for f in self.report['files'] if f['filename'] == fname)
+            for f_info in samples:
+                fname = f_info['filename']
                 file_path = Path(f_info['path'])
                 
                 print(f"  🧼 Processing {fname}...")
                 raw_text = ""
+                self.ocr_log = []
+                dest_path = self.output_dir / f"{fname}.txt"
+                word_count = None
                 
                 # BRANCHING LOGIC
-                if 'indian_lang' in cluster_id:
+                if self.full_book and 'pdf' in f_info['mime'] and ('indian_lang' in cluster_id or 'page_types' in f_info):
+                    # Every page, streamed page by page to disk: text pages extracted, scanned ones OCR'd
+                    page_types = f_info.get('page_types', [])
+                    text_pages = [] if 'indian_lang' in cluster_id else pages_of_type(page_types, 'text', 'mixed')
+                    lang = 'ben+eng' if 'indian_lang' in cluster_id else 'eng'
+                    word_count = self.write_full_book(file_path, dest_path, lang, text_pages=text_pages,
+                                                      blank_pages=pages_of_type(page_types, 'blank'))
+                elif 'indian_lang' in cluster_id:
                     raw_text = self.extract_ocr(file_path, lang='ben+eng')
+                elif 'pdf' in f_info['mime'] and 'page_types' in f_info:
+                    # Route by the scan-time page classifier: extract text pages,
+                    # OCR only the scanned ones, never both for the same page
+                    page_types = f_info['page_types']
+                    text_pages = pages_of_type(page_types[:30], 'text', 'mixed')
+                    if text_pages:
+                        raw_text = self.extract_pdf_text(file_path, text_pages)
+                    scanned = pages_of_type(page_types, 'scanned')
+                    ocr_pages = [p for p in SAMPLE_PAGES if p in scanned]
+                    if ocr_pages:
+                        print(f"    📸 {len(scanned)} scanned pages, running OCR for {fname}...")
+                        raw_text += self.extract_ocr(file_path, lang='eng', pages=ocr_pages)
                 elif 'pdf' in f_info['mime']:
-                    try:
-                        with open(file_path, 'rb') as f:
-                            reader = PyPDF2.PdfReader(f)
-                            for p in reader.pages[:30]:
-                                raw_text += p.extract_text() or ""
-                    except:
-                        pass
+                    raw_text = self.extract_pdf_text(file_path, range(1, 31))
                     
                     if len(raw_text.strip()) < 100:
                         print(f"    📸 Detect scan, running OCR for {fname}...")
-                        raw_text = self.extract_ocr(file_path, lang='eng')
+                        if self.full_book:
+                            word_count = self.write_full_book(file_path, dest_path, 'eng')
+                        else:
+                            raw_text = self.extract_ocr(file_path, lang='eng')
                 elif 'epub' in f_info['mime'] or 'zip' in f_info['mime']:
                     raw_text = self.extract_epub(file_path)
                 elif 'html' in f_info['mime'] or 'text' in f_info['mime']:
                     raw_text = self.extract_html(file_path)
                 
-                clean_text = self.english_sanitizer.sanitise(raw_text)
-                
-                # SAVE
-                dest_path = self.output_dir / f"{fname}.txt"
-                dest_path.write_text(clean_text, encoding='utf-8')
-                
-                word_count = len(clean_text.split())
+                if word_count is None:
+                    clean_text = self.english_sanitizer.sanitise(raw_text)
+                    
+                    # SAVE
+                    dest_path.write_text(clean_text, encoding='utf-8')
+                    
+                    word_count = len(clean_text.split())
                 print(f"    ✅ Saved {word_count} words.")
                 
                 dataset_summary.append({
@@ -100,10 +166,18 @@ class GroupSanitizer:
                     'original': fname,
                     'status': 'processed' if word_count > 50 else 'warning_low_content'
                 })
+                if self.ocr_log:
+                    # Per-page DPI and confidence, to weigh OCR cost against quality
+                    dataset_summary[-1]['ocr_pages'] = self.ocr_log
                 
         with open('mini_dataset_report.json', 'w') as f:
             json.dump(dataset_summary, f, indent=2)
 
 if __name__ == "__main__":
-    gs = GroupSanitizer()
+    import argparse
+    parser = argparse.ArgumentParser(description="Sanitise a mini dataset from the top entropy clusters")
+    parser.add_argument("--full-book", action="store_true", help="OCR every page (streamed) instead of a sample")
+    parser.add_argument("--adaptive", action="store_true", help="Step up OCR DPI on low-confidence pages")
+    args = parser.parse_args()
+    gs = GroupSanitizer(adaptive_ocr=args.adaptive, full_book=args.full_book)
     gs.process_mini_dataset()
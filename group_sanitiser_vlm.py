@@ -1,115 +1,104 @@
 import json
 from pathlib import Path
 import re
-import PyPDF2
-from ebooklib import epub
-from bs4 import BeautifulSoup
-from pdf2image import convert_from_path
-from mlx_vlm import load, generate
 from sanitise_english import EnglishSanitizer
+from html_text import epub_to_text, html_file_to_text
+from report_index import EntropyReport
+from pdf_classifier import pages_of_type
+from pdf_text import extract_text, page_count
+from vlm_ocr import VLMOCR
 import time
 
 class GroupSanitizerVLM:
-    def __init__(self, report_path='bulk_entropy_report.json'):
-        with open(report_path, 'r') as f:
-            self.report = json.load(f)
+    def __init__(self, report_path='bulk_entropy_report.json', batch_size=4, full_book=False):
+        self.report = EntropyReport.load(report_path)
+        # Full-book mode OCRs every page, streamed to disk, instead of pages 5-6
+        self.full_book = full_book
         self.english_sanitizer = EnglishSanitizer()
         self.output_dir = Path('mini_dataset_vlm')
         self.output_dir.mkdir(exist_ok=True)
         
-        # Load VLM Singleton
-        print("🚀 Loading PaddleOCR-VL-1.5-4bit (MLX)...")
-        self.model, self.processor = load("mlx-community/PaddleOCR-VL-1.5-4bit")
-        self.vlm_prompt = "<|begin_of_sentence|>User: <|IMAGE_START|><|IMAGE_PLACEHOLDER|><|IMAGE_END|><|image|>\nOCR with layout: \nAssistant:"
+        # Load VLM Singleton (in-memory pages, batched where mlx_vlm supports it)
+        self.vlm = VLMOCR(batch_size=batch_size)
 
     def extract_epub(self, file_path):
         try:
-            book = epub.read_epub(str(file_path))
-            text = ""
-            for item in book.get_items():
-                if item.get_type() == 9: # DOCUMENT
-                    soup = BeautifulSoup(item.get_content(), 'html.parser')
-                    text += soup.get_text() + "\n"
-            return text
+            return epub_to_text(file_path)
         except:
             return ""
 
     def extract_vlm_ocr(self, file_path, pages=(5, 6)):
         try:
-            # Convert specified pages to images
-            images = convert_from_path(file_path, first_page=pages[0], last_page=pages[1], dpi=200)
+            # Pages first..last, rendered in memory while the previous batch is recognized
             text = ""
-            for i, img in enumerate(images):
-                temp_img = f"temp_ocr_{i}.png"
-                img.save(temp_img)
-                
-                res = generate(
-                    self.model, 
-                    self.processor, 
-                    self.vlm_prompt, 
-                    temp_img, 
-                    max_tokens=1024,
-                    repetition_penalty=1.2
-                )
-                text += res.text + "\n"
-                Path(temp_img).unlink() # Cleanup
+            for _, page_text in self.vlm.iter_pdf(file_path, range(pages[0], pages[1] + 1), dpi=200):
+                text += page_text + "\n"
             return text
         except Exception as e:
             print(f"    ❌ VLM OCR Error: {e}")
             return ""
 
+    def write_full_book(self, file_path, dest_path):
+        """VLM OCR of every page, sanitised and written to dest_path as batches finish."""
+        total = page_count(file_path)
+        print(f"    📚 Full book: {total} pages to OCR")
+        pages = self.vlm.iter_pdf(file_path, range(1, total + 1), dpi=200)
+        return self.english_sanitizer.sanitise_to_file(pages, total, dest_path)
+
     def extract_html(self, file_path):
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            soup = BeautifulSoup(content, 'html.parser')
-            for s in soup(["script", "style"]):
-                s.extract()
-            return soup.get_text()
+            return html_file_to_text(file_path)
         except:
             return ""
 
     def process_mini_dataset(self):
         dataset_summary = []
-        top_clusters = sorted(self.report['clusters'].items(), key=lambda x: len(x[1]), reverse=True)[:5]
-        
-        for cluster_id, filenames in top_clusters:
+        for cluster_id, cluster_files in self.report.top_clusters(5):
             print(f"📂 Cluster: {cluster_id}")
-            samples = filenames[:3] 
+            samples = cluster_files[:3] 
             
-            for fname in samples:
-                f_info = next(f for f in self.report['files'] if f['filename'] == fname)
+            for f_info in samples:
+                fname = f_info['filename']
                 file_path = Path(f_info['path'])
                 
                 print(f"  🧼 Processing {fname}...")
                 raw_text = ""
+                dest_path = self.output_dir / f"{fname}.txt"
+                word_count = None
                 
                 # BRANCHING LOGIC
                 if 'indian_lang' in cluster_id:
-                    raw_text = self.extract_vlm_ocr(file_path)
+                    if self.full_book:
+                        word_count = self.write_full_book(file_path, dest_path)
+                    else:
+                        raw_text = self.extract_vlm_ocr(file_path)
                 elif 'pdf' in f_info['mime']:
-                    try:
-                        with open(file_path, 'rb') as f:
-                            reader = PyPDF2.PdfReader(f)
-                            for p in reader.pages[:20]:
-                                raw_text += p.extract_text() or ""
-                    except:
-                        pass
+                    # Books the scan-time classifier saw as fully scanned skip the text pass
+                    scanned_only = 'page_types' in f_info and not pages_of_type(f_info['page_types'], 'text', 'mixed')
+                    if not scanned_only:
+                        try:
+                            raw_text = extract_text(file_path, pages=range(1, 21))
+                        except:
+                            pass
                     
                     if len(raw_text.strip()) < 100:
                         print(f"    📸 Detect scan, running VLM OCR for {fname}...")
-                        raw_text = self.extract_vlm_ocr(file_path)
+                        if self.full_book:
+                            word_count = self.write_full_book(file_path, dest_path)
+                        else:
+                            raw_text = self.extract_vlm_ocr(file_path)
                 elif 'epub' in f_info['mime'] or 'zip' in f_info['mime']:
                     raw_text = self.extract_epub(file_path)
                 elif 'html' in f_info['mime'] or 'text' in f_info['mime']:
                     raw_text = self.extract_html(file_path)
                 
-                clean_text = self.english_sanitizer.sanitise(raw_text)
-                
-                # SAVE
-                dest_path = self.output_dir / f"{fname}.txt"
-                dest_path.write_text(clean_text, encoding='utf-8')
-                
-                word_count = len(clean_text.split())
+                if word_count is None:
+                    clean_text = self.english_sanitizer.sanitise(raw_text)
+                    
+                    # SAVE
+                    dest_path.write_text(clean_text, encoding='utf-8')
+                    
+                    word_count = len(clean_text.split())
                 print(f"    ✅ Saved {word_count} words.")
                 
                 dataset_summary.append({
@@ -120,7 +109,16 @@ class GroupSanitizerVLM:
                 
         with open('mini_dataset_vlm_report.json', 'w') as f:
             json.dump(dataset_summary, f, indent=2)
+        
+        stats = self.vlm.stats
+        print(f"⏱️  VLM OCR: {stats['pages']} pages in {stats['seconds']:.1f}s "
+              f"({self.vlm.pages_per_second():.2f} pages/s, batch size {self.vlm.batch_size})")
 
 if __name__ == "__main__":
-    gs = GroupSanitizerVLM()
+    import argparse
+    parser = argparse.ArgumentParser(description="Sanitise a mini dataset with VLM OCR for scanned books")
+    parser.add_argument("--full-book", action="store_true", help="OCR every page (streamed) instead of pages 5-6")
+    parser.add_argument("--batch-size", type=int, default=4)
+    args = parser.parse_args()
+    gs = GroupSanitizerVLM(batch_size=args.batch_size, full_book=args.full_book)
     gs.process_mini_dataset()
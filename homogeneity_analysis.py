@@ -1,16 +1,14 @@
 import json
-import os
 from pathlib import Path
-import PyPDF2
-from ebooklib import epub
-from bs4 import BeautifulSoup
+from pdf_text import extract_text
+from html_text import epub_to_text, html_file_to_text
 from pysimilar import compare
 import re
+from report_index import RawEntropyReport
 
 class HomogeneityAnalyzer:
     def __init__(self, report_path='entropy_report_raw.json'):
-        with open(report_path, 'r') as f:
-            self.report = json.load(f)
+        self.report = RawEntropyReport.load(report_path)
         self.samples_dir = Path('entropy_samples')
         self.output_dir = Path('homogeneity_test')
         self.output_dir.mkdir(exist_ok=True)
@@ -23,11 +21,7 @@ class HomogeneityAnalyzer:
     def extract_first_10_pdf(self, file_path):
         text = ""
         try:
-            with open(file_path, 'rb') as f:
-                reader = PyPDF2.PdfReader(f)
-                pages = reader.pages[:10]
-                for p in pages:
-                    text += p.extract_text() + "\n"
+            text = extract_text(file_path, pages=range(1, 11), sep="\n") + "\n"
         except Exception as e:
             text = f"Error: {e}"
         return text
@@ -35,33 +29,22 @@ class HomogeneityAnalyzer:
     def extract_first_10_epub(self, file_path):
         text = ""
         try:
-            book = epub.read_epub(str(file_path))
-            docs = list(book.get_items_of_type(os.SEEK_SET)) # Hack to get items
-            # Better way to get documents
-            items = list(book.get_items())
-            count = 0
-            for item in items:
-                if item.get_type() == 9: # DOCUMENT
-                    soup = BeautifulSoup(item.get_content(), 'html.parser')
-                    text += soup.get_text() + "\n"
-                    count += 1
-                    if count >= 10: break
+            # First 10 content documents in reading order
+            text = epub_to_text(file_path, max_items=10, sep="\n") + "\n"
         except Exception as e:
             text = f"Error: {e}"
         return text
 
     def extract_html(self, file_path):
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                soup = BeautifulSoup(f.read(), 'html.parser')
-                return soup.get_text()
+            return html_file_to_text(file_path, sep="\n")
         except Exception as e:
             return f"Error: {e}"
 
     def run(self):
         analysis_results = {}
         
-        for cat, samples in self.report.items():
+        for cat, samples in self.report.categories():
             print(f"🧐 Analyzing homogeneity for {cat}...")
             texts = []
             for i, sample in enumerate(samples):
@@ -0,0 +1,277 @@
+import codecs
+import posixpath
+import re
+import zipfile
+from html.parser import HTMLParser
+from urllib.parse import unquote
+
+# libxml2's HTML parser (C) when lxml is installed, the stdlib parser otherwise
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Elements that start a new block of text; headings are kept apart from paragraphs
+BLOCK_TAGS = frozenset((
+    'address', 'article', 'aside', 'blockquote', 'caption', 'dd', 'div', 'dl', 'dt',
+    'figcaption', 'figure', 'footer', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header',
+    'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'td', 'th', 'tr', 'ul'
+))
+HEADING_TAGS = frozenset(('h1', 'h2', 'h3', 'h4', 'h5', 'h6'))
+SKIP_TAGS = frozenset(('head', 'script', 'style', 'noscript', 'template', 'svg'))
+CHUNK_SIZE = 64 * 1024
+# Bytes searched for a declared encoding (the HTML prescan looks at 1024;
+# some pages put <meta charset> after long <head> boilerplate)
+SNIFF_BYTES = 4096
+_META_CHARSET = re.compile(rb'<meta[^>]*?charset\s*=\s*["\']?\s*([\w.:-]+)', re.I)
+_XML_ENCODING = re.compile(rb'^\s*<\?xml[^>]*?encoding\s*=\s*["\']([\w.:-]+)', re.I)
+# Labels browsers decode as Windows-1252, which is a superset of them
+_WINDOWS_1252_LABELS = frozenset(('iso-8859-1', 'iso8859-1', 'latin1', 'latin-1', 'us-ascii', 'ascii'))
+
+OPF_NS = '{http://www.idpf.org/2007/opf}'
+CONTAINER_NS = '{urn:oasis:names:tc:opendocument:xmlns:container}'
+
+
+class _BlockBuilder:
+    """Parser target that turns start/end/data events into (kind, text) blocks.
+
+    `kind` is the heading tag ('h1'..'h6') or 'p' for any other block.
+    Inline whitespace is collapsed; <br> and <pre> keep their line breaks.
+    """
+
+    def __init__(self):
+        self.blocks = []
+        self.lines = []
+        self.words = []
+        self.kind = 'p'
+        self.skip = 0
+        self.pre = 0
+
+    def _flush_line(self):
+        if self.words:
+            line = ''.join(self.words)
+            line = line if self.pre else ' '.join(line.split())
+            if line.strip():
+                self.lines.append(line)
+            self.words = []
+
+    def _flush_block(self, kind='p'):
+        self._flush_line()
+        if self.lines:
+            self.blocks.append((self.kind, '\n'.join(self.lines)))
+            self.lines = []
+        self.kind = kind
+
+    def start(self, tag, attrib=None):
+        tag = _local(tag)
+        if tag in SKIP_TAGS:
+            self.skip += 1
+        elif self.skip:
+            return
+        elif tag == 'br':
+            self._flush_line()
+        elif tag in BLOCK_TAGS:
+            self._flush_block(tag if tag in HEADING_TAGS else 'p')
+            if tag == 'pre':
+                self.pre += 1
+
+    def end(self, tag):
+        tag = _local(tag)
+        if tag in SKIP_TAGS:
+            self.skip = max(0, self.skip - 1)
+        elif self.skip:
+            return
+        elif tag in BLOCK_TAGS:
+            self._flush_block()
+            if tag == 'pre':
+                self.pre = max(0, self.pre - 1)
+
+    def data(self, text):
+        if self.skip:
+            return
+        if self.pre:
+            for i, part in enumerate(text.split('\n')):
+                if i:
+                    self._flush_line()
+                self.words.append(part)
+        else:
+            self.words.append(text)
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        self._flush_block()
+
+    def drain(self):
+        blocks, self.blocks = self.blocks, []
+        return blocks
+
+
+class _StdlibParser(HTMLParser):
+    """html.parser driver for _BlockBuilder, mirroring lxml's feed/close interface."""
+
+    def __init__(self, target):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.target.start(tag)
+        self.target.end(tag)
+
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+    def close(self):
+        super().close()
+        self.target.close()
+
+
+def _local(tag):
+    # XHTML parsed as XML carries the namespace; the HTML parsers lower-case plain names
+    return tag.rsplit('}', 1)[-1].lower() if isinstance(tag, str) else ''
+
+
+def _parser(target):
+    if LXML_AVAILABLE:
+        return etree.HTMLParser(target=target, recover=True, no_network=True)
+    return _StdlibParser(target)
+
+
+def sniff_encoding(head):
+    """Encoding of an HTML/XHTML document from its first bytes: a BOM, an XML
+    declaration or <meta charset>, else UTF-8."""
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    if not head.startswith(codecs.BOM_UTF8):
+        m = _XML_ENCODING.match(head) or _META_CHARSET.search(head)
+        if m:
+            label = m.group(1).decode('ascii').lower()
+            if label in _WINDOWS_1252_LABELS:
+                return 'cp1252'
+            try:
+                name = codecs.lookup(label).name
+            except LookupError:
+                name = None
+            # A page that was read as text declares utf-16 but is not; keep UTF-8
+            if name and not name.startswith('utf-16'):
+                return 'utf-8-sig' if name == 'utf-8' else name
+    return 'utf-8-sig'
+
+
+def _decoded(chunks):
+    """Decode byte chunks with the encoding the document declares (see sniff_encoding)."""
+    head = b''
+    chunks = iter(chunks)
+    for chunk in chunks:
+        if not isinstance(chunk, bytes):
+            yield chunk
+            continue
+        head += chunk
+        if len(head) >= SNIFF_BYTES:
+            break
+    if not head:
+        return
+    # Undecodable bytes are dropped
+    decoder = codecs.getincrementaldecoder(sniff_encoding(head[:SNIFF_BYTES]))(errors='ignore')
+    yield decoder.decode(head)
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+    yield decoder.decode(b'', final=True)
+
+
+def iter_blocks(chunks):
+    """Yield (kind, text) blocks from markup given as str/bytes or an iterable of chunks.
+
+    Bytes are decoded with the encoding the document declares (BOM, XML
+    declaration or <meta charset>), UTF-8 when it declares none.
+    Blocks are yielded as soon as the parser has seen their end, so a large
+    document is never held as text in full.
+    """
+    if isinstance(chunks, (str, bytes)):
+        chunks = (chunks,)
+    builder = _BlockBuilder()
+    parser = _parser(builder)
+    for chunk in _decoded(chunks):
+        if chunk:
+            parser.feed(chunk)
+        yield from builder.drain()
+    parser.close()
+    yield from builder.drain()
+
+
+def html_to_text(markup, sep="\n\n"):
+    """Text of an HTML/XHTML document (str or bytes), one block per `sep`."""
+    return sep.join(text for _, text in iter_blocks(markup))
+
+
+def _read_chunks(f, size=CHUNK_SIZE):
+    return iter(lambda: f.read(size), b'')
+
+
+def iter_html_file_blocks(file_path):
+    """Yield (kind, text) blocks of an HTML file, read in chunks."""
+    with open(file_path, 'rb') as f:
+        yield from iter_blocks(_read_chunks(f))
+
+
+def html_file_to_text(file_path, sep="\n\n"):
+    return sep.join(text for _, text in iter_html_file_blocks(file_path))
+
+
+def _parse_xml(data):
+    if LXML_AVAILABLE:
+        return etree.fromstring(data, etree.XMLParser(resolve_entities=False, no_network=True))
+    import xml.etree.ElementTree as ET
+    return ET.fromstring(data)
+
+
+def spine_documents(zf):
+    """Archive names of an EPUB's content documents in reading (spine) order.
+
+    Falls back to every (X)HTML file in archive order when the package
+    document is missing or unreadable.
+    """
+    try:
+        container = _parse_xml(zf.read('META-INF/container.xml'))
+        rootfile = container.find(f'.//{CONTAINER_NS}rootfile').get('full-path')
+        opf = _parse_xml(zf.read(rootfile))
+        base = posixpath.dirname(rootfile)
+        manifest = {item.get('id'): item for item in opf.iter(f'{OPF_NS}item')}
+        names = []
+        for itemref in opf.iter(f'{OPF_NS}itemref'):
+            item = manifest.get(itemref.get('idref'))
+            if item is not None and 'html' in (item.get('media-type') or ''):
+                names.append(posixpath.normpath(posixpath.join(base, unquote(item.get('href')))))
+        if names:
+            return names
+    except (KeyError, AttributeError, ValueError, SyntaxError) as e:
+        # lxml's XMLSyntaxError and ElementTree's ParseError are SyntaxError subclasses
+        print(f"⚠️  No usable EPUB spine ({e}), reading documents in archive order")
+    return [n for n in zf.namelist() if n.lower().endswith(('.xhtml', '.html', '.htm'))]
+
+
+def iter_epub_blocks(epub_path, max_items=None):
+    """Yield (kind, text) blocks of an EPUB in reading order, one spine item at a time.
+
+    `max_items` stops after that many content documents (e.g. a sample of
+    the first chapters).
+    """
+    with zipfile.ZipFile(epub_path) as zf:
+        names = set(zf.namelist())
+        documents = [n for n in spine_documents(zf) if n in names]
+        for name in documents[:max_items]:
+            with zf.open(name) as f:
+                yield from iter_blocks(_read_chunks(f))
+
+
+def epub_to_text(epub_path, max_items=None, sep="\n\n"):
+    """Text of an EPUB in reading order, one block per `sep`."""
+    return sep.join(text for _, text in iter_epub_blocks(epub_path, max_items))
@@ -0,0 +1,135 @@
+import numpy as np
+from dataset_utilities import TextCleaner
+from ocr_engine import image_to_string, recognize
+
+# Tesseract language set and cleaning mode per detected block script
+BLOCK_LANGS = {'Bengali': 'ben', 'Devanagari': 'san+hin', 'Latin': 'eng'}
+DETECT_LANG = "ben+hin+san+eng"
+
+
+def _otsu(gray):
+    """Otsu threshold of a uint8 grayscale array."""
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+    weight = np.cumsum(hist)
+    mean = np.cumsum(hist * levels)
+    total_weight, total_mean = weight[-1], mean[-1]
+    between = (total_mean * weight - mean * total_weight) ** 2 / np.maximum(weight * (total_weight - weight), 1)
+    return int(np.argmax(between))
+
+
+def ink_mask(image, scale=4):
+    """Dark-pixel mask of a page, block-reduced by `scale` (a cell is ink if any pixel is).
+
+    Full-width rules and full-height lines (page frames, ornamental
+    borders) are cleared so they do not glue the whole page into one block.
+    """
+    gray = np.asarray(image.convert('L'), dtype=np.uint8)
+    ink = gray < _otsu(gray)
+    h, w = ink.shape
+    ink = ink[:h - h % scale, :w - w % scale].reshape(h // scale, scale, w // scale, scale).any(axis=(1, 3))
+    ink[ink.mean(axis=1) > 0.8, :] = False
+    ink[:, ink.mean(axis=0) > 0.8] = False
+    return ink
+
+
+def _runs(profile, min_gap):
+    """[start, end) segments of `profile` separated by at least `min_gap` empty entries."""
+    filled = np.flatnonzero(profile)
+    if not filled.size:
+        return []
+    breaks = np.flatnonzero(np.diff(filled) > min_gap)
+    starts = np.concatenate(([filled[0]], filled[breaks + 1]))
+    ends = np.concatenate((filled[breaks] + 1, [filled[-1] + 1]))
+    return list(zip(starts, ends))
+
+
+def _xy_cut(ink, y0, y1, x0, x1, gap_y, gap_x, noise, blocks, horizontal=True):
+    """Recursive X-Y cut on whitespace gaps in the projection profiles."""
+    region = ink[y0:y1, x0:x1]
+    rows = region.sum(axis=1) > noise
+    cols = region.sum(axis=0) > noise
+    row_runs, col_runs = _runs(rows, gap_y), _runs(cols, gap_x)
+    if not row_runs or not col_runs:
+        return
+    if len(row_runs) == 1 and len(col_runs) == 1:
+        (ys, ye), (xs, xe) = row_runs[0], col_runs[0]
+        blocks.append((x0 + xs, y0 + ys, x0 + xe, y0 + ye))
+        return
+    # Cut along whichever axis has gaps, preferring horizontal bands (reading order)
+    if len(row_runs) > 1 and (horizontal or len(col_runs) == 1):
+        for ys, ye in row_runs:
+            _xy_cut(ink, y0 + ys, y0 + ye, x0, x1, gap_y, gap_x, noise, blocks, False)
+    else:
+        for xs, xe in col_runs:
+            _xy_cut(ink, y0, y1, x0 + xs, x0 + xe, gap_y, gap_x, noise, blocks, True)
+
+
+def find_text_blocks(image, dpi=300, scale=4, max_density=0.45):
+    """Text blocks of a rendered page as (x0, y0, x1, y1) boxes in reading order.
+
+    Blocks are separated by paragraph-sized vertical gaps (~0.15") and
+    gutter-sized horizontal gaps (~0.2"). Blank margins are never part of
+    a block; specks, thin rules and dense regions (photos, ornaments) are
+    dropped.
+    """
+    ink = ink_mask(image, scale)
+    cells_per_inch = dpi / scale
+    blocks = []
+    _xy_cut(ink, 0, ink.shape[0], 0, ink.shape[1],
+            gap_y=max(1, int(0.15 * cells_per_inch)), gap_x=max(1, int(0.2 * cells_per_inch)),
+            noise=1, blocks=blocks)
+
+    min_size = 0.08 * cells_per_inch
+    pad = max(1, int(0.03 * cells_per_inch))
+    h, w = ink.shape
+    kept = []
+    for x0, y0, x1, y1 in blocks:
+        if y1 - y0 < min_size or x1 - x0 < min_size:
+            continue
+        if ink[y0:y1, x0:x1].mean() > max_density:
+            continue
+        x0, y0 = max(0, x0 - pad), max(0, y0 - pad)
+        x1, y1 = min(w, x1 + pad), min(h, y1 + pad)
+        kept.append((int(x0 * scale), int(y0 * scale), int(x1 * scale), int(y1 * scale)))
+    return kept
+
+
+def detect_block_script(crop, scale=2):
+    """Dominant script of a text block from a cheap downscaled pass."""
+    small = crop.reduce(scale) if scale > 1 and min(crop.size) > 64 * scale else crop
+    return TextCleaner.detect_script(image_to_string(small, DETECT_LANG, psm=6, oem=1))
+
+
+def ocr_blocks(image, dpi=300, script=None):
+    """OCR only the text blocks of a page, each in the language set of its own script.
+
+    `script` forces one script for every block (skipping per-block
+    detection). Returns (text, confidence, info): blocks joined in reading
+    order, the character-weighted mean confidence, and per-page layout
+    stats including the share of page pixels that were sent to OCR.
+    """
+    boxes = find_text_blocks(image, dpi)
+    parts = []
+    weighted = 0.0
+    chars = 0
+    pixels = 0
+    scripts = []
+    for box in boxes:
+        crop = image.crop(box)
+        pixels += crop.width * crop.height
+        block_script = script or detect_block_script(crop, max(1, round(dpi / 150)))
+        lang = BLOCK_LANGS.get(block_script, 'san+hin')
+        text, confidence = recognize(crop, lang, psm=6, oem=1, dpi=dpi)
+        text = TextCleaner.clean_text(text, is_bengali=block_script == 'Bengali')
+        if text.strip():
+            parts.append(text.strip())
+            weighted += confidence * len(text)
+            chars += len(text)
+        scripts.append(block_script)
+    info = {
+        'blocks': len(boxes),
+        'block_scripts': scripts,
+        'ocr_pixel_ratio': round(pixels / (image.width * image.height), 3)
+    }
+    return "\n\n".join(parts), (weighted / chars if chars else 0.0), info
@@ -0,0 +1,303 @@
+import functools
+import hashlib
+import json
+import re
+from dataset_utilities import TextCleaner
+
+# Shared rule set for CanonicalNormalizer and EnglishSanitizer. Rules apply in
+# list order; literal rules are plain text, not regex.
+
+# OCR artifact fixes (case-insensitive)
+OCR_FIXES = [
+    ('çr^', 'Srila'),
+    ('Ír(', 'Sri'),
+    ('Maéh', 'Math'),
+    ('Maöh', 'Math'),
+    ('Gauråíga', 'Gauranga'),
+    ('Gaurå&ga', 'Gauranga'),
+    ('Ír(la', 'Srila'),
+    ('Srilala', 'Srila'),
+    ('Vi!@upåd', 'Vishnupad'),
+    ('Rak!ak', 'Rakshak'),
+    ('Ír(dhar', 'Sridhar'),
+    ('Ír(man', 'Sriman'),
+]
+# Spelling normalization used by the English sanitiser only
+ENGLISH_FIXES = [
+    ('acharya', 'acharya'),
+    ('acharyya', 'acharya'),
+]
+
+# Transliteration with diacritics, whole words (case-sensitive)
+DIACRITICS = [
+    ('Krishna', 'Kṛṣṇa'),
+    ('Srila', 'Śrīla'),
+    ('Sri', 'Śrī'),
+    ('Srimad', 'Śrīmad'),
+    ('Chaitanya', 'Caitanya'),
+    ('Saranagati', 'Śaraṇāgati'),
+    ('Bhakti', 'Bhakti'),
+    ('Vaishnava', 'Vaiṣṇava'),
+    ('Maharaj', 'Mahārāj'),
+]
+
+# Institutional boilerplate removals (regex, case-insensitive, per line), in
+# the order they apply: a removal can join text into a later rule's match
+BOILERPLATE_PATTERNS = [
+    r'All glories to Sri Guru and Sri Gauranga',
+    r'All Glory to Sri Sri Guru-Gauranga',
+    r'Sri Chaitanya Saraswat Math',
+    r'Kolerganj, (?:P\.O\.|Post Office:) Nabadwip,.*?(?:Pin \d+|West Bengal|India)',
+    r'Website: http://www\.scsmath\.com',
+    r'© All rights reserved by.*',
+    r'Edited by:.*',
+    r'Published by:.*',
+    r'Assistant editor:.*',
+    r'Founder-Acharya:.*',
+    r'Sevaite-President-Acharya:.*',
+    r'Printed in India.*',
+    r'— \d+ —', # Page numbers
+    r'—·  · — \d+', # Fancy page numbers
+]
+# Contact info, stripped by the canonical normalizer
+CONTACT_PATTERNS = [
+    r'www\..*\.org',
+    r'http[s]?://\S+',
+    r'Email: \S+',
+    r'Mobile: \S+',
+    r'Phone: \S+',
+    r'Fax: \S+'
+]
+
+# Bump when the pipeline code changes in a way the rule tables do not show,
+# so rule-set hashes recorded by earlier runs no longer match
+RULES_VERSION = 3
+
+_REGEX_SPECIAL = set('.^$*+?{}[]|()\\')
+
+
+def _first_chars(literals):
+    # A lookahead on the possible first characters lets the regex engine skip
+    # positions instead of trying every alternative at each one
+    return '[' + ''.join(sorted({re.escape(lit[0]) for lit in literals})) + ']'
+
+
+def _inner_overlap(a, b):
+    """True if a match of `b` can start strictly inside a match of `a` and overlap it."""
+    return any(a[k:].startswith(b) or b.startswith(a[k:]) for k in range(1, len(a)))
+
+
+def leading_literal(pattern):
+    """Text every match of `pattern` starts with (may be empty)."""
+    return _literal_prefix(pattern)[0]
+
+
+def full_literal(pattern):
+    """The text `pattern` matches if it is a plain literal (escapes only), else None."""
+    literal, end = _literal_prefix(pattern)
+    return literal if end == len(pattern) else None
+
+
+def _literal_prefix(pattern):
+    """(literal text, pattern index where it ends) for the start of `pattern`."""
+    literal = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == '\\':
+            if i + 1 >= len(pattern) or pattern[i + 1].isalnum():
+                break # \d, \S, \b... are classes or assertions
+            ch = pattern[i + 1]
+            step = 2
+        elif ch in _REGEX_SPECIAL:
+            break
+        else:
+            step = 1
+        if pattern[i + step:i + step + 1] in ('*', '+', '?', '{'):
+            break # quantified: the character may be absent or repeated
+        literal.append(ch)
+        i += step
+    return ''.join(literal), i
+
+
+@functools.lru_cache(maxsize=None)
+def _fold_exceptions(chars):
+    """Characters re.IGNORECASE matches to one of `chars` although str.lower() does not
+    (e.g. 'ı', 'ſ', 'İ'), mapped to the character they match."""
+    lowered = set(chars.lower())
+    cls = re.compile('[' + re.escape(chars) + ']', re.IGNORECASE)
+    exceptions = {}
+    for other in (chr(cp) for cp in range(0x10000)):
+        if other.lower() not in lowered and cls.match(other):
+            exceptions[other] = next(ch.lower() for ch in chars
+                                     if re.fullmatch(re.escape(ch), other, re.IGNORECASE))
+    return exceptions
+
+
+class _Prefilter:
+    """Which rules can match at all, from C-speed substring checks for their required text.
+
+    Only rules whose required text occurs in the text are compiled into the
+    scan, so most books run only a few short alternations.
+    """
+
+    def __init__(self, keys, flags):
+        self.ignorecase = bool(flags & re.IGNORECASE)
+        self.keys = [key.lower() for key in keys] if self.ignorecase else list(keys)
+        self.exceptions = _fold_exceptions(''.join(sorted(set(''.join(keys))))) if self.ignorecase else {}
+
+    def present(self, text, members):
+        if self.ignorecase:
+            for other, ch in self.exceptions.items():
+                if other in text:
+                    text = text.replace(other, ch)
+            text = text.lower()
+        return tuple(j for j in members if self.keys[j] in text)
+
+
+class LiteralRules:
+    """Ordered literal replacements compiled into as few regex scans as possible.
+
+    Rules become one alternation per pass, dispatched on the matching
+    group. A rule moves to a later pass when it could match text written
+    by an earlier rule (e.g. 'Srilala' after 'Ír(' -> 'Sri') or joined by
+    an earlier removal, or begin before an earlier rule's match and
+    overlap it. The result is the same
+    as running the rules one re.sub at a time.
+    """
+
+    def __init__(self, rules, flags=0, whole_words=False):
+        self.rules = list(rules)
+        self.flags = flags
+        self.whole_words = whole_words
+        self.prefilter = _Prefilter([literal for literal, _ in self.rules], flags)
+        fold = (lambda s: s.lower()) if flags & re.IGNORECASE else (lambda s: s)
+        levels = []
+        for j, (literal, _) in enumerate(self.rules):
+            level = 0
+            for i in range(j):
+                if self._conflict(fold(self.rules[i][0]), fold(self.rules[i][1]), fold(literal), whole_words):
+                    level = max(level, levels[i] + 1)
+            levels.append(level)
+        self.passes = [[j for j, l in enumerate(levels) if l == level]
+                       for level in range(max(levels, default=-1) + 1)]
+        self._compiled = {} # active rule indexes -> (regex, replace callback)
+
+    @staticmethod
+    def _conflict(earlier, replacement, literal, whole_words):
+        if not replacement and len(literal) > 1:
+            # A removal joins the text around it, which can spell any later rule's text
+            return True
+        if whole_words:
+            # Whole-word matches never overlap; only a replacement can create a new one
+            return re.search(rf'\b{re.escape(literal)}\b', replacement) is not None
+        creates = replacement and (literal in replacement or replacement in literal
+                                   or _inner_overlap(replacement, literal)
+                                   or _inner_overlap(literal, replacement))
+        return bool(creates) or _inner_overlap(literal, earlier)
+
+    def _compile(self, members):
+        body = '|'.join(f'(?P<r{j}>{re.escape(self.rules[j][0])})' for j in members)
+        pattern = f"(?={_first_chars([self.rules[j][0] for j in members])})(?:{body})"
+        if self.whole_words:
+            pattern = rf'\b{pattern}\b'
+        replacements = {f'r{j}': self.rules[j][1] for j in members}
+        return re.compile(pattern, self.flags), lambda m: replacements[m.lastgroup]
+
+    def apply(self, text):
+        for members in self.passes:
+            # Checked per pass: an earlier pass may have written a later rule's text
+            active = self.prefilter.present(text, members)
+            if active:
+                if active not in self._compiled:
+                    self._compiled[active] = self._compile(active)
+                pattern, replace = self._compiled[active]
+                text = pattern.sub(replace, text)
+        return text
+
+    def spec(self):
+        return [self.flags, self.whole_words, [list(rule) for rule in self.rules]]
+
+
+class PatternRules:
+    """Regex removals applied one after another in list order, like separate re.sub calls.
+
+    Patterns are not merged into one alternation: a single scan takes the
+    leftmost match of any pattern, so an earlier pattern could swallow text
+    a later one should have removed first (e.g. 'Email: \\S+' eating the
+    start of a 'Printed in India' line glued to the address). Patterns whose
+    required text is absent are skipped.
+    """
+
+    def __init__(self, patterns, flags=0):
+        self.patterns = list(patterns)
+        self.flags = flags
+        self.prefilter = _Prefilter([leading_literal(p) for p in self.patterns], flags)
+        self._compiled = [re.compile(p, flags) for p in self.patterns]
+
+    def apply(self, text):
+        active = self.prefilter.present(text, range(len(self.patterns)))
+        for j, pattern in enumerate(self._compiled):
+            if j in active:
+                text, removed = pattern.subn('', text)
+                if removed:
+                    # A removal can join text into a later pattern's required text
+                    active = self.prefilter.present(text, range(j + 1, len(self.patterns)))
+        return text
+
+    def spec(self):
+        return [self.flags, self.patterns]
+
+
+def drop_blank_lines(text):
+    """Strip every line and drop the empty ones."""
+    return '\n'.join(line for line in map(str.strip, text.split('\n')) if line)
+
+
+def removal_passes(patterns, flags):
+    """Ordered removal patterns as passes: runs of plain literals become one
+    LiteralRules scan, runs of real regexes one PatternRules, in list order."""
+    passes = []
+    for pattern in patterns:
+        literal = full_literal(pattern)
+        kind = LiteralRules if literal is not None else PatternRules
+        if not passes or passes[-1][0] is not kind:
+            passes.append((kind, []))
+        passes[-1][1].append((literal, '') if literal is not None else pattern)
+    return [LiteralRules(rules, flags) if kind is LiteralRules else PatternRules(rules, flags)
+            for kind, rules in passes]
+
+
+class NormalizerCore:
+    """Compiled rule set: OCR fixes, boilerplate removal and diacritic standardization.
+
+    Consecutive literal boilerplate rules are one scan and regex-only rules
+    another, instead of one full-text re.sub per rule; the passes keep the
+    list order, so the result is the same.
+    """
+
+    def __init__(self, fixes=OCR_FIXES, boilerplate=BOILERPLATE_PATTERNS, diacritics=DIACRITICS):
+        self.fixes = LiteralRules(fixes, re.IGNORECASE)
+        self.boilerplate = removal_passes(boilerplate, re.IGNORECASE | re.MULTILINE)
+        self.diacritics = LiteralRules(diacritics, whole_words=True)
+
+    def fix_artifacts(self, text, control_chars=False):
+        if control_chars:
+            # Remove control characters except newline and tab
+            text = TextCleaner.remove_control_chars(text)
+        return self.fixes.apply(text)
+
+    def strip_boilerplate(self, text):
+        for rules in self.boilerplate:
+            text = rules.apply(text)
+        return drop_blank_lines(text)
+
+    def standardize_diacritics(self, text):
+        return self.diacritics.apply(text)
+
+    def rule_set_hash(self):
+        """Hash of every rule table, in order and with its flags, plus RULES_VERSION."""
+        spec = [RULES_VERSION, ['fixes', self.fixes.spec()],
+                ['boilerplate', [[type(rules).__name__, rules.spec()] for rules in self.boilerplate]],
+                ['diacritics', self.diacritics.spec()]]
+        return hashlib.sha256(json.dumps(spec, ensure_ascii=False).encode('utf-8')).hexdigest()
@@ -0,0 +1,201 @@
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+from PIL import Image
+
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.tif', '.tiff')
+
+
+def load_groundtruth(gt_dir, source_dpi=300):
+    """Ground-truth pages as [{'id', 'image', 'gt', 'lang', 'dpi'}].
+
+    Either a `groundtruth.json` list of {"image", "gt", "lang", "dpi"}
+    entries, or `<name>.gt.txt` files next to `<name>.png/.jpg/.tif`
+    images. Image DPI comes from the entry, the image header, or
+    `source_dpi`, in that order.
+    """
+    gt_dir = Path(gt_dir)
+    manifest = gt_dir / 'groundtruth.json'
+    if manifest.exists():
+        with open(manifest, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+    else:
+        entries = []
+        for gt_path in sorted(gt_dir.glob('*.gt.txt')):
+            stem = gt_path.name[:-len('.gt.txt')]
+            image = next((gt_dir / (stem + s) for s in IMAGE_SUFFIXES if (gt_dir / (stem + s)).exists()), None)
+            if image:
+                entries.append({'image': image.name, 'gt': gt_path.name})
+
+    pages = []
+    for entry in entries:
+        image_path = gt_dir / entry['image']
+        dpi = entry.get('dpi')
+        if dpi is None:
+            with Image.open(image_path) as img:
+                dpi = round(img.info.get('dpi', (source_dpi,))[0]) or source_dpi
+        pages.append({
+            'id': entry.get('id', Path(entry['image']).stem),
+            'image': str(image_path),
+            'gt': (gt_dir / entry['gt']).read_text(encoding='utf-8'),
+            'lang': entry.get('lang'),
+            'dpi': dpi
+        })
+    return pages
+
+
+def _normalize(text):
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def edit_distance(a, b):
+    """Levenshtein distance between two sequences (characters or words)."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y)))
+        previous = current
+    return previous[-1]
+
+
+def error_rates(hypothesis, reference):
+    """(CER, WER) of OCR output against ground truth, whitespace-normalized."""
+    hyp, ref = _normalize(hypothesis), _normalize(reference)
+    cer = edit_distance(hyp, ref) / max(len(ref), 1)
+    wer = edit_distance(hyp.split(), ref.split()) / max(len(ref.split()), 1)
+    return cer, wer
+
+
+def _at_dpi(image, source_dpi, dpi):
+    if dpi == source_dpi:
+        return image
+    scale = dpi / source_dpi
+    return image.resize((round(image.width * scale), round(image.height * scale)), Image.LANCZOS)
+
+
+def _make_backend(backend, lang):
+    """recognize(image) -> text for a backend, plus the engine name it resolved to."""
+    if backend == 'tesseract':
+        import ocr_engine
+        engine = ocr_engine.get_engine(lang, psm=3, oem=1)
+        return engine.recognize, ocr_engine.engine_version()
+    if backend == 'vlm':
+        from vlm_ocr import VLMOCR, DEFAULT_MODEL
+        vlm = VLMOCR(batch_size=1)
+        return lambda image: vlm.ocr_images([image])[0], DEFAULT_MODEL
+    raise ValueError(f"Unknown OCR backend: {backend}")
+
+
+def _peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS; children covers the tesseract binary
+    unit = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(max(own, children) / unit, 1)
+
+
+def run_config(backend, lang, dpi, pages):
+    """One (backend, lang, DPI) configuration; runs in its own process for clean peak memory."""
+    recognize, engine = _make_backend(backend, lang)
+    per_page = []
+    elapsed = 0.0
+    for page in pages:
+        with Image.open(page['image']) as img:
+            image = _at_dpi(img.convert('RGB'), page['dpi'], dpi or page['dpi'])
+        start = time.perf_counter()
+        text = recognize(image)
+        seconds = time.perf_counter() - start
+        elapsed += seconds
+        cer, wer = error_rates(text, page['gt'])
+        per_page.append({'id': page['id'], 'cer': round(cer, 4), 'wer': round(wer, 4), 'seconds': round(seconds, 3)})
+
+    n = len(per_page)
+    return {
+        'backend': backend, 'engine': engine, 'lang': lang, 'dpi': dpi or 'native',
+        'pages': n,
+        'cer': round(sum(p['cer'] for p in per_page) / n, 4) if n else None,
+        'wer': round(sum(p['wer'] for p in per_page) / n, 4) if n else None,
+        'pages_per_s': round(n / elapsed, 3) if elapsed else None,
+        'peak_rss_mb': _peak_rss_mb(),
+        'per_page': per_page
+    }
+
+
+def available_backends():
+    backends = []
+    try:
+        import ocr_engine
+        if ocr_engine.TESSEROCR_AVAILABLE or ocr_engine.PYTESSERACT_AVAILABLE:
+            backends.append('tesseract')
+    except ImportError:
+        pass
+    try:
+        import mlx_vlm
+        backends.append('vlm')
+    except ImportError:
+        pass
+    return backends
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR accuracy (CER/WER), pages/s and peak memory per backend")
+    parser.add_argument("--groundtruth", default="ocr_groundtruth", help="Directory of page images + .gt.txt")
+    parser.add_argument("--backends", nargs="*", help="Default: every installed backend")
+    parser.add_argument("--langs", nargs="*", help="Tesseract language sets (default: each page's own lang, else ben)")
+    parser.add_argument("--dpi", nargs="*", type=int, help="Resample pages to these DPIs (default: native)")
+    parser.add_argument("--source-dpi", type=int, default=300, help="DPI of images without a DPI header")
+    parser.add_argument("--output", default="ocr_benchmark.json")
+    args = parser.parse_args()
+
+    pages = load_groundtruth(args.groundtruth, args.source_dpi)
+    if not pages:
+        parser.error(f"no ground-truth pages found in {args.groundtruth}")
+    backends = args.backends or available_backends()
+    print(f"📏 {len(pages)} ground-truth pages, backends: {', '.join(backends) or 'none'}")
+
+    configs = []
+    for backend in backends:
+        for dpi in args.dpi or [None]:
+            if backend == 'vlm':
+                configs.append((backend, None, dpi, pages)) # prompt-driven, no language set
+            elif args.langs:
+                configs.extend((backend, lang, dpi, pages) for lang in args.langs)
+            else:
+                by_lang = {}
+                for page in pages:
+                    by_lang.setdefault(page['lang'] or 'ben', []).append(page)
+                configs.extend((backend, lang, dpi, group) for lang, group in by_lang.items())
+
+    results = []
+    # A fresh process per configuration so peak memory is not inherited from the previous one
+    ctx = multiprocessing.get_context('spawn')
+    for config in configs:
+        with ctx.Pool(1) as pool:
+            result = pool.apply(run_config, config)
+        results.append(result)
+        print(f"   {result['backend']:>9} {str(result['lang']):>10} {str(result['dpi']):>6} DPI | "
+              f"CER {result['cer']:.3f} WER {result['wer']:.3f} | {result['pages_per_s']} pages/s | "
+              f"{result['peak_rss_mb']} MB peak")
+
+    report = {
+        'generated_at': datetime.now().isoformat(),
+        'groundtruth': str(args.groundtruth),
+        'pages': len(pages),
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"📊 Benchmark saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
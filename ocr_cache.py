@@ -0,0 +1,113 @@
+import hashlib
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+# Per-user cache directory, shared by every run regardless of working or output directory
+DEFAULT_PATH = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'scsmath' / 'ocr_cache.sqlite'
+
+SCHEMA_VERSION = 3 # bump when the table layout changes
+# The running total in ocr_size is kept by triggers, so checking the bound is
+# one row read instead of a SUM over the table. REPLACE fires the delete
+# trigger only with recursive_triggers on.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ocr (
+    key TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    confidence REAL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ocr_last_used ON ocr (last_used);
+CREATE TABLE IF NOT EXISTS ocr_size (total INTEGER NOT NULL);
+INSERT INTO ocr_size SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM ocr_size);
+CREATE TRIGGER IF NOT EXISTS ocr_size_insert AFTER INSERT ON ocr
+    BEGIN UPDATE ocr_size SET total = total + NEW.size; END;
+CREATE TRIGGER IF NOT EXISTS ocr_size_delete AFTER DELETE ON ocr
+    BEGIN UPDATE ocr_size SET total = total - OLD.size; END;
+"""
+
+
+def image_hash(image):
+    """sha256 of a rendered page's pixels (PIL image or NumPy array)."""
+    h = hashlib.sha256()
+    if hasattr(image, 'shape'):
+        h.update(f"{image.dtype}{image.shape}".encode())
+        h.update(image.tobytes())
+    else:
+        h.update(f"{image.mode}{image.size}".encode())
+        h.update(image.tobytes())
+    return h.hexdigest()
+
+
+class OCRCache:
+    """Disk-backed OCR results, keyed by page pixels and everything that affects recognition.
+
+    Keys combine (image hash, DPI, lang, OEM/PSM, engine version), so a
+    config sweep or a rerun with different random sample pages only
+    recognizes pages it has not seen with that exact setup. The store is
+    bounded to `max_mb`; the least recently used results are evicted first.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_mb=512):
+        self.path = path
+        self.max_bytes = max_mb * 1024 * 1024
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path), timeout=30)
+        # WAL lets the OCR scheduler's worker processes read while one writes
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA recursive_triggers=ON")
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            # The running total goes with the table (dropping ocr also drops its triggers)
+            self.db.executescript(f"DROP TABLE IF EXISTS ocr; DROP TABLE IF EXISTS ocr_size; "
+                                  f"PRAGMA user_version = {SCHEMA_VERSION};")
+        self.db.executescript(SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(image, dpi, lang, psm, oem, engine_version):
+        return hashlib.sha256(
+            f"{image_hash(image)}|{dpi}|{lang}|oem{oem}|psm{psm}|{engine_version}".encode()
+        ).hexdigest()
+
+    def get(self, key, need_confidence=False):
+        """(text, confidence) for a key, or None; confidence may be None if never measured."""
+        row = self.db.execute("SELECT text, confidence FROM ocr WHERE key = ?", (key,)).fetchone()
+        if row is None or (need_confidence and row[1] is None):
+            self.misses += 1
+            return None
+        self.hits += 1
+        with self.db:
+            self.db.execute("UPDATE ocr SET last_used = ? WHERE key = ?", (time.time(), key))
+        return row
+
+    def put(self, key, text, confidence=None):
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO ocr VALUES (?, ?, ?, ?, ?)",
+                            (key, text, confidence, len(text.encode('utf-8')), time.time()))
+        self.evict()
+
+    def total_bytes(self):
+        return self.db.execute("SELECT total FROM ocr_size").fetchone()[0]
+
+    def evict(self):
+        """Drop least recently used entries until the cache is back under 90% of max_mb."""
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return 0
+        target = total - int(self.max_bytes * 0.9)
+        freed = 0
+        evicted = []
+        for key, size in self.db.execute("SELECT key, size FROM ocr ORDER BY last_used"):
+            evicted.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        with self.db:
+            self.db.executemany("DELETE FROM ocr WHERE key = ?", evicted)
+        return len(evicted)
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,174 @@
+import os
+import threading
+from ocr_cache import OCRCache, DEFAULT_PATH
+
+# tesserocr drives the Tesseract C API in-process; pytesseract (one
+# `tesseract` subprocess per call) is the fallback
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+try:
+    import pytesseract
+    PYTESSERACT_AVAILABLE = True
+except ImportError:
+    PYTESSERACT_AVAILABLE = False
+
+DEFAULT_OEM = 3 # Tesseract's default: LSTM if available
+DEFAULT_PSM = 3 # Fully automatic page segmentation, no OSD
+
+# Results are cached on disk across runs, by default in the user's cache
+# directory (~/.cache/scsmath); OCR_CACHE=<path> moves it, OCR_CACHE="" turns it off
+OCR_CACHE_PATH = os.environ.get('OCR_CACHE', str(DEFAULT_PATH))
+OCR_CACHE_MAX_MB = int(os.environ.get('OCR_CACHE_MAX_MB', 512))
+
+
+def _as_pil(image):
+    if hasattr(image, 'shape'):
+        from PIL import Image
+        return Image.fromarray(image)
+    return image
+
+
+def _tsv_text_and_confidence(tsv):
+    """Text and mean word confidence (0-100) from Tesseract's TSV output.
+
+    The text follows GetUTF8Text's layout: one line per recognized line,
+    a blank line after each paragraph.
+    """
+    paragraphs = {}
+    confs = []
+    for row in tsv.splitlines()[1:]:
+        cols = row.split('\t')
+        # Word rows (level 5) with text; confidence -1 marks a non-word
+        if len(cols) != 12 or cols[0] != '5' or not cols[11].strip():
+            continue
+        paragraphs.setdefault(tuple(cols[1:4]), {}).setdefault(cols[4], []).append(cols[11].strip())
+        if float(cols[10]) >= 0:
+            confs.append(float(cols[10]))
+    text = ''.join(''.join(' '.join(words) + '\n' for words in lines.values()) + '\n'
+                   for lines in paragraphs.values())
+    return text, sum(confs) / len(confs) if confs else 0.0
+
+
+class TesserocrEngine:
+    """One loaded Tesseract API: traineddata is read once, images go in from memory."""
+
+    name = 'tesserocr'
+
+    def __init__(self, lang, psm=DEFAULT_PSM, oem=DEFAULT_OEM):
+        self.lang = lang
+        self.api = tesserocr.PyTessBaseAPI(lang=lang, psm=psm, oem=oem)
+
+    def recognize(self, image):
+        self.api.SetImage(_as_pil(image))
+        return self.api.GetUTF8Text()
+
+    def recognize_with_confidence(self, image):
+        """Text plus mean word confidence (0-100) from the same recognition pass."""
+        text = self.recognize(image)
+        return text, float(self.api.MeanTextConf())
+
+    def close(self):
+        self.api.End()
+
+
+class SubprocessEngine:
+    """pytesseract fallback with the same interface; pays a process launch per call."""
+
+    name = 'pytesseract'
+
+    def __init__(self, lang, psm=DEFAULT_PSM, oem=DEFAULT_OEM):
+        self.lang = lang
+        self.config = f'--oem {oem} --psm {psm}'
+
+    def recognize(self, image):
+        return pytesseract.image_to_string(_as_pil(image), lang=self.lang, config=self.config)
+
+    def recognize_with_confidence(self, image):
+        # One tesseract run: the TSV has every word with its confidence, and the
+        # text is rebuilt from its words
+        tsv = pytesseract.image_to_data(_as_pil(image), lang=self.lang, config=self.config)
+        return _tsv_text_and_confidence(tsv)
+
+    def close(self):
+        pass
+
+
+ENGINE_CLASS = TesserocrEngine if TESSEROCR_AVAILABLE else SubprocessEngine
+
+# The Tesseract API is not thread-safe, so engines are cached per thread
+# (and therefore per worker process) and per language set
+_engines = threading.local()
+_engine_version = None
+
+
+def engine_version():
+    """Engine and Tesseract version; part of every OCR cache key."""
+    global _engine_version
+    if _engine_version is None:
+        if TESSEROCR_AVAILABLE:
+            version = tesserocr.tesseract_version().split()[1]
+        else:
+            version = str(pytesseract.get_tesseract_version())
+        _engine_version = f"{ENGINE_CLASS.name}-{version}"
+    return _engine_version
+
+
+def get_engine(lang, psm=DEFAULT_PSM, oem=DEFAULT_OEM):
+    """The calling thread's engine for (lang, psm, oem), created on first use."""
+    if not hasattr(_engines, 'cache'):
+        _engines.cache = {}
+    key = (lang, psm, oem)
+    if key not in _engines.cache:
+        _engines.cache[key] = ENGINE_CLASS(lang, psm, oem)
+    return _engines.cache[key]
+
+
+def get_cache():
+    """The calling thread's OCR result cache, or None when disabled."""
+    if not OCR_CACHE_PATH:
+        return None
+    if not hasattr(_engines, 'results'):
+        _engines.results = OCRCache(OCR_CACHE_PATH, OCR_CACHE_MAX_MB)
+    return _engines.results
+
+
+def image_to_string(image, lang, psm=DEFAULT_PSM, oem=DEFAULT_OEM, dpi=None):
+    """Drop-in for pytesseract.image_to_string on a persistent engine, through the OCR cache."""
+    cache = get_cache()
+    if cache is None:
+        return get_engine(lang, psm, oem).recognize(image)
+    # Engines are only loaded on a miss, so a fully cached rerun never starts Tesseract
+    key = cache.key(image, dpi, lang, psm, oem, engine_version())
+    cached = cache.get(key)
+    if cached:
+        return cached[0]
+    text = get_engine(lang, psm, oem).recognize(image)
+    cache.put(key, text)
+    return text
+
+
+def recognize(image, lang, psm=DEFAULT_PSM, oem=DEFAULT_OEM, dpi=None):
+    """(text, mean word confidence) for an image, through the OCR cache."""
+    cache = get_cache()
+    if cache is None:
+        return get_engine(lang, psm, oem).recognize_with_confidence(image)
+    key = cache.key(image, dpi, lang, psm, oem, engine_version())
+    cached = cache.get(key, need_confidence=True)
+    if cached:
+        return cached
+    text, confidence = get_engine(lang, psm, oem).recognize_with_confidence(image)
+    cache.put(key, text, confidence)
+    return text, confidence
+
+
+def close_engines():
+    for engine in getattr(_engines, 'cache', {}).values():
+        engine.close()
+    _engines.cache = {}
+    if hasattr(_engines, 'results'):
+        _engines.results.close()
+        del _engines.results
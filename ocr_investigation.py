@@ -1,6 +1,6 @@
 from pdf2image import convert_from_path
-import pytesseract
 from pathlib import Path
+from ocr_engine import image_to_string
 import json
 
 def ocr_test():
@@ -24,7 +24,7 @@ def ocr_test():
         
         print("🤖 Running OCR (ben+eng)...")
         # Religious books often use mixed scripts
-        text = pytesseract.image_to_string(img, lang='ben+eng')
+        text = image_to_string(img, 'ben+eng', dpi=300)
         
         output_txt_path = Path('ocr_test_result.txt')
         output_txt_path.write_text(text, encoding='utf-8')
@@ -0,0 +1,292 @@
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+import pypdfium2 as pdfium
+from adaptive_ocr import DPI_STEPS
+from page_render import render_page
+from script_detect import ScriptDecisionCache, detect_page_script
+from scsmath_tesseract_ocr import detect_scale, ocr_page_image
+
+# Worker-side state: the document currently being OCR'd, parsed once per worker
+_open_doc = {}
+
+
+@contextmanager
+def _worker_pool(workers):
+    """Process pool whose workers run Tesseract with one OpenMP thread; the pool provides the parallelism.
+
+    libgomp reads OMP_THREAD_LIMIT when libtesseract loads, and this
+    process has already imported it (through ocr_engine), so forked
+    workers would keep its thread count. Workers are spawned instead: they
+    import Tesseract fresh, with the variable already in the environment
+    they start from. It stays set until the pool closes, since workers may
+    be started on demand.
+    """
+    previous = os.environ.get('OMP_THREAD_LIMIT')
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            yield pool
+    finally:
+        if previous is None:
+            os.environ.pop('OMP_THREAD_LIMIT', None)
+        else:
+            os.environ['OMP_THREAD_LIMIT'] = previous
+
+
+def _document(pdf_path):
+    if pdf_path not in _open_doc:
+        for pdf in _open_doc.values():
+            pdf.close()
+        _open_doc.clear()
+        _open_doc[pdf_path] = pdfium.PdfDocument(pdf_path)
+    return _open_doc[pdf_path]
+
+
+def page_output_path(output_dir, pdf_path, page_num):
+    return Path(output_dir) / Path(pdf_path).stem / f"page_{page_num:03d}.txt"
+
+
+def ocr_page(pdf_path, page_num, out_path, script=None, dpi=300, adaptive=False, layout=False):
+    """Render, OCR, clean and atomically write one page; returns its manifest entry.
+
+    With `adaptive`, the page is first rendered at the lowest DPI step and
+    only re-rendered higher when its confidence or script ratio is low.
+    With `layout`, only text blocks are OCR'd, each with its own script.
+    """
+    start = time.perf_counter()
+    try:
+        pdf = _document(pdf_path)
+        if adaptive:
+            dpi = DPI_STEPS[0]
+        img = render_page(pdf, page_num - 1, dpi)
+        detected = script is None and not layout
+        if detected:
+            script = detect_page_script(img, scale=detect_scale(dpi))
+        render = (lambda d: render_page(pdf, page_num - 1, d)) if adaptive else None
+        result = ocr_page_image(img, dpi, script, render, layout)
+
+        data = result.pop('text').encode('utf-8')
+        tmp = Path(out_path).with_name(Path(out_path).name + '.tmp')
+        tmp.write_bytes(data)
+        os.replace(tmp, out_path)
+        return dict(
+            result, status='done', detected=detected,
+            bytes=len(data), sha256=hashlib.sha256(data).hexdigest(),
+            seconds=round(time.perf_counter() - start, 3)
+        )
+    except Exception as e:
+        return {'status': 'failed', 'error': str(e), 'seconds': round(time.perf_counter() - start, 3)}
+
+
+class OCRScheduler:
+    """Page-level OCR jobs over a process pool, checkpointed in a manifest.
+
+    Every finished page is recorded in `<output_dir>/ocr_manifest.json`
+    with its timing, status, script and output checksum. On restart, pages
+    whose output file still matches its manifest entry are skipped, so a
+    whole-library run can be interrupted and resumed at any point.
+    """
+
+    def __init__(self, output_dir='ocr_dataset', workers=None, lock_after=3, save_every=20,
+                 adaptive=False, layout=False):
+        self.output_dir = Path(output_dir)
+        self.adaptive = adaptive
+        self.layout = layout
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.workers = workers or os.cpu_count()
+        self.lock_after = lock_after
+        self.save_every = save_every
+        self.manifest_path = self.output_dir / 'ocr_manifest.json'
+        self.manifest = {'books': {}}
+        if self.manifest_path.exists():
+            with open(self.manifest_path, 'r') as f:
+                self.manifest = json.load(f)
+        self.decisions = ScriptDecisionCache(self.output_dir / 'script_decisions.json')
+        self.locks = {}
+        self.jobs = []
+        self.finished = []
+
+    def _entry(self, pdf_path, page_num):
+        return self.manifest['books'].get(Path(pdf_path).name, {}).get('pages', {}).get(str(page_num))
+
+    def is_done(self, pdf_path, page_num):
+        """True if the page's output exists and matches what the manifest recorded."""
+        out_path = page_output_path(self.output_dir, pdf_path, page_num)
+        if not out_path.exists():
+            return False
+        entry = self._entry(pdf_path, page_num)
+        if entry is None:
+            # Written by a run that predates the manifest: accept non-empty UTF-8 text
+            try:
+                return bool(out_path.read_text(encoding='utf-8').strip())
+            except UnicodeDecodeError:
+                return False
+        if entry['status'] != 'done' or out_path.stat().st_size != entry['bytes']:
+            return False
+        return hashlib.sha256(out_path.read_bytes()).hexdigest() == entry['sha256']
+
+    def add_book(self, pdf_path, pages=None):
+        """Queue 1-based `pages` of a book (default: all); returns how many need OCR."""
+        pdf_path = Path(pdf_path)
+        if pages is None:
+            pdf = pdfium.PdfDocument(str(pdf_path))
+            pages = range(1, len(pdf) + 1)
+            pdf.close()
+        book = self.manifest['books'].setdefault(pdf_path.name, {'pdf': str(pdf_path), 'pages': {}})
+        book['total_pages'] = len(pages)
+        page_output_path(self.output_dir, pdf_path, 1).parent.mkdir(parents=True, exist_ok=True)
+        self.locks.setdefault(pdf_path.name, self.decisions.lock_for(pdf_path.name, self.lock_after))
+
+        todo = [p for p in pages if not self.is_done(pdf_path, p)]
+        self.jobs.extend((str(pdf_path), p) for p in todo)
+        print(f"📖 {pdf_path.name}: {len(pages) - len(todo)} pages already done, {len(todo)} queued")
+        return len(todo)
+
+    def _job_args(self, pdf_path, page_num):
+        lock = self.locks[Path(pdf_path).name]
+        # Once a book's script is locked, workers skip detection for its remaining pages
+        script = lock.script if lock.locked else None
+        out_path = str(page_output_path(self.output_dir, pdf_path, page_num))
+        return pdf_path, page_num, out_path, script, 300, self.adaptive, self.layout
+
+    def _probe_limit(self, pdf_path, probed):
+        """How many pages of a book may run script detection at once, or None for no limit.
+
+        Until a book's script is locked, only as many pages as the lock still
+        needs are in flight, so the rest of the book goes out with the locked
+        script instead of all detecting it in parallel. A book that has not
+        locked after 4 * lock_after detections (e.g. mostly Latin pages) is no
+        longer held back.
+        """
+        lock = self.locks[Path(pdf_path).name]
+        if self.layout or lock.locked or probed >= 4 * self.lock_after:
+            return None
+        return max(1, lock.lock_after - lock.streak)
+
+    def _record(self, pdf_path, page_num, entry):
+        name = Path(pdf_path).name
+        if entry.pop('detected', False):
+            self.locks[name].observe(entry['script'])
+        self.manifest['books'][name]['pages'][str(page_num)] = entry
+        self.finished.append(entry)
+        if entry['status'] == 'done':
+            status = f"{entry['script']} -> {entry['lang']} at {entry['dpi']} DPI"
+            if entry['confidence'] is not None:
+                status += f", confidence {entry['confidence']}"
+        else:
+            status = f"FAILED ({entry['error']})"
+        print(f"   📄 {name} p{page_num}: {status} in {entry['seconds']:.1f}s")
+
+    def save(self):
+        for name, lock in self.locks.items():
+            self.decisions.record(name, lock)
+        self.decisions.save()
+        tmp = self.manifest_path.with_name(self.manifest_path.name + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, self.manifest_path)
+
+    def run(self):
+        jobs, self.jobs = self.jobs, []
+        print(f"🚀 OCR: {len(jobs)} pages on {self.workers} workers")
+        start = time.perf_counter()
+        done = 0
+        try:
+            if self.workers <= 1:
+                for pdf_path, page_num in jobs:
+                    self._record(pdf_path, page_num, ocr_page(*self._job_args(pdf_path, page_num)))
+                    done += 1
+                    if done % self.save_every == 0:
+                        self.save()
+            else:
+                with _worker_pool(self.workers) as pool:
+                    queues = {}
+                    for pdf_path, page_num in jobs:
+                        queues.setdefault(pdf_path, deque()).append(page_num)
+                    pending = {}
+                    probing = Counter() # in-flight pages per book that still run script detection
+                    probed = Counter()
+
+                    def fill():
+                        # Keep the pool busy without queueing the whole library up front
+                        for pdf_path, pages in list(queues.items()):
+                            if not pages:
+                                del queues[pdf_path]
+                                continue
+                            limit = self._probe_limit(pdf_path, probed[pdf_path])
+                            while pages and len(pending) < 2 * self.workers:
+                                probe = limit is not None
+                                if probe and probing[pdf_path] >= limit:
+                                    break
+                                page_num = pages.popleft()
+                                future = pool.submit(ocr_page, *self._job_args(pdf_path, page_num))
+                                pending[future] = (pdf_path, page_num, probe)
+                                probing[pdf_path] += probe
+                            if len(pending) >= 2 * self.workers:
+                                break
+
+                    fill()
+                    while pending:
+                        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            pdf_path, page_num, probe = pending.pop(future)
+                            probing[pdf_path] -= probe
+                            probed[pdf_path] += probe
+                            self._record(pdf_path, page_num, future.result())
+                            done += 1
+                            if done % self.save_every == 0:
+                                self.save()
+                        fill()
+        finally:
+            self.save()
+        elapsed = time.perf_counter() - start
+        print(f"✨ OCR'd {done} pages in {elapsed:.1f}s ({done / elapsed if elapsed else 0:.2f} pages/s)")
+        self.print_dpi_summary()
+        return done
+
+    def print_dpi_summary(self):
+        """Pages, mean confidence and mean seconds per final DPI for this run."""
+        by_dpi = {}
+        for entry in self.finished:
+            if entry['status'] == 'done':
+                by_dpi.setdefault(entry['dpi'], []).append(entry)
+        for dpi, entries in sorted(by_dpi.items()):
+            # Fixed-DPI pages are read without a confidence pass
+            confidences = [e['confidence'] for e in entries if e['confidence'] is not None]
+            confidence = f", mean confidence {sum(confidences) / len(confidences):.1f}" if confidences else ""
+            seconds = sum(e['seconds'] for e in entries) / len(entries)
+            print(f"   {dpi} DPI: {len(entries)} pages{confidence}, {seconds:.2f}s/page")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumable, parallel page-level OCR of PDF books")
+    parser.add_argument("paths", nargs="*", default=["scsmath_library/indian_lang_pdfs"],
+                        help="PDF files or directories of PDFs")
+    parser.add_argument("--output", default="ocr_dataset")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--adaptive", action="store_true",
+                        help="OCR at low DPI first, re-render only low-confidence pages")
+    parser.add_argument("--layout", action="store_true",
+                        help="OCR only detected text blocks, choosing the script per block")
+    args = parser.parse_args()
+
+    scheduler = OCRScheduler(args.output, workers=args.workers, adaptive=args.adaptive, layout=args.layout)
+    for path in map(Path, args.paths):
+        for pdf_path in (sorted(path.glob('*.pdf')) if path.is_dir() else [path]):
+            if pdf_path.exists():
+                scheduler.add_book(pdf_path)
+            else:
+                print(f"❌ {pdf_path} not found")
+    scheduler.run()
+
+
+if __name__ == "__main__":
+    main()
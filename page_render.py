@@ -0,0 +1,81 @@
+import queue
+import threading
+import pypdfium2 as pdfium
+
+_DONE = object()
+
+
+def render_page(pdf, page_idx, dpi=300, grayscale=False, as_numpy=False):
+    """Render one 0-based page of an open PdfDocument to a PIL image (or NumPy array)."""
+    page = pdf[page_idx]
+    try:
+        bitmap = page.render(scale=dpi / 72, grayscale=grayscale)
+        return bitmap.to_numpy().copy() if as_numpy else bitmap.to_pil()
+    finally:
+        page.close()
+
+
+def iter_rendered_pages(pdf, pages=None, dpi=300, prefetch=2, grayscale=False, as_numpy=False):
+    """Yield (page_num, image, error) for 1-based `pages` (default: all) in order.
+
+    `pdf` is an open pdfium.PdfDocument or a path; the document is parsed
+    once for the whole run. Up to `prefetch` pages are rendered ahead on a
+    background thread while the caller OCRs the current one (0 renders
+    inline). PDFium is not thread-safe, even across documents: while a
+    prefetching iterator is open, make no other PDFium call (rendering,
+    text extraction, opening or closing any document) from any thread.
+    Use prefetch=0 when PDFium work is interleaved with the iteration.
+    """
+    owns_pdf = not isinstance(pdf, pdfium.PdfDocument)
+    if owns_pdf:
+        pdf = pdfium.PdfDocument(str(pdf))
+    total = len(pdf)
+    indexes = range(total) if pages is None else [p - 1 for p in pages if 1 <= p <= total]
+
+    def render(idx):
+        try:
+            return idx + 1, render_page(pdf, idx, dpi, grayscale, as_numpy), None
+        except Exception as e:
+            return idx + 1, None, str(e)
+
+    if prefetch <= 0:
+        try:
+            for idx in indexes:
+                yield render(idx)
+        finally:
+            if owns_pdf:
+                pdf.close()
+        return
+
+    buffer = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    def put(item):
+        # Give up if the consumer went away, instead of blocking on a full queue
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        for idx in indexes:
+            if not put(render(idx)):
+                return
+        put(_DONE)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+        if owns_pdf:
+            pdf.close()
@@ -0,0 +1,65 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from pdf_text import get_backend, page_count
+
+
+def extract_page_range(pdf_path, start, end, backend=None):
+    """Extract pages [start, end) in one worker; returns [(page_num, text, error)]."""
+    return list(get_backend(backend).iter_pages(pdf_path, range(start + 1, end + 1)))
+
+
+class PageExtractor:
+    """Page-sharded PDF text extraction over a reusable process pool.
+
+    Page ranges of `shard_size` pages are spread over the workers and
+    results are yielded strictly in page order, with at most
+    `2 * workers` shards in flight so memory stays bounded on large books.
+    `backend` names a pdf_text backend; None picks the fastest installed.
+    """
+
+    def __init__(self, workers=None, shard_size=16, backend=None):
+        self.workers = workers or os.cpu_count()
+        self.shard_size = shard_size
+        self.backend = get_backend(backend).name
+        self.pool = None
+
+    def _shards(self, pdf_path):
+        total = page_count(pdf_path, self.backend)
+        return [(str(pdf_path), start, min(start + self.shard_size, total), self.backend)
+                for start in range(0, total, self.shard_size)]
+
+    def iter_pages(self, pdf_path):
+        """Yield (page_num, text, error) for every page, in order."""
+        shards = self._shards(Path(pdf_path))
+        if self.workers <= 1 or len(shards) <= 1:
+            for shard in shards:
+                yield from extract_page_range(*shard)
+            return
+
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        pending = deque()
+        shards = iter(shards)
+        for shard in shards:
+            pending.append(self.pool.submit(extract_page_range, *shard))
+            if len(pending) >= 2 * self.workers:
+                break
+        while pending:
+            results = pending.popleft().result()
+            next_shard = next(shards, None)
+            if next_shard:
+                pending.append(self.pool.submit(extract_page_range, *next_shard))
+            yield from results
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,117 @@
+import pikepdf
+from pathlib import Path
+
+TEXT_OPERATORS = {'Tj', 'TJ', "'", '"'}
+PAINT_OPERATORS = {'S', 's', 'f', 'F', 'f*', 'B', 'B*', 'b', 'b*'}
+PAGE_CODES = {'text': 't', 'scanned': 's', 'mixed': 'm', 'blank': 'b'}
+# Path paintings on a page without text or images above which it is taken
+# for text converted to outlines (common with legacy Indic fonts) and OCR'd
+VECTOR_TEXT_MIN_PATHS = 50
+
+
+def _mul(m, n):
+    """Multiply two PDF matrices [a b c d e f]."""
+    a, b, c, d, e, f = m
+    a2, b2, c2, d2, e2, f2 = n
+    return [a * a2 + b * c2, a * b2 + b * d2,
+            c * a2 + d * c2, c * b2 + d * d2,
+            e * a2 + f * c2 + e2, e * b2 + f * d2 + f2]
+
+
+def _walk(stream_owner, resources, ctm, stats, depth=0):
+    """Count text operators and path paintings, and accumulate image area (in user-space units)."""
+    xobjects = resources.get('/XObject', {}) if resources is not None else {}
+    stack = []
+    render_mode = 0
+    # "BI ID EI" lets inline images through, reported as one 'INLINE IMAGE' operator
+    operators = "q Q cm Do Tr Tj TJ ' \" BI ID EI " + ' '.join(PAINT_OPERATORS)
+    for operands, operator in pikepdf.parse_content_stream(stream_owner, operators):
+        op = str(operator)
+        if op == 'q':
+            stack.append((ctm, render_mode))
+        elif op == 'Q' and stack:
+            ctm, render_mode = stack.pop()
+        elif op == 'cm':
+            ctm = _mul([float(x) for x in operands], ctm)
+        elif op == 'Tr':
+            render_mode = int(operands[0])
+        elif op in TEXT_OPERATORS:
+            # Mode 3 is invisible text, i.e. an OCR layer laid over a scan
+            stats['invisible_text_ops' if render_mode == 3 else 'text_ops'] += 1
+        elif op in PAINT_OPERATORS:
+            stats['paths'] += 1
+        elif op == 'INLINE IMAGE':
+            # Drawn into the unit square like an image XObject
+            a, b, c, d = ctm[:4]
+            stats['image_area'] += abs(a * d - b * c)
+            stats['images'] += 1
+        elif op == 'Do':
+            xobj = xobjects.get(operands[0])
+            if xobj is None:
+                continue
+            subtype = xobj.get('/Subtype')
+            if subtype == '/Image':
+                a, b, c, d = ctm[:4]
+                stats['image_area'] += abs(a * d - b * c)
+                stats['images'] += 1
+            elif subtype == '/Form' and depth < 3:
+                matrix = [float(x) for x in xobj.get('/Matrix', [1, 0, 0, 1, 0, 0])]
+                _walk(xobj, xobj.get('/Resources'), _mul(matrix, ctm), stats, depth + 1)
+
+
+def classify_page(page):
+    """Classify one page from object metadata only (no text extraction or rendering).
+
+    Returns the page type ('text', 'scanned', 'mixed' or 'blank') with the
+    counts it was derived from:
+      - visible text: 'mixed' when images cover half the page, else 'text'
+      - only invisible text (Tr 3): 'scanned'. That is a scan carrying
+        someone else's OCR layer; for these books it is usually wrong for
+        Bengali/Devanagari and diacritics, so the page is OCR'd again rather
+        than extracted
+      - no text: 'scanned' if there is any image or outlined text (many
+        path paintings), otherwise 'blank', which needs neither extraction
+        nor OCR
+    """
+    resources = page.obj.get('/Resources')
+    fonts = resources.get('/Font', {}) if resources is not None else {}
+    stats = {'text_ops': 0, 'invisible_text_ops': 0, 'images': 0, 'paths': 0, 'image_area': 0.0}
+    try:
+        _walk(page, resources, [1, 0, 0, 1, 0, 0], stats)
+    except pikepdf.PdfError:
+        stats['parse_error'] = True
+
+    x0, y0, x1, y1 = [float(v) for v in page.mediabox]
+    page_area = abs((x1 - x0) * (y1 - y0)) or 1.0
+    coverage = min(stats.pop('image_area') / page_area, 1.0)
+
+    if stats['text_ops']:
+        page_type = 'mixed' if coverage >= 0.5 else 'text'
+    elif (stats['invisible_text_ops'] or stats['images'] or stats['paths'] >= VECTOR_TEXT_MIN_PATHS
+          or stats.get('parse_error')):
+        page_type = 'scanned'
+    else:
+        page_type = 'blank'
+
+    return dict(stats, type=page_type, fonts=len(fonts), image_coverage=round(coverage, 3))
+
+
+def classify_pdf(file_path):
+    """Per-page classification for a whole PDF.
+
+    `page_types` is one code per page ('t' text, 's' scanned, 'm' mixed,
+    'b' blank) so it stays compact in the scan cache and bulk_entropy_report.json.
+    """
+    with pikepdf.open(Path(file_path)) as pdf:
+        codes = [PAGE_CODES[classify_page(page)['type']] for page in pdf.pages]
+    page_types = ''.join(codes)
+    return {
+        'page_types': page_types,
+        'page_summary': {name: page_types.count(code) for name, code in PAGE_CODES.items()}
+    }
+
+
+def pages_of_type(page_types, *types):
+    """1-based page numbers whose code is in `types` (e.g. 'scanned')."""
+    codes = {PAGE_CODES[t] for t in types}
+    return [i + 1 for i, code in enumerate(page_types) if code in codes]
@@ -0,0 +1,144 @@
+from pathlib import Path
+
+# Backends are optional: whichever are installed get used, fastest first
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
+try:
+    import PyPDF2
+    PYPDF2_AVAILABLE = True
+except ImportError:
+    PYPDF2_AVAILABLE = False
+
+try:
+    import pikepdf
+    PIKEPDF_AVAILABLE = True
+except ImportError:
+    PIKEPDF_AVAILABLE = False
+
+PDF_TEXT_AVAILABLE = PDFIUM_AVAILABLE or PYPDF2_AVAILABLE
+
+# PDFium ends lines with CRLF and marks hyphenation breaks with U+0002
+_PDFIUM_FIXUPS = str.maketrans({'\r': None, '\x02': '-', '\ufffe': '-'})
+
+
+def _page_indexes(total, pages):
+    """0-based indexes for 1-based `pages` (None = all), skipping out-of-range ones."""
+    if pages is None:
+        return range(total)
+    return [p - 1 for p in pages if 1 <= p <= total]
+
+
+class PdfiumBackend:
+    """Text extraction through PDFium (C++), the fast path."""
+
+    name = 'pdfium'
+    available = PDFIUM_AVAILABLE
+
+    def page_count(self, pdf_path):
+        pdf = pdfium.PdfDocument(str(pdf_path))
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def iter_pages(self, pdf_path, pages=None):
+        pdf = pdfium.PdfDocument(str(pdf_path))
+        try:
+            for idx in _page_indexes(len(pdf), pages):
+                try:
+                    page = pdf[idx]
+                    textpage = page.get_textpage()
+                    text = textpage.get_text_range()
+                    textpage.close()
+                    page.close()
+                    yield idx + 1, text.translate(_PDFIUM_FIXUPS), None
+                except Exception as e:
+                    yield idx + 1, None, str(e)
+        finally:
+            pdf.close()
+
+
+class PyPDF2Backend:
+    """Pure-Python extraction, kept as the fallback and parity reference."""
+
+    name = 'pypdf2'
+    available = PYPDF2_AVAILABLE
+
+    def page_count(self, pdf_path):
+        with open(pdf_path, 'rb') as f:
+            return len(PyPDF2.PdfReader(f).pages)
+
+    def iter_pages(self, pdf_path, pages=None):
+        with open(pdf_path, 'rb') as f:
+            reader = PyPDF2.PdfReader(f)
+            for idx in _page_indexes(len(reader.pages), pages):
+                try:
+                    yield idx + 1, reader.pages[idx].extract_text(), None
+                except Exception as e:
+                    yield idx + 1, None, str(e)
+
+
+# Preference order: fastest first
+BACKENDS = {backend.name: backend for backend in (PdfiumBackend, PyPDF2Backend)}
+
+
+def available_backends():
+    return [name for name, backend in BACKENDS.items() if backend.available]
+
+
+def get_backend(name=None):
+    """Backend instance by name, or the fastest installed one when name is None."""
+    if name is None:
+        installed = available_backends()
+        if not installed:
+            raise RuntimeError("No PDF text backend installed. Install with: pip install pypdfium2")
+        name = installed[0]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown PDF text backend: {name} (choose from {', '.join(BACKENDS)})")
+    if not BACKENDS[name].available:
+        raise RuntimeError(f"PDF text backend '{name}' is not installed")
+    return BACKENDS[name]()
+
+
+def page_count(pdf_path, backend=None):
+    return get_backend(backend).page_count(pdf_path)
+
+
+def iter_page_text(pdf_path, pages=None, backend=None):
+    """Yield (page_num, text, error) for 1-based `pages` (default: all) in order."""
+    return get_backend(backend).iter_pages(Path(pdf_path), pages)
+
+
+def extract_text(pdf_path, pages=None, backend=None, sep=""):
+    """Text of the given 1-based pages joined with `sep`; failed pages are skipped."""
+    return sep.join(text for _, text, error in iter_page_text(pdf_path, pages, backend)
+                    if not error and text)
+
+
+def pdf_metadata(file_path):
+    """Document-level metadata, via pikepdf when installed, else PDFium."""
+    if PIKEPDF_AVAILABLE:
+        with pikepdf.open(Path(file_path)) as pdf:
+            return {
+                'pdf_version': pdf.pdf_version,
+                'producer': str(pdf.docinfo.get('/Producer', 'unknown')),
+                'creator': str(pdf.docinfo.get('/Creator', 'unknown')),
+                'is_linearized': pdf.is_linearized,
+                'page_count': len(pdf.pages)
+            }
+    pdf = pdfium.PdfDocument(str(file_path))
+    try:
+        version = pdf.get_version()
+        info = pdf.get_metadata_dict()
+        return {
+            'pdf_version': f"{version // 10}.{version % 10}" if version else 'unknown',
+            'producer': info.get('Producer') or 'unknown',
+            'creator': info.get('Creator') or 'unknown',
+            'page_count': len(pdf)
+        }
+    finally:
+        pdf.close()
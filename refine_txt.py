@@ -1,20 +1,9 @@
 import os
-import re
-from html import unescape
+from html_text import html_to_text
 
 def clean_html(text):
-    # Replace <br />, <br>, etc with newline
-    text = re.sub(r'<br\s*/?>', '
-', text)
-    # Strip all other tags
-    text = re.sub(r'<[^>]+>', '', text)
-    # Unescape HTML entities (e.g. &nbsp;)
-    text = unescape(text)
-    # Strip leading/trailing spaces from each line in the paragraph
-    lines = [line.strip() for line in text.split('
-')]
-    return '
-'.join(lines)
+    # One line per paragraph or <br>, tags stripped and entities (e.g. &nbsp;) unescaped
+    return html_to_text(text, sep='\n')
 
 def process_dir(directory):
     for root, dirs, files in os.walk(directory):
@@ -68,8 +57,7 @@ def process_dir(directory):
                         last_empty = False
                 
                 with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write('
-'.join(final_content))
+                    f.write('\n'.join(final_content))
 
 # Actually, the previous script's logic was flawed in how it joined paragraphs.
 # Let's just re-run the conversion from the original scrape JSONs if they still exist.
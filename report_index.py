@@ -0,0 +1,116 @@
+import json
+import os
+import pickle
+from collections import defaultdict
+from pathlib import Path
+
+
+def cluster_id_for(file_info):
+    """Cluster key used by EntropyScanner: category + PDF version/producer."""
+    cluster_id = file_info['category']
+    if 'pdf_version' in file_info:
+        cluster_id += f"_{file_info['pdf_version']}_{file_info['producer'][:20]}"
+    return cluster_id
+
+
+def _stamp(path):
+    st = Path(path).stat()
+    return (st.st_size, st.st_mtime_ns)
+
+
+def load_report(path, compact=True):
+    """Load a JSON report, going through a pickled sidecar when it is fresh.
+
+    The sidecar (`<report>.idx`) is rebuilt whenever the JSON's size or
+    mtime changes, so tools never read a stale copy.
+    """
+    path = Path(path)
+    compact_path = path.with_name(path.name + '.idx')
+    stamp = _stamp(path)
+    if compact and compact_path.exists():
+        try:
+            with open(compact_path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached['stamp'] == stamp:
+                return cached['report']
+        except Exception:
+            pass
+
+    with open(path, 'r') as f:
+        report = json.load(f)
+    if compact:
+        try:
+            tmp = compact_path.with_name(compact_path.name + '.tmp')
+            with open(tmp, 'wb') as f:
+                pickle.dump({'stamp': stamp, 'report': report}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, compact_path)
+        except OSError:
+            pass
+    return report
+
+
+class EntropyReport:
+    """Indexed access to bulk_entropy_report.json.
+
+    Lookups by filename, path, cluster, mime and producer are dict hits
+    instead of linear scans over report['files'].
+    """
+
+    def __init__(self, report):
+        self.report = report
+        self.files = report['files']
+        self.clusters = report['clusters']
+        self.by_filename = {}
+        self.by_path = {}
+        self.by_cluster = defaultdict(list)
+        self.by_mime = defaultdict(list)
+        self.by_producer = defaultdict(list)
+
+        for f in self.files:
+            self.by_filename.setdefault(f['filename'], f)
+            self.by_path[f['path']] = f
+            for alias in f.get('aliases', []):
+                self.by_path[alias] = f
+            self.by_cluster[cluster_id_for(f)].append(f)
+            self.by_mime[f['mime']].append(f)
+            self.by_producer[f.get('producer', 'unknown')].append(f)
+
+    @classmethod
+    def load(cls, path='bulk_entropy_report.json', compact=True):
+        return cls(load_report(path, compact))
+
+    def file(self, filename):
+        return self.by_filename[filename]
+
+    def cluster_files(self, cluster_id):
+        return self.by_cluster.get(cluster_id, [])
+
+    def top_clusters(self, n=5):
+        """The n largest clusters as (cluster_id, [file_info, ...])."""
+        ranked = sorted(self.clusters.items(), key=lambda x: len(x[1]), reverse=True)[:n]
+        return [(cluster_id, self.by_cluster[cluster_id]) for cluster_id, _ in ranked]
+
+
+class RawEntropyReport:
+    """Indexed access to entropy_report_raw.json ({category: [sample, ...]})."""
+
+    def __init__(self, report):
+        self.report = report
+        self.by_category = report
+        self.by_url = {}
+        self.by_sha256 = defaultdict(list)
+        self.by_mime = defaultdict(list)
+
+        for samples in report.values():
+            for sample in samples:
+                self.by_url[sample['url']] = sample
+                fingerprint = sample.get('fingerprint', {})
+                self.by_sha256[fingerprint.get('sha256')].append(sample)
+                self.by_mime[fingerprint.get('mime')].append(sample)
+
+    @classmethod
+    def load(cls, path='entropy_report_raw.json', compact=True):
+        return cls(load_report(path, compact))
+
+    def categories(self):
+        return self.by_category.items()
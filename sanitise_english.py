@@ -1,49 +1,19 @@
+import os
 import re
 import json
 from pathlib import Path
+from normalizer_core import NormalizerCore, OCR_FIXES, ENGLISH_FIXES, BOILERPLATE_PATTERNS
 
 class EnglishSanitizer:
     def __init__(self):
-        # Patterns to normalize common diacritic artifacts found in extraction
-        self.normalizations = [
-            (r'çr\^', 'Srila'),
-            (r'Ír\(', 'Sri'),
-            (r'Maéh', 'Math'),
-            (r'Maöh', 'Math'),
-            (r'Gauråíga', 'Gauranga'),
-            (r'Gaurå&ga', 'Gauranga'),
-            (r'Ír\(la', 'Srila'),
-            (r'Srilala', 'Srila'),
-            (r'Vi!@upåd', 'Vishnupad'),
-            (r'Rak!ak', 'Rakshak'),
-            (r'Ír\(dhar', 'Sridhar'),
-            (r'Ír\(man', 'Sriman'),
-            (r'acharya', 'acharya'),
-            (r'acharyya', 'acharya'),
-        ]
-
-        # Patterns for boilerplate removal
-        self.boilerplate_regex = [
-            r'All glories to Sri Guru and Sri Gauranga',
-            r'All Glory to Sri Sri Guru-Gauranga',
-            r'Sri Chaitanya Saraswat Math',
-            r'Kolerganj, (?:P\.O\.|Post Office:) Nabadwip,.*?(?:Pin \d+|West Bengal|India)',
-            r'Website: http://www\.scsmath\.com',
-            r'© All rights reserved by.*',
-            r'Edited by:.*',
-            r'Published by:.*',
-            r'Assistant editor:.*',
-            r'Founder-Acharya:.*',
-            r'Sevaite-President-Acharya:.*',
-            r'Printed in India.*',
-            r'— \d+ —', # Page numbers
-            r'—·  · — \d+', # Fancy page numbers
-        ]
+        # Diacritic artifact fixes and boilerplate rules shared with CanonicalNormalizer
+        self.core = NormalizerCore(
+            fixes=OCR_FIXES + ENGLISH_FIXES,
+            boilerplate=BOILERPLATE_PATTERNS
+        )
 
     def normalize(self, text):
-        for pattern, replacement in self.normalizations:
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-        return text
+        return self.core.fix_artifacts(text)
 
     def strip_boilerplate(self, text):
         # Remove TOC: Match 'Contents' and everything until a line that looks like the start of a chapter
@@ -64,19 +34,54 @@ class EnglishSanitizer:
                 final_lines.append(line)
         
         text = '\n'.join(final_lines)
+        return self.strip_patterns(text)
 
-        for pattern in self.boilerplate_regex:
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE | re.MULTILINE)
-        
-        # Remove empty lines and excessive whitespace
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        return '\n'.join(lines)
+    def strip_patterns(self, text):
+        # Boilerplate, then empty lines and excessive whitespace
+        return self.core.strip_boilerplate(text)
 
     def sanitise(self, text):
         text = self.normalize(text)
         text = self.strip_boilerplate(text)
         return text
 
+    def sanitise_pages(self, pages, total_pages):
+        """Streaming sanitise over (page_num, text) pairs in page order.
+
+        Same rules as sanitise(), one page at a time, so a whole book never
+        has to be held in memory. The back-matter cut-off (Book List /
+        Addresses / Appendix in the last 20%) is judged by page position.
+        """
+        for page_num, text in pages:
+            text = self.normalize(text)
+            if page_num > total_pages * 0.8:
+                lines = text.split('\n')
+                for i, line in enumerate(lines):
+                    if re.match(r'^(Book List|Addresses|Appendix)', line, re.I):
+                        yield page_num, self.strip_patterns('\n'.join(lines[:i]))
+                        return
+            yield page_num, self.strip_patterns(text)
+
+    def sanitise_to_file(self, pages, total_pages, dest_path):
+        """Sanitise a (page_num, text) stream straight into dest_path; returns the word count.
+
+        Pages are written as they arrive to a temp file that replaces
+        dest_path only when the book is complete.
+        """
+        dest_path = Path(dest_path)
+        tmp = dest_path.with_name(dest_path.name + '.tmp')
+        word_count = 0
+        first = True
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for _, text in self.sanitise_pages(pages, total_pages):
+                if not text:
+                    continue
+                f.write(text if first else '\n' + text)
+                first = False
+                word_count += len(text.split())
+        os.replace(tmp, dest_path)
+        return word_count
+
 def test_sanitizer():
     sanitizer = EnglishSanitizer()
     samples_dir = Path('homogeneity_test')
@@ -0,0 +1,50 @@
+import json
+import os
+from pathlib import Path
+
+
+class ScanCache:
+    """Per-file scan results keyed by (path, size, mtime).
+
+    A file is only re-fingerprinted when its size or mtime changes, so a
+    rescan after a handful of new downloads only touches those files.
+    """
+
+    VERSION = 3 # bump when scan_file gains fields or its results change
+
+    def __init__(self, path='scan_cache.json'):
+        self.path = Path(path)
+        self.entries = {}
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION:
+                self.entries = data['entries']
+
+    @staticmethod
+    def _key(stat):
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def get(self, file_path, stat=None):
+        entry = self.entries.get(str(file_path))
+        stat = stat or Path(file_path).stat()
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['info']
+        return None
+
+    def put(self, file_path, info, stat=None):
+        stat = stat or Path(file_path).stat()
+        self.entries[str(file_path)] = dict(self._key(stat), info=info)
+
+    def retain(self, file_paths):
+        """Drop entries for files that no longer exist in the library."""
+        keep = {str(p) for p in file_paths}
+        for key in list(self.entries):
+            if key not in keep:
+                del self.entries[key]
+
+    def save(self):
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({'version': self.VERSION, 'entries': self.entries}, f)
+        os.replace(tmp, self.path)
@@ -0,0 +1,97 @@
+import json
+import os
+from pathlib import Path
+from dataset_utilities import TextCleaner
+from ocr_engine import image_to_string
+
+DETECT_LANG = "ben+hin+san"
+# PSM 6: treat the crop as one block of text, no layout analysis needed
+DETECT_PSM = 6
+INDIC_SCRIPTS = ("Bengali", "Devanagari")
+
+
+def detection_crop(img, scale=2, band=(0.35, 0.6), margin=0.1):
+    """Downscaled central text band of a page render.
+
+    A 300 DPI page reduced 2x and cut to the middle quarter of its height
+    is ~1/16 of the pixels of the full page, which is plenty for Tesseract
+    to tell Bengali from Devanagari.
+    """
+    small = img.reduce(scale) if scale > 1 else img
+    w, h = small.size
+    return small.crop((int(w * margin), int(h * band[0]), int(w * (1 - margin)), int(h * band[1])))
+
+
+def detect_page_script(img, lang=DETECT_LANG, scale=2):
+    """Script of a rendered page from a cheap OCR pass over a crop, full page as fallback.
+
+    `scale` is the downscale factor; 2 suits a 300 DPI render, 1 a 150-200 DPI one.
+    """
+    script = TextCleaner.detect_script(image_to_string(detection_crop(img, scale), lang, psm=DETECT_PSM, oem=1))
+    if script not in INDIC_SCRIPTS:
+        small = img.reduce(scale) if scale > 1 else img
+        script = TextCleaner.detect_script(image_to_string(small, lang, psm=DETECT_PSM, oem=1))
+    return script
+
+
+class ScriptLock:
+    """Per-book script decision.
+
+    Detection runs on each page until `lock_after` consecutive pages agree
+    on an Indic script; from then on the script is fixed for the rest of
+    the book and no more detection passes are spent on it.
+    """
+
+    def __init__(self, lock_after=3, script=None):
+        self.lock_after = lock_after
+        self.script = script
+        self.streak = lock_after if script else 0
+
+    @property
+    def locked(self):
+        return self.streak >= self.lock_after
+
+    def observe(self, script):
+        if self.locked:
+            return
+        if script not in INDIC_SCRIPTS:
+            # A Latin/unknown page breaks the run of agreeing pages
+            self.script = None
+            self.streak = 0
+        elif script == self.script:
+            self.streak += 1
+        else:
+            self.script = script
+            self.streak = 1
+
+    def script_for(self, img, scale=2):
+        """The book's locked script, or a fresh detection for this page."""
+        if self.locked:
+            return self.script
+        script = detect_page_script(img, scale=scale)
+        self.observe(script)
+        return script
+
+
+class ScriptDecisionCache:
+    """Locked script per book, persisted so reruns skip detection entirely."""
+
+    def __init__(self, path='script_decisions.json'):
+        self.path = Path(path)
+        self.decisions = {}
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                self.decisions = json.load(f)
+
+    def lock_for(self, book, lock_after=3):
+        return ScriptLock(lock_after, self.decisions.get(book))
+
+    def record(self, book, lock):
+        if lock.locked:
+            self.decisions[book] = lock.script
+
+    def save(self):
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.decisions, f, indent=2)
+        os.replace(tmp, self.path)
@@ -0,0 +1,124 @@
+import functools
+import re
+import unicodedata
+from collections import Counter
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+SCRIPTS = ("Bengali", "Devanagari", "Latin")
+# Transliteration diacritics, also counted as Latin: Latin Extended-A (ā, ī,
+# ū, ś...) and Latin Extended Additional (ṛ, ṣ, ṇ, ṭ, ḍ, ḥ, ṃ...)
+EXTENDED_A_RANGE = (0x0100, 0x017F)
+EXTENDED_ADDITIONAL_RANGE = (0x1E00, 0x1EFF)
+
+# Per-code-point class in the lookup table; diacritic letters get codes per block
+_NONE, _BENGALI, _DEVANAGARI, _LATIN, _EXTENDED_A, _EXTENDED_ADDITIONAL = range(6)
+_N_CODES = 6
+_CODES = {"Bengali": _BENGALI, "Devanagari": _DEVANAGARI, "Latin": _LATIN}
+_ASTRAL = re.compile('[\U00010000-\U0010FFFF]')
+
+
+def _script_of(ch):
+    """Script of one character by its Unicode name; letters only for Latin."""
+    name = unicodedata.name(ch, "")
+    if "BENGALI" in name:
+        return "Bengali"
+    if "DEVANAGARI" in name:
+        return "Devanagari"
+    if "LATIN" in name and ch.isalpha():
+        return "Latin"
+    return None
+
+
+def _code_of(cp):
+    code = _CODES.get(_script_of(chr(cp)), _NONE)
+    if code == _LATIN and EXTENDED_A_RANGE[0] <= cp <= EXTENDED_A_RANGE[1]:
+        return _EXTENDED_A
+    if code == _LATIN and EXTENDED_ADDITIONAL_RANGE[0] <= cp <= EXTENDED_ADDITIONAL_RANGE[1]:
+        return _EXTENDED_ADDITIONAL
+    return code
+
+
+@functools.lru_cache(maxsize=None)
+def _bmp_codes():
+    """Class code of every BMP code point, computed once from unicodedata."""
+    return bytes(_code_of(cp) for cp in range(0x10000))
+
+
+@functools.lru_cache(maxsize=None)
+def _lookup_table():
+    return np.frombuffer(_bmp_codes(), dtype=np.uint8)
+
+
+@functools.lru_cache(maxsize=None)
+def _class_patterns():
+    """One regex character class per code, as code point ranges (no-NumPy fallback)."""
+    codes = _bmp_codes()
+    ranges = {code: [] for code in range(1, _N_CODES)}
+    for cp, code in enumerate(codes):
+        if code:
+            spans = ranges[code]
+            if spans and spans[-1][1] == cp - 1:
+                spans[-1][1] = cp
+            else:
+                spans.append([cp, cp])
+    return {code: re.compile('[' + ''.join(re.escape(chr(a)) if a == b else f'{re.escape(chr(a))}-{re.escape(chr(b))}'
+                                           for a, b in spans) + ']')
+            for code, spans in ranges.items()}
+
+
+def _code_counts(text):
+    """Occurrences of each class code in `text`, indexed by code."""
+    if NUMPY_AVAILABLE:
+        # Lone surrogates (left by some PDF text extraction) are counted as code points too
+        cps = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+        astral = cps[cps >= 0x10000]
+        counts = np.bincount(_lookup_table()[cps[cps < 0x10000] if len(astral) else cps], minlength=_N_CODES).tolist()
+        astral = astral.tolist()
+    else:
+        counts = [0] + [len(pattern.findall(text)) for pattern in _class_patterns().values()]
+        astral = map(ord, _ASTRAL.findall(text))
+    # Beyond the BMP (rare): look the characters up one by one
+    for cp in astral:
+        counts[_code_of(cp)] += 1
+    return counts
+
+
+def _script_counter(codes):
+    counts = Counter({"Bengali": codes[_BENGALI], "Devanagari": codes[_DEVANAGARI],
+                      "Latin": codes[_LATIN] + codes[_EXTENDED_A] + codes[_EXTENDED_ADDITIONAL]})
+    return +counts # drop scripts that do not occur
+
+
+def script_counts(text):
+    """Bengali, Devanagari and Latin letter counts of `text`; scripts absent from it are left out."""
+    return _script_counter(_code_counts(text))
+
+
+def script_profile(text):
+    """Script make-up of `text` from one pass over its code points.
+
+    Returns a dict with:
+      counts   -- characters per script, plus "IAST" for diacritic letters
+                  (Latin Extended-A and Extended Additional) and
+                  "Latin Extended-A" for the former alone
+      ratios   -- each script's share of all script characters, and "IAST"
+                  as the share of Latin letters carrying diacritics
+      dominant -- the most frequent script, or "Unknown"
+    """
+    codes = _code_counts(text)
+    counts = _script_counter(codes)
+    total = sum(counts.values())
+    ratios = {script: counts[script] / total if total else 0.0 for script in SCRIPTS}
+    iast = codes[_EXTENDED_A] + codes[_EXTENDED_ADDITIONAL]
+    ratios["IAST"] = iast / counts["Latin"] if counts["Latin"] else 0.0
+    return {
+        "counts": dict({script: counts[script] for script in SCRIPTS}, IAST=iast,
+                       **{"Latin Extended-A": codes[_EXTENDED_A]}),
+        "ratios": ratios,
+        "dominant": counts.most_common(1)[0][0] if counts else "Unknown",
+    }
@@ -19,26 +19,19 @@ import json
 import hashlib
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
-from typing import List, Dict, Set, Tuple
+from typing import List, Dict, Set, Tuple, Iterator
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
+from streaming_download import stream_download
+from blob_store import BlobStore, unique_by_content
+from parallel_pdf_extract import PageExtractor
+from pdf_text import PDF_TEXT_AVAILABLE
+from html_text import epub_to_text
 
 # Optional dependencies for PDF/EPUB processing
-try:
-    import PyPDF2
-    PYPDF2_AVAILABLE = True
-except ImportError:
-    PYPDF2_AVAILABLE = False
-    print("⚠️  PyPDF2 not installed. Install with: pip install PyPDF2")
-
-try:
-    import ebooklib
-    from ebooklib import epub
-    EBOOKLIB_AVAILABLE = True
-except ImportError:
-    EBOOKLIB_AVAILABLE = False
-    print("⚠️  ebooklib not installed. Install with: pip install ebooklib")
+if not PDF_TEXT_AVAILABLE:
+    print("⚠️  No PDF text backend installed. Install with: pip install pypdfium2 (or PyPDF2)")
 
 try:
     from bs4 import BeautifulSoup
@@ -59,7 +52,8 @@ class SCSMathDownloader:
         'misc_articles': 'https://scsmath.com/docs/text_archive.html'
     }
     
-    def __init__(self, base_dir: str = "./scsmath_dataset"):
+    def __init__(self, base_dir: str = "./scsmath_dataset", extract_workers: int = None,
+                 pdf_backend: str = None):
         self.base_dir = Path(base_dir)
         self.downloads_dir = self.base_dir / "downloads"
         self.processed_dir = self.base_dir / "processed_text"
@@ -80,6 +74,12 @@ class SCSMathDownloader:
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         })
         
+        # Identical files (reprints, cross-listed books) are stored once
+        self.blobs = BlobStore(self.downloads_dir)
+        
+        # Page-sharded PDF extraction, one process pool for the whole run
+        self.page_extractor = PageExtractor(workers=extract_workers, backend=pdf_backend) if PDF_TEXT_AVAILABLE else None
+        
         self.manifest = {
             'created_at': datetime.now().isoformat(),
             'files': [],
@@ -125,69 +125,39 @@ class SCSMathDownloader:
             return []
     
     def download_file(self, url: str, dest_path: Path, retries: int = 3) -> bool:
-        """Download a file with retry logic."""
-        for attempt in range(retries):
-            try:
-                print(f"⬇️  Downloading: {url}")
-                response = self.session.get(url, timeout=60, stream=True)
-                response.raise_for_status()
-                
-                with open(dest_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                
-                print(f"✅ Downloaded: {dest_path.name}")
-                return True
-                
-            except Exception as e:
-                print(f"⚠️  Attempt {attempt + 1}/{retries} failed: {e}")
-                if attempt < retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                    
+        """Download a file with retry logic, resuming partial downloads."""
+        print(f"⬇️  Downloading: {url}")
+        if stream_download(self.session, url, dest_path, retries=retries)['status'] == 'downloaded':
+            print(f"✅ Downloaded: {dest_path.name}")
+            return True
         return False
     
-    def extract_text_from_pdf(self, pdf_path: Path) -> str:
-        """Extract text from PDF file."""
-        if not PYPDF2_AVAILABLE:
-            return "[PDF text extraction requires PyPDF2]"
+    def iter_pdf_text_parts(self, pdf_path: Path) -> Iterator[str]:
+        """Yield the per-page text blocks of a PDF in page order."""
+        if not PDF_TEXT_AVAILABLE:
+            yield "[PDF text extraction requires pypdfium2 or PyPDF2]"
+            return
         
         try:
-            with open(pdf_path, 'rb') as f:
-                reader = PyPDF2.PdfReader(f)
-                text_parts = []
-                
-                for page_num, page in enumerate(reader.pages):
-                    try:
-                        text = page.extract_text()
-                        if text:
-                            text_parts.append(f"\n--- Page {page_num + 1} ---\n{text}")
-                    except Exception as e:
-                        print(f"⚠️  Error extracting page {page_num + 1}: {e}")
-                
-                return "\n".join(text_parts)
-                
+            for page_num, text, error in self.page_extractor.iter_pages(pdf_path):
+                if error:
+                    print(f"⚠️  Error extracting page {page_num}: {error}")
+                elif text:
+                    yield f"\n--- Page {page_num} ---\n{text}"
+                    
         except Exception as e:
             print(f"❌ Error processing PDF {pdf_path.name}: {e}")
-            return f"[Error extracting text: {e}]"
+            yield f"[Error extracting text: {e}]"
+    
+    def extract_text_from_pdf(self, pdf_path: Path) -> str:
+        """Extract text from PDF file."""
+        return "\n".join(self.iter_pdf_text_parts(pdf_path))
     
     def extract_text_from_epub(self, epub_path: Path) -> str:
         """Extract text from EPUB file."""
-        if not EBOOKLIB_AVAILABLE:
-            return "[EPUB text extraction requires ebooklib]"
-        
         try:
-            book = epub.read_epub(str(epub_path))
-            text_parts = []
-            
-            for item in book.get_items():
-                if item.get_type() == ebooklib.ITEM_DOCUMENT:
-                    content = item.get_content()
-                    soup = BeautifulSoup(content, 'html.parser')
-                    text = soup.get_text(separator='\n', strip=True)
-                    if text:
-                        text_parts.append(text)
-            
-            return "\n\n".join(text_parts)
+            # Spine (reading) order, one paragraph or heading per block
+            return epub_to_text(epub_path)
             
         except Exception as e:
             print(f"❌ Error processing EPUB {epub_path.name}: {e}")
@@ -206,29 +176,42 @@ class SCSMathDownloader:
         }
         
         # Extract text based on file type
-        text_content = ""
+        parts = []
         if file_path.suffix == '.pdf':
-            text_content = self.extract_text_from_pdf(file_path)
+            parts = self.iter_pdf_text_parts(file_path)
         elif file_path.suffix == '.epub':
-            text_content = self.extract_text_from_epub(file_path)
+            parts = [self.extract_text_from_epub(file_path)]
         
-        if text_content:
-            # Save processed text
-            text_filename = file_path.stem + '.txt'
-            text_path = self.processed_dir / text_filename
-            
-            with open(text_path, 'w', encoding='utf-8') as f:
-                f.write(f"Source: {file_path.name}\n")
-                f.write(f"Processed: {metadata['processed_at']}\n")
-                f.write("=" * 80 + "\n\n")
-                f.write(text_content)
-            
+        # Stream the parts straight to disk, computing stats on the way
+        text_filename = file_path.stem + '.txt'
+        text_path = self.processed_dir / text_filename
+        tmp_path = text_path.with_name(text_filename + '.tmp')
+        content_hash = hashlib.sha256()
+        text_length = 0
+        word_count = 0
+        
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(f"Source: {file_path.name}\n")
+            f.write(f"Processed: {metadata['processed_at']}\n")
+            f.write("=" * 80 + "\n\n")
+            for i, part in enumerate(parts):
+                if i:
+                    part = "\n" + part
+                f.write(part)
+                content_hash.update(part.encode())
+                text_length += len(part)
+                word_count += len(part.split())
+        
+        if text_length:
+            os.replace(tmp_path, text_path)
             metadata['text_file'] = str(text_path.relative_to(self.base_dir))
-            metadata['text_length'] = len(text_content)
-            metadata['word_count'] = len(text_content.split())
+            metadata['text_length'] = text_length
+            metadata['word_count'] = word_count
             
             # Generate content hash
-            metadata['content_hash'] = hashlib.sha256(text_content.encode()).hexdigest()
+            metadata['content_hash'] = content_hash.hexdigest()
+        else:
+            tmp_path.unlink()
         
         return metadata
     
@@ -275,20 +258,36 @@ class SCSMathDownloader:
             # Skip if already downloaded
             if dest_path.exists():
                 print(f"⏭️  Already exists: {dest_path.name}")
+                if not self.blobs.has_view(dest_path):
+                    self.blobs.ingest(dest_path, url=link_info['url'])
                 downloaded_files.append(dest_path)
                 continue
             
             # Download
             if self.download_file(link_info['url'], dest_path):
+                self.blobs.ingest(dest_path, url=link_info['url'])
                 downloaded_files.append(dest_path)
                 time.sleep(1)  # Be polite to the server
         
-        # Process all files
+        self.blobs.save()
+        
+        # Process all files, extracting each distinct body only once
         print("\n📝 Phase 3: Extracting text from publications...")
-        for i, file_path in enumerate(downloaded_files, 1):
-            print(f"\n[{i}/{len(downloaded_files)}]")
+        unique_files = unique_by_content(downloaded_files)
+        for i, (file_path, aliases) in enumerate(unique_files, 1):
+            print(f"\n[{i}/{len(unique_files)}]")
             metadata = self.process_file(file_path)
             self.manifest['files'].append(metadata)
+            for alias in aliases:
+                print(f"🔗 {alias.name} is identical to {file_path.name}, reusing its text")
+                self.manifest['files'].append(dict(
+                    metadata,
+                    filename=alias.name,
+                    path=str(alias.relative_to(self.base_dir)),
+                    duplicate_of=metadata['filename']
+                ))
+        if self.page_extractor:
+            self.page_extractor.close()
         
         # Generate statistics
         self.manifest['statistics'] = {
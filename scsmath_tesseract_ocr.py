@@ -2,78 +2,125 @@ import os
 import time
 import random
 from pathlib import Path
-from pdf2image import convert_from_path
-import pytesseract
 from dataset_utilities import TextCleaner
 import pypdfium2 as pdfium
+from page_render import iter_rendered_pages, render_page
+from ocr_engine import image_to_string
+from adaptive_ocr import ocr_adaptive, DPI_STEPS
+from script_detect import ScriptLock, INDIC_SCRIPTS
+from layout import ocr_blocks, BLOCK_LANGS
+from collections import Counter
 
-def run_tesseract(image, lang):
+def run_tesseract(image, lang, dpi=None):
     # OEM 1: LSTM Engine Only
     # PSM 3: Fully automatic page segmentation, but no OSD. (Faster than PSM 1)
-    custom_config = r'--oem 1 --psm 3'
-    return pytesseract.image_to_string(image, lang=lang, config=custom_config)
+    # One engine per language set stays loaded for the life of the process
+    return image_to_string(image, lang, psm=3, oem=1, dpi=dpi)
 
-def process_pdf_tesseract(pdf_path, output_dir, num_samples=None):
+def lang_for_script(script):
+    """Tesseract language set for a detected script, and whether it is Bengali."""
+    if script == "Bengali":
+        return "ben", True # ben is usually very strong in default Tesseract
+    # For Devanagari, using san+hin often helps with the mixed 
+    # religious/philosophical nature of these texts.
+    return "san+hin", False
+
+def detect_scale(dpi):
+    """Downscale factor that brings a render to ~150 DPI for script detection."""
+    return max(1, round(dpi / 150))
+
+def ocr_page_image(img, dpi, script, render=None, layout=False):
+    """OCR a rendered page with the language set for its script, then clean it.
+    
+    Returns the cleaned text with the DPI, confidence and script ratio it was
+    read at. Given `render` (dpi -> image), noisy pages are re-rendered at
+    the next DPI step (adaptive mode); otherwise `img` is read once as is,
+    with the plain text pass and no confidence (None).
+    With `layout`, only detected text blocks are OCR'd, each with the
+    language set of its own script, and `script` is not used.
+    """
+    steps = tuple(d for d in DPI_STEPS if d >= dpi) if render else (dpi,)
+    images = {dpi: img}
+    if layout:
+        # Mixed Bengali/English pages are expected here, so no script-ratio threshold
+        result = ocr_adaptive(lambda d: images[d] if d in images else render(d), None, dpi_steps=steps,
+                              min_script_ratio=0.0, recognize_fn=ocr_blocks)
+        block_scripts = Counter(result['block_scripts'])
+        langs = {part for s in block_scripts for part in BLOCK_LANGS.get(s, 'san+hin').split('+')}
+        result.update(script=block_scripts.most_common(1)[0][0] if block_scripts else "Unknown",
+                      lang='+'.join(sorted(langs)) or 'none')
+        return result
+    
+    tess_lang, is_ben = lang_for_script(script)
+    result = ocr_adaptive(lambda d: images[d] if d in images else render(d), tess_lang,
+                          script if script in INDIC_SCRIPTS else None, dpi_steps=steps, psm=3, oem=1)
+    result['text'] = TextCleaner.clean_text(result['text'], is_bengali=is_ben)
+    result.update(script=script, lang=tess_lang)
+    return result
+
+def sample_pages(total_pages, num_samples=None):
+    """0-based page indexes: a random sample from the middle 80% of the book, or all pages."""
+    if not num_samples:
+        return range(total_pages)
+    start_page = int(total_pages * 0.1)
+    end_page = int(total_pages * 0.9)
+    if start_page >= end_page:
+        return [total_pages // 2]
+    return sorted(random.sample(range(start_page, end_page), min(num_samples, end_page-start_page)))
+
+def process_pdf_tesseract(pdf_path, output_dir, num_samples=None, decisions=None, adaptive=False, layout=False):
     pdf_path = Path(pdf_path)
     print(f"📖 Processing {pdf_path.name}...")
     
     pdf = pdfium.PdfDocument(str(pdf_path))
-    total_pages = len(pdf)
-    
-    if num_samples:
-        start_page = int(total_pages * 0.1)
-        end_page = int(total_pages * 0.9)
-        if start_page >= end_page:
-            pages_to_process = [total_pages // 2]
-        else:
-            pages_to_process = sorted(random.sample(range(start_page, end_page), min(num_samples, end_page-start_page)))
-    else:
-        pages_to_process = range(total_pages)
+    pages_to_process = sample_pages(len(pdf), num_samples)
 
     print(f"   Targeting {len(pages_to_process)} pages...")
     
     book_output = output_dir / pdf_path.stem
     book_output.mkdir(parents=True, exist_ok=True)
     
-    for page_idx in pages_to_process:
-        page_num = page_idx + 1
-        
-        # Convert page to image
-        images = convert_from_path(pdf_path, first_page=page_num, last_page=page_num, dpi=300)
-        if not images:
+    # Script is detected cheaply until enough pages agree, then fixed for the book
+    script_lock = decisions.lock_for(pdf_path.name) if decisions else ScriptLock()
+    
+    # Rendered in-process from the open document, next pages prefetched while OCR runs.
+    # Adaptive mode starts low and re-renders noisy pages itself, so it renders inline.
+    dpi = DPI_STEPS[0] if adaptive else 300
+    render = None
+    pages = [page_idx + 1 for page_idx in pages_to_process]
+    for page_num, img, error in iter_rendered_pages(pdf, pages, dpi=dpi, prefetch=0 if adaptive else 2):
+        if error:
+            print(f"   ⚠️  Page {page_num}: render failed ({error})")
             continue
-        img = images[0]
         
-        # 1. Detect Script (Quick pass)
-        # We use a broad lang set for detection
-        raw_detection = run_tesseract(img, "ben+hin+san")
-        script = TextCleaner.detect_script(raw_detection)
+        # 1. Detect Script (downscaled crop, skipped once the book is locked)
+        # (Layout mode detects a script per text block instead)
+        source = "locked" if script_lock.locked else "detected"
+        script = None if layout else script_lock.script_for(img, detect_scale(dpi))
         
-        # 2. Select Optimized Setting
-        if script == "Bengali":
-            tess_lang = "ben" # ben is usually very strong in default Tesseract
-            is_ben = True
-        else:
-            # For Devanagari, using san+hin often helps with the mixed 
-            # religious/philosophical nature of these texts.
-            tess_lang = "san+hin"
-            is_ben = False
+        # 2-4. OCR with the script's language set (re-rendering if adaptive), clean
+        if adaptive:
+            render = lambda d, idx=page_num - 1: render_page(pdf, idx, d)
+        result = ocr_page_image(img, dpi, script, render, layout)
+        if layout:
+            source = f"{result['blocks']} blocks,"
             
-        print(f"   📄 Page {page_num}: Detected {script} -> Using '{tess_lang}'")
-        
-        # 3. Final OCR Pass
-        text = run_tesseract(img, tess_lang)
-        
-        # 4. Clean and Save
-        cleaned_text = TextCleaner.clean_text(text, is_bengali=is_ben)
+        confidence = f", confidence {result['confidence']}" if result['confidence'] is not None else ""
+        print(f"   📄 Page {page_num}: {source} {result['script']} -> '{result['lang']}' "
+              f"at {result['dpi']} DPI{confidence}")
         
         output_file = book_output / f"page_{page_num:03d}.txt"
-        output_file.write_text(cleaned_text, encoding='utf-8')
+        output_file.write_text(result['text'], encoding='utf-8')
+    
+    pdf.close()
+    if decisions:
+        decisions.record(pdf_path.name, script_lock)
 
 def main():
-    # Production directory for all OCR'd texts
-    output_dir = Path("ocr_dataset")
-    output_dir.mkdir(exist_ok=True)
+    from ocr_scheduler import OCRScheduler
+    
+    # Production directory for all OCR'd texts; pages spread over all cores, resumable
+    scheduler = OCRScheduler("ocr_dataset")
     
     # For now, let's process the ones we've been testing
     target_pdfs = [
@@ -86,9 +133,13 @@ def main():
         pdf_path = Path(pdf_str)
         if pdf_path.exists():
             # Process 5 random pages as a sanity check/sample
-            process_pdf_tesseract(pdf_path, output_dir, num_samples=5)
+            pdf = pdfium.PdfDocument(str(pdf_path))
+            pages = [page_idx + 1 for page_idx in sample_pages(len(pdf), num_samples=5)]
+            pdf.close()
+            scheduler.add_book(pdf_path, pages)
         else:
             print(f"❌ {pdf_str} not found")
+    scheduler.run()
 
 if __name__ == "__main__":
     main()
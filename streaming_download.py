@@ -0,0 +1,173 @@
+import asyncio
+import os
+import re
+import time
+from pathlib import Path
+
+CHUNK_SIZE = 64 * 1024
+
+
+def part_path_for(dest_path):
+    dest_path = Path(dest_path)
+    return dest_path.with_name(dest_path.name + '.part')
+
+
+def meta_path_for(part_path):
+    part_path = Path(part_path)
+    return part_path.with_name(part_path.name + '.meta')
+
+
+def _resume_state(part_path):
+    """(offset, validator) to resume `part_path` with, or (0, None) to start over.
+
+    A .part is only resumed when the ETag/Last-Modified of the response that
+    wrote it was recorded next to it; without one, If-Range cannot guard
+    against splicing two versions of a file, so the .part is discarded.
+    """
+    meta_path = meta_path_for(part_path)
+    validator = meta_path.read_text(encoding='utf-8').strip() if meta_path.exists() else ''
+    if part_path.exists() and validator:
+        return part_path.stat().st_size, validator
+    _discard(part_path)
+    return 0, None
+
+
+def _discard(part_path):
+    for path in (part_path, meta_path_for(part_path)):
+        if path.exists():
+            path.unlink()
+
+
+def _request_headers(offset, headers, validator):
+    """Range resume headers on top of the caller's (conditional) headers.
+
+    Bodies are requested without content coding: requests and aiohttp
+    decode gzip transparently, which would break both the size check
+    against Content-Length and byte offsets for Range.
+    """
+    if not offset:
+        return dict(headers or {}, **{'Accept-Encoding': 'identity'})
+    # Conditional headers only make sense for a fresh request; when resuming,
+    # If-Range makes the server fall back to a full 200 if the file changed.
+    return {'Accept-Encoding': 'identity', 'Range': f'bytes={offset}-', 'If-Range': validator}
+
+
+def _open_part(part_path, status, headers, offset):
+    """Open the .part for this response's body; returns (file, expected total size).
+
+    A full 200 body restarts the .part and records its validator so a later
+    attempt or run can resume it. A body the server encoded anyway is still
+    accepted, but without a size check and without resuming.
+    """
+    meta_path = meta_path_for(part_path)
+    encoded = headers.get('Content-Encoding', 'identity').lower() != 'identity'
+    if status != 206:
+        offset = 0 # Server ignored the Range header; start over
+        validator = headers.get('ETag') or headers.get('Last-Modified')
+        if validator and not encoded:
+            meta_path.write_text(validator, encoding='utf-8')
+        elif meta_path.exists():
+            meta_path.unlink()
+    expected = None if encoded else _expected_total(status, headers, offset)
+    return open(part_path, 'ab' if offset else 'wb'), expected
+
+
+def _expected_total(status, headers, offset):
+    """Total file size implied by a 200/206 response, or None if unknown."""
+    content_range = headers.get('Content-Range', '')
+    m = re.match(r'bytes \d+-\d+/(\d+)', content_range)
+    if status == 206 and m:
+        return int(m.group(1))
+    length = headers.get('Content-Length')
+    if length is None:
+        return None
+    return int(length) + (offset if status == 206 else 0)
+
+
+def _finish(part_path, dest_path, expected):
+    size = part_path.stat().st_size
+    if expected is not None and size != expected:
+        raise IOError(f"incomplete body: {size}/{expected} bytes")
+    os.replace(part_path, dest_path)
+    meta_path = meta_path_for(part_path)
+    if meta_path.exists():
+        meta_path.unlink()
+    return size
+
+
+def _result(status, headers=None, size=None):
+    return {'status': status, 'headers': dict(headers or {}), 'size': size}
+
+
+def stream_download(session, url, dest_path, retries=3, timeout=60, chunk_size=CHUNK_SIZE, headers=None):
+    """Stream `url` into `dest_path` via a `.part` file, resuming with Range on retry.
+
+    Memory use is bounded by `chunk_size` regardless of file size. The final
+    file only appears (atomically) once the body is complete. Extra `headers`
+    (e.g. If-None-Match) are sent on the first request.
+
+    Returns {'status': 'downloaded' | 'not_modified' | 'failed', 'headers', 'size'}.
+    """
+    dest_path = Path(dest_path)
+    part_path = part_path_for(dest_path)
+
+    for attempt in range(retries):
+        offset, validator = _resume_state(part_path)
+        try:
+            req_headers = _request_headers(offset, headers, validator)
+            with session.get(url, timeout=timeout, stream=True, headers=req_headers) as resp:
+                if resp.status_code == 304:
+                    return _result('not_modified', resp.headers)
+                if resp.status_code == 416 and offset:
+                    # Nothing left to send: the .part already holds the whole body
+                    m = re.match(r'bytes \*/(\d+)', resp.headers.get('Content-Range', ''))
+                    if m and int(m.group(1)) == offset:
+                        return _result('downloaded', resp.headers, _finish(part_path, dest_path, offset))
+                    _discard(part_path)
+                    raise IOError("stale partial download discarded")
+                resp.raise_for_status()
+
+                f, expected = _open_part(part_path, resp.status_code, resp.headers, offset)
+                with f:
+                    for chunk in resp.iter_content(chunk_size=chunk_size):
+                        f.write(chunk)
+                return _result('downloaded', resp.headers, _finish(part_path, dest_path, expected))
+
+        except Exception as e:
+            print(f"⚠️  Attempt {attempt + 1}/{retries} failed: {e}")
+            if attempt < retries - 1:
+                time.sleep(2 ** attempt)  # Exponential backoff
+
+    return _result('failed')
+
+
+async def async_stream_download(session, url, dest_path, retries=3, chunk_size=CHUNK_SIZE, headers=None):
+    """aiohttp counterpart of stream_download; same result dict, raises on failure."""
+    dest_path = Path(dest_path)
+    part_path = part_path_for(dest_path)
+
+    for attempt in range(retries):
+        offset, validator = _resume_state(part_path)
+        try:
+            req_headers = _request_headers(offset, headers, validator)
+            async with session.get(url, headers=req_headers) as resp:
+                if resp.status == 304:
+                    return _result('not_modified', resp.headers)
+                if resp.status == 416 and offset:
+                    m = re.match(r'bytes \*/(\d+)', resp.headers.get('Content-Range', ''))
+                    if m and int(m.group(1)) == offset:
+                        return _result('downloaded', resp.headers, _finish(part_path, dest_path, offset))
+                    _discard(part_path)
+                    raise IOError("stale partial download discarded")
+                resp.raise_for_status()
+
+                f, expected = _open_part(part_path, resp.status, resp.headers, offset)
+                with f:
+                    async for chunk in resp.content.iter_chunked(chunk_size):
+                        f.write(chunk)
+                return _result('downloaded', resp.headers, _finish(part_path, dest_path, expected))
+
+        except Exception:
+            if attempt == retries - 1:
+                raise
+            await asyncio.sleep(2 ** attempt)
@@ -0,0 +1,99 @@
+import argparse
+import json
+import random
+from pathlib import Path
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+# Paragraphs from mini_dataset books, with their IAST diacritics
+SAMPLES = [
+    ('heart_and_halo_foreword', 'mini_dataset/Heart_and_Halo.epub.txt', 20),
+    ('heart_and_halo_title', 'mini_dataset/Heart_and_Halo.epub.txt', 24),
+    ('heart_and_halo_karnamrita', 'mini_dataset/Heart_and_Halo.epub.txt', 37),
+]
+# Looked up by PIL in the system font directories; the committed pages use DejaVu Serif
+DEFAULT_FONT = 'DejaVuSerif.ttf'
+PAGE_INCHES = (5.8, 8.3) # A5
+MARGIN_INCHES = 0.6
+
+
+def wrap(text, font, width):
+    """Greedy word wrap of `text` to lines at most `width` pixels wide."""
+    lines, line = [], ''
+    for word in text.split():
+        candidate = f"{line} {word}" if line else word
+        if line and font.getlength(candidate) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = candidate
+    if line:
+        lines.append(line)
+    return lines
+
+
+def render_page(text, font_path, dpi=300, point_size=11, scanned=False, seed=0):
+    """Render `text` as a page image at `dpi`; returns (image, text as laid out).
+
+    `scanned` tilts, blurs, thresholds and speckles the page like a
+    bilevel photocopy scan.
+    """
+    font = ImageFont.truetype(font_path, round(point_size * dpi / 72))
+    width, height = (round(inches * dpi) for inches in PAGE_INCHES)
+    margin = round(MARGIN_INCHES * dpi)
+    lines = wrap(text, font, width - 2 * margin)
+    leading = round(font.size * 1.4)
+    lines = lines[:(height - 2 * margin) // leading]
+
+    page = Image.new('L', (width, height), 255)
+    draw = ImageDraw.Draw(page)
+    for i, line in enumerate(lines):
+        draw.text((margin, margin + i * leading), line, font=font, fill=0)
+    if scanned:
+        rng = random.Random(seed)
+        page = page.rotate(0.4, resample=Image.BICUBIC, fillcolor=255).filter(ImageFilter.GaussianBlur(1.2))
+        page = page.point(lambda v: 255 if v > 140 else 0)
+        pixels = page.load()
+        for _ in range(width * height // 5000):
+            pixels[rng.randrange(width), rng.randrange(height)] = rng.choice((0, 255))
+        page = page.convert('1')
+    return page, '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the synthetic ground-truth pages for ocr_benchmark.py")
+    parser.add_argument("--output", default="ocr_groundtruth")
+    parser.add_argument("--font", default=DEFAULT_FONT,
+                        help="TrueType font file or name with IAST diacritics (default: DejaVu Serif)")
+    parser.add_argument("--dpi", type=int, default=300)
+    args = parser.parse_args()
+    try:
+        ImageFont.truetype(args.font, 12)
+    except OSError:
+        parser.error(f"font {args.font!r} not found (e.g. no DejaVu fonts on macOS); "
+                     f"pass --font with a .ttf that covers ā ī ū ṛ ṣ ṇ")
+
+    out = Path(args.output)
+    out.mkdir(parents=True, exist_ok=True)
+    entries = []
+    for n, (name, source, line_no) in enumerate(SAMPLES):
+        text = Path(source).read_text(encoding='utf-8').split('\n')[line_no - 1]
+        for scanned in (False, True):
+            page_id = f"synthetic_{name}{'_scanned' if scanned else ''}"
+            image, gt = render_page(text, args.font, args.dpi, scanned=scanned, seed=n)
+            image.save(out / f"{page_id}.png", dpi=(args.dpi, args.dpi), optimize=True)
+            # Both variants of a sample share its ground truth
+            (out / f"synthetic_{name}.gt.txt").write_text(gt, encoding='utf-8')
+            entries.append({'id': page_id, 'image': f"{page_id}.png", 'gt': f"synthetic_{name}.gt.txt",
+                            'lang': 'eng', 'dpi': args.dpi, 'source': f"{source}:{line_no}"})
+            print(f"  🖼️  {page_id}: {len(gt.split())} words")
+
+    # Hand-corrected scan pages listed in the manifest are kept
+    manifest = out / 'groundtruth.json'
+    existing = json.loads(manifest.read_text(encoding='utf-8')) if manifest.exists() else []
+    entries += [e for e in existing if not e['id'].startswith('synthetic_')]
+    manifest.write_text(json.dumps(entries, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+    print(f"📏 {len(entries)} ground-truth pages in {manifest}")
+
+
+if __name__ == "__main__":
+    main()
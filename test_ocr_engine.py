@@ -0,0 +1,53 @@
+import json
+import sys
+import pytest
+
+pytesseract = pytest.importorskip("pytesseract")
+Image = pytest.importorskip("PIL.Image")
+import ocr_engine
+
+# Stand-in `tesseract` binary: answers --version, records its arguments and
+# writes a fixed TSV, so the real pytesseract API runs end to end
+FAKE_TESSERACT = '''#!{python}
+import json, sys
+args = sys.argv[1:]
+if args == ['--version']:
+    print('tesseract 5.3.0')
+    sys.exit(0)
+with open({log!r}, 'w') as f:
+    json.dump(args, f)
+rows = [
+    'level\\tpage_num\\tblock_num\\tpar_num\\tline_num\\tword_num\\tleft\\ttop\\twidth\\theight\\tconf\\ttext',
+    '1\\t1\\t0\\t0\\t0\\t0\\t0\\t0\\t100\\t40\\t-1\\t',
+    '5\\t1\\t1\\t1\\t1\\t1\\t0\\t0\\t10\\t10\\t96.5\\tŚrīla',
+    '5\\t1\\t1\\t1\\t1\\t2\\t12\\t0\\t10\\t10\\t90\\tGuru',
+    '5\\t1\\t1\\t1\\t2\\t1\\t0\\t12\\t10\\t10\\t80.5\\tMahārāj',
+    '5\\t1\\t2\\t1\\t1\\t1\\t0\\t30\\t10\\t10\\t-1\\t ',
+    '5\\t1\\t2\\t1\\t1\\t2\\t12\\t30\\t10\\t10\\t73\\t108',
+]
+with open(args[1] + '.tsv', 'w', encoding='utf-8') as f:
+    f.write('\\n'.join(rows) + '\\n')
+'''
+
+
+@pytest.fixture
+def fake_tesseract(tmp_path, monkeypatch):
+    log = tmp_path / 'args.json'
+    cmd = tmp_path / 'tesseract'
+    cmd.write_text(FAKE_TESSERACT.format(python=sys.executable, log=str(log)), encoding='utf-8')
+    cmd.chmod(0o755)
+    monkeypatch.setattr(pytesseract.pytesseract, 'tesseract_cmd', str(cmd))
+    return log
+
+
+def test_subprocess_engine_confidence_uses_real_pytesseract_api(fake_tesseract):
+    engine = ocr_engine.SubprocessEngine('ben+eng', psm=6, oem=1)
+    text, confidence = engine.recognize_with_confidence(Image.new('L', (100, 40), 255))
+
+    args = json.loads(fake_tesseract.read_text())
+    assert args[args.index('-l') + 1] == 'ben+eng'
+    assert '--oem' in args and args[args.index('--oem') + 1] == '1'
+    assert '--psm' in args and args[args.index('--psm') + 1] == '6'
+    assert 'tessedit_create_tsv=1' in args
+    assert text == 'Śrīla Guru\nMahārāj\n\n108\n\n'
+    assert confidence == pytest.approx((96.5 + 90 + 80.5 + 73) / 4)